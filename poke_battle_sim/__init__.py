@@ -1,8 +1,34 @@
-from poke_battle_sim.poke_sim import PokeSim
+from __future__ import annotations
+import importlib
 
-from poke_battle_sim.core.pokemon import Pokemon
-from poke_battle_sim.core.trainer import Trainer
-from poke_battle_sim.core.battle import Battle
+# Public names are imported from their modules on first use (PEP 562)
+_LAZY_ATTRS = {
+    "PokeSim": "poke_battle_sim.poke_sim",
+    "Pokemon": "poke_battle_sim.core.pokemon",
+    "Trainer": "poke_battle_sim.core.trainer",
+    "Battle": "poke_battle_sim.core.battle",
+    "Action": "poke_battle_sim.core.action",
+    "SelectionRequest": "poke_battle_sim.core.action",
+    "Policy": "poke_battle_sim.core.policy",
+    "run_battles": "poke_battle_sim.tools.batch",
+    "estimate_win_rate": "poke_battle_sim.tools.estimate",
+    "VectorBattleEnv": "poke_battle_sim.tools.env",
+    "BattleHost": "poke_battle_sim.tools.host",
+    "Replay": "poke_battle_sim.tools.replay",
+    "ReplayArchive": "poke_battle_sim.tools.archive",
+    "Tournament": "poke_battle_sim.tools.tournament",
+}
 
+__all__ = list(_LAZY_ATTRS)
 
-PokeSim.start()
+
+def __getattr__(name: str):
+    if name not in _LAZY_ATTRS:
+        raise AttributeError("module 'poke_battle_sim' has no attribute '" + name + "'")
+    value = getattr(importlib.import_module(_LAZY_ATTRS[name]), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -4,12 +4,7 @@ ITEM = 'item'
 SWITCH = ['other', 'switch']
 RECHARGING = ['other', 'recharging']
 BIDING = ['other', 'biding']
-RAGE = ['move', 'rage']
 STRUGGLE = ['move', 'struggle']
-PURSUIT = ['move', 'pursuit']
-UPROAR = ['move', 'uproar']
-FOCUS_PUNCH = ['move', 'focus-punch']
-ME_FIRST = ['move', 'me-first']
 
 # Check Data for Moves, Statuses, Items, and Abilities
 PROTECT_TARGETS = [8, 9, 10, 11]
@@ -54,6 +49,10 @@ USABLE_ITEM_CHECK = {'potion', 'antidote', 'burn-heal', 'ice-heal', 'awakening',
 
 DMG_ITEM_CHECK = {'griseous-orb', 'adamant-orb', 'lustrous-orb','silver-powder', 'insect-plate', 'soul-dew', 'metal-coat', 'iron-plate', 'soft-sand', 'earth-plate', 'hard-stone', 'stone-plate', 'rock-incense', 'miracle-seed', 'meadow-plate', 'rose-incense', 'blackglasses', 'dread-plate', 'black-belt', 'fist-plate', 'magnet', 'zap-plate', 'mystic-water', 'sea-incense', 'wave-incense', 'splash-plate', 'sharp-beak', 'sky-plate', 'poison-barb', 'toxic-plate', 'nevermeltice', 'icicle-plate', 'spell-tag', 'spooky-plate', 'twistedspoon', 'mind-plate', 'odd-incense', 'charcoal', 'flame-plate', 'dragon-fang', 'draco-plate', 'silk-scarf', 'muscle-band', 'wise-glasses', 'metronome'}
 
+TYPE_BOOST_ITEMS = {'silver-powder': ('bug', 1.2), 'insect-plate': ('bug', 1.2), 'metal-coat': ('steel', 1.2), 'iron-plate': ('steel', 1.2), 'soft-sand': ('ground', 1.2), 'earth-plate': ('ground', 1.2), 'hard-stone': ('rock', 1.2), 'stone-plate': ('rock', 1.2), 'rock-incense': ('rock', 1.2), 'miracle-seed': ('grass', 1.2), 'meadow-plate': ('grass', 1.2), 'rose-incense': ('grass', 1.2), 'blackglasses': ('dark', 1.2), 'dread-plate': ('dark', 1.2), 'black-belt': ('fighting', 1.2), 'fist-plate': ('fighting', 1.2), 'magnet': ('electric', 1.2), 'zap-plate': ('electric', 1.2), 'mystic-water': ('water', 1.2), 'sea-incense': ('water', 1.2), 'wave-incense': ('water', 1.2), 'splash-plate': ('water', 1.2), 'sharp-beak': ('flying', 1.2), 'sky-plate': ('flying', 1.2), 'poison-barb': ('poison', 1.2), 'toxic-plate': ('poison', 1.2), 'nevermeltice': ('ice', 1.2), 'icicle-plate': ('ice', 1.2), 'spell-tag': ('ghost', 1.2), 'spooky-plate': ('ghost', 1.2), 'twistedspoon': ('psychic', 1.2), 'mind-plate': ('psychic', 1.2), 'odd-incense': ('psychic', 1.2), 'charcoal': ('fire', 1.2), 'flame-plate': ('fire', 1.2), 'dragon-fang': ('dragon', 1.2), 'draco-plate': ('dragon', 1.2), 'silk-scarf': ('normal', 1.2)}
+
+SPECIES_BOOST_ITEMS = {'griseous-orb': (('giratina',), ('dragon', 'ghost'), 1.2), 'adamant-orb': (('dialga',), ('dragon', 'steel'), 1.2), 'lustrous-orb': (('palkia',), ('dragon', 'water'), 1.2), 'soul-dew': (('latios', 'latias'), ('dragon', 'psychic'), 1.5)}
+
 DMG_MULT_ITEM_CHECK = {'expert-belt', 'life-orb'}
 
 PRE_HIT_BERRIES = {'occa-berry': 'fire', 'passho-berry': 'water', 'wacan-berry': 'electric', 'rindo-berry': 'grass', 'yache-berry': 'ice', 'chople-berry': 'fighting', 'kebia-berry': 'poison', 'shuca-berry': 'ground', 'coba-berry': 'flying', 'papaya-berry': 'psychic', 'tanga-berry': 'bug', 'charti-berry': 'rock', 'kasib-berry': 'ghost', 'haban-berry': 'dragon', 'colbur-berry': 'dark', 'babiri-berry': 'steel', 'chilan-berry': 'normal'}
@@ -78,4 +77,25 @@ EXTRA_FLINCH_CHECK = {'aerial-ace', 'aeroblast', 'air-cutter', 'air-slash', 'aqu
 
 HEALING_ITEM_CHECK = {'potion': 20, 'hyper-potion': 200, 'super-potion': 50, 'fresh-water': 50, 'soda-pop': 60, 'lemonade': 80, 'moomoo-milk': 100, 'energypowder': 50, 'energy-root': 200, 'berry-juice': 20, 'oran-berry': 10, 'sitrus-berry': 30}
 
-TWO_TURN_CHECK = {'razor-wind', 'fly', 'dig', 'skull-bash', 'sky-attack', 'dive', 'bounce', 'shadow-force', 'bide', 'solar-beam', 'ice-ball', 'thrash', 'petal-dance', 'outrage'}
\ No newline at end of file
+TWO_TURN_CHECK = {'razor-wind', 'fly', 'dig', 'skull-bash', 'sky-attack', 'dive', 'bounce', 'shadow-force', 'bide', 'solar-beam', 'ice-ball', 'thrash', 'petal-dance', 'outrage'}
+SELECTION_ABILITY_CHECK = {'drizzle', 'drought', 'snow-warning', 'sand-stream', 'water-veil', 'magma-armor', 'limber', 'insomnia', 'immunity', 'cloud-nine', 'air-lock', 'own-tempo', 'trace', 'forecast', 'download', 'anticipation', 'forewarn', 'frisk', 'multitype'}
+
+ENEMY_SELECTION_ABILITY_CHECK = {'intimidate', 'trace', 'download', 'anticipation', 'forewarn', 'frisk'}
+
+END_TURN_ABILITY_CHECK = {'speed-boost', 'slow-start', 'bad-dreams'}
+
+TYPE_PROTECTION_ABILITY_CHECK = {'volt-absorb', 'water-absorb', 'flash-fire'}
+
+ON_HIT_ABILITY_CHECK = {'static', 'rough-skin', 'effect-spore', 'color-change', 'wonder-guard', 'flame-body', 'poison-point', 'cute-charm', 'motor-drive'}
+
+STAT_CALC_ABILITY_CHECK = {'swift-swim', 'chlorophyll', 'huge-power', 'pure-power', 'hustle', 'guts', 'marvel-scale', 'solar-power', 'quick-feet', 'slow-start', 'flower-gift', 'unburden'}
+
+ATTACKER_DMG_ABILITY_CHECK = {'flash-fire', 'overgrow', 'blaze', 'torrent', 'swarm', 'rivalry', 'iron-fist', 'normalize', 'technician', 'tinted-lens', 'reckless'}
+
+DEFENDER_DMG_ABILITY_CHECK = {'heatproof', 'filter', 'solid-rock'}
+
+HOMC_ABILITY_CHECK = {'sand-veil', 'snow-cloak', 'compound-eyes', 'hustle', 'tangled-feet', 'thick-fat'}
+
+PRE_MOVE_ABILITY_CHECK = {'serene-grace'}
+
+WEATHER_CHANGE_ABILITY_CHECK = {'forecast'}
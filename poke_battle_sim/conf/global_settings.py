@@ -6,6 +6,15 @@ MOVES_CSV = 'move_list.csv'
 TYPE_EF_CSV = 'type_effectiveness.csv'
 ABILITIES_CSV = 'abilities.csv'
 ITEMS_CSV = 'items_gen4.csv'
+DATA_CSVS = [POKEMON_STATS_CSV, NATURES_CSV, MOVES_CSV, TYPE_EF_CSV, ABILITIES_CSV, ITEMS_CSV]
+
+# CSV Cache Settings
+CACHE_DIR_ENV = 'POKE_BATTLE_SIM_CACHE_DIR'
+CACHE_DIR_NAME = 'poke-battle-sim'
+CACHE_SUFFIX = '.cache'
+CACHE_MAGIC = b'PBSC'
+CACHE_VERSION = 1
+CACHE_HEADER_FORMAT = '<4sHHHI'
 
 # Stat Ranges
 LEVEL_MIN, LEVEL_MAX = 1, 100
@@ -19,6 +28,8 @@ NATURE_DEC, NATURE_INC = 0.9, 1.1
 POKE_NUM_MIN, POKE_NUM_MAX = 1, 6
 POSSIBLE_GENDERS = ['male', 'female', 'genderless']
 COMPLETED_MOVES = 467
+MAX_MOVES = 4
+DAMAGE_ROLL_MIN, DAMAGE_ROLL_MAX = 85, 100
 
 # Non-volatile Statuses
 BURNED = 1
@@ -111,29 +122,167 @@ MOVE_EFFECT_ID = 10
 MOVE_EFFECT_CHANCE = 11
 MOVE_EFFECT_AMT = 12
 MOVE_EFFECT_STAT = 13
+MOVE_FLAGS = 14
 
 # CSV Numerical Columns
 POKEMON_STATS_NUMS = [0, 4, 5, 6, 7, 8, 9, 10, 11, 12, 13]
 MOVES_NUM = [0, 2, 4, 5, 6, 7, 8, 9, 10, 11, 12, 13]
 
-# Player Turn Actions
-ACTION_PRIORITY = {
-    'other': 3,
-    'item': 2,
-    'move': 1
+# Action Kinds
+ACTION_MOVE = 1
+ACTION_ITEM = 2
+ACTION_SWITCH = 3
+ACTION_RECHARGE = 4
+ACTION_BIDE = 5
+ACTION_KIND_PRIORITY = {
+    ACTION_MOVE: 1,
+    ACTION_ITEM: 2,
+    ACTION_SWITCH: 3,
+    ACTION_RECHARGE: 3,
+    ACTION_BIDE: 3
 }
 
+# Action Space
+ACTION_SPACE_MOVES = 0
+ACTION_SPACE_SWITCHES = MAX_MOVES
+ACTION_SPACE_STRUGGLE = ACTION_SPACE_SWITCHES + POKE_NUM_MAX - 1
+ACTION_SPACE_SIZE = ACTION_SPACE_STRUGGLE + 1
+
 # Turn Data
 ACTION_TYPE = 0
 ACTION_VALUE = 1
 ITEM_TARGET_POS = 2
 MOVE_TARGET_POS = 3
 
-# Pre-process Move Data
-PPM_MOVE = 0
-PPM_MOVE_DATA = 1
-PPM_BYPASS = 2
-
 # Item Thresholds
 BERRY_THRESHOLD = 0.5
-DAMAGE_THRESHOLD = 0.25
\ No newline at end of file
+DAMAGE_THRESHOLD = 0.25
+
+# Batch Simulation Settings
+MAX_TURNS = 1000
+BATCH_CHUNK_SIZE = 16
+BATCH_MAX_PENDING = 4
+
+# Observation Layout
+OBS_VERSION = 1
+OBS_HP_SCALE_INT = 1000
+OBS_FIELD_SIZE = 10
+OBS_SIDE_SIZE = 12
+OBS_ACTIVE_SIZE = 9 + V_STATUS_NUM + 1
+OBS_POKE_SIZE = 7 + 2 * MAX_MOVES
+OBS_PLAYER_SIZE = OBS_SIDE_SIZE + OBS_ACTIVE_SIZE + POKE_NUM_MAX * OBS_POKE_SIZE
+OBS_SIZE = OBS_FIELD_SIZE + 2 * OBS_PLAYER_SIZE
+
+# Environment Settings
+ENV_REWARD_WIN = 1.0
+ENV_REWARD_LOSS = -1.0
+
+# Tournament Settings
+TOURNAMENT_MAGIC = b'PBST'
+TOURNAMENT_VERSION = 1
+TOURNAMENT_CHECKPOINT_EVERY = 10000
+TOURNAMENT_LOAD_CHUNK = 1 << 20
+
+# Estimation Settings
+ESTIMATE_WILSON = 0
+ESTIMATE_BETA = 1
+ESTIMATE_CONFIDENCE = 0.95
+ESTIMATE_PRECISION = 0.025
+ESTIMATE_BATCH_SIZE = 64
+ESTIMATE_MAX_BATTLES = 10000
+
+# Replay Settings
+REPLAY_MAGIC = b'PBSR'
+REPLAY_VERSION = 1
+REPLAY_NONE = 0
+REPLAY_ZLIB = 1
+REPLAY_LZMA = 2
+REPLAY_LZMA_DICT_SIZE = 1 << 16
+
+# Replay Archive Settings
+ARCHIVE_MAGIC = b'PBSA'
+ARCHIVE_INDEX_MAGIC = b'PBSI'
+ARCHIVE_VERSION = 1
+ARCHIVE_HEADER_SIZE = 8
+ARCHIVE_INDEX_SUFFIX = '.idx'
+
+# Batch Result Formatting
+RES_WINNER = 0
+RES_TURNS = 1
+RES_HP = 2
+
+# Log Levels
+LOG_NONE = 0
+LOG_TEXT = 1
+LOG_EVENTS = 2
+LOG_ALL = 3
+
+# Battle Event Types
+EVENT_TURN = 0
+EVENT_SWITCH = 1
+EVENT_MOVE = 2
+EVENT_DAMAGE = 3
+EVENT_HEAL = 4
+EVENT_STATUS = 5
+EVENT_FAINT = 6
+EVENT_WEATHER = 7
+EVENT_WIN = 8
+EVENT_CURE = 9
+EVENT_CRIT = 10
+EVENT_EFFECTIVENESS = 11
+EVENT_MISS = 12
+EVENT_FAIL = 13
+
+# Battle Event Formatting
+EVENT_KIND = 0
+EVENT_SIDE = 1
+EVENT_SLOT = 2
+EVENT_VALUE = 3
+EVENT_SIZE = 4
+
+# Battle Event Settings
+EVENT_LOG_CAPACITY = 1024
+EFFECTIVENESS_SCALE = 100
+
+# Ability Hooks
+HOOK_SELECTION = 1
+HOOK_ENEMY_SELECTION = 2
+HOOK_END_TURN = 4
+HOOK_TYPE_PROTECTION = 8
+HOOK_ON_HIT = 16
+HOOK_STAT_CALC = 32
+HOOK_ATTACKER_DMG = 64
+HOOK_DEFENDER_DMG = 128
+HOOK_HOMC = 256
+HOOK_PRE_MOVE = 512
+HOOK_WEATHER_CHANGE = 1024
+
+# Item Hooks
+ITEM_HOOK_DMG = 1
+ITEM_HOOK_DMG_MULT = 2
+ITEM_HOOK_PRE_HIT = 4
+ITEM_HOOK_ON_DAMAGE = 8
+ITEM_HOOK_PRE_MOVE = 16
+ITEM_HOOK_STAT_CALC = 32
+ITEM_HOOK_STATUS = 64
+ITEM_HOOK_ON_HIT = 128
+ITEM_HOOK_HOMC = 256
+ITEM_HOOK_END_TURN = 512
+ITEM_HOOK_POST_DAMAGE = 1024
+
+# Move Flags
+MF_PURSUIT = 1
+MF_GROUNDED = 2
+MF_HEAL_BLOCK = 4
+MF_METRONOME = 8
+MF_ENCORE = 16
+MF_ASSIST = 32
+MF_MAGIC_COAT = 64
+MF_SNATCH = 128
+MF_SOUNDPROOF = 256
+MF_FREEZE = 512
+MF_PUNCH = 1024
+MF_RECOIL = 2048
+MF_CONTACT = 4096
+MF_EXTRA_FLINCH = 8192
+MF_TWO_TURN = 16384
@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import poke_battle_sim.core.trainer as tr
+
+import poke_battle_sim.conf.global_settings as gs
+import poke_battle_sim.conf.global_data as gd
+
+
+class Action:
+    __slots__ = ("kind", "slot", "item", "move_slot")
+
+    def __init__(
+        self,
+        kind: int,
+        slot: int | None = None,
+        item: str | None = None,
+        move_slot: int | None = None,
+    ):
+        """
+        A turn action that can be passed to turn in Battle instead of the list format.
+
+        - kind: gs.ACTION_MOVE, gs.ACTION_ITEM, or gs.ACTION_SWITCH
+        - slot: for moves, the move's position in the current Pokemon's moves; for switches,
+        the position in the party of the Pokemon to send out (None calls the Trainer's
+        selection function); for items, the position in the party of the item's target
+        - item: the item's name
+        - move_slot: the target move's position in the item target's moves, for items that
+        restore pp
+
+        It is easiest to create actions with move, switch, and use_item. The fields are only
+        checked here, so turn only needs to check that the action is usable this turn.
+        """
+        if kind not in gs.ACTION_KIND_PRIORITY:
+            raise Exception("Attempted to create Action with invalid kind")
+        if slot is not None and (
+            not isinstance(slot, int) or isinstance(slot, bool) or slot < 0
+        ):
+            raise Exception("Attempted to create Action with invalid slot")
+        if move_slot is not None and (
+            not isinstance(move_slot, int) or isinstance(move_slot, bool) or move_slot < 0
+        ):
+            raise Exception("Attempted to create Action with invalid move slot")
+        if kind == gs.ACTION_ITEM and (
+            not isinstance(item, str) or item not in gd.USABLE_ITEM_CHECK or slot is None
+        ):
+            raise Exception("Attempted to create Action with invalid item")
+        self.kind = kind
+        self.slot = slot
+        self.item = item
+        self.move_slot = move_slot
+
+    @classmethod
+    def move(cls, slot: int) -> Action:
+        if slot is None:
+            raise Exception("Attempted to create Action with invalid slot")
+        return cls(gs.ACTION_MOVE, slot)
+
+    @classmethod
+    def struggle(cls) -> Action:
+        """
+        Struggle can only be used once the current Pokemon has no usable moves left.
+        """
+        return cls(gs.ACTION_MOVE)
+
+    @classmethod
+    def switch(cls, slot: int | None = None) -> Action:
+        return cls(gs.ACTION_SWITCH, slot)
+
+    @classmethod
+    def use_item(cls, item: str, slot: int, move_slot: int | None = None) -> Action:
+        return cls(gs.ACTION_ITEM, slot, item, move_slot)
+
+    @classmethod
+    def from_list(cls, trainer: tr.Trainer, action: list[str]) -> Action | None:
+        """
+        Converts an action in the list format into an Action for trainer's current Pokemon.
+
+        Returns None if the action is not formatted correctly. A move that is not in the
+        current Pokemon's moves is converted into a move Action without a slot.
+        """
+        if (
+            not isinstance(action, list)
+            or len(action) < 2
+            or not all(isinstance(e, str) for e in action)
+        ):
+            return
+        action_type = action[gs.ACTION_TYPE].lower()
+        value = action[gs.ACTION_VALUE].lower()
+        if action_type == gd.MOVE:
+            return cls(gs.ACTION_MOVE, trainer.current_poke.get_move_slot(value))
+        if action_type == gd.ITEM:
+            if (
+                len(action) < 3
+                or len(action) > 4
+                or not action[gs.ITEM_TARGET_POS].isdigit()
+            ):
+                return
+            move_slot = None
+            if len(action) == 4:
+                if not action[gs.MOVE_TARGET_POS].isdigit():
+                    return
+                move_slot = int(action[gs.MOVE_TARGET_POS])
+            if value not in gd.USABLE_ITEM_CHECK:
+                return
+            return cls(gs.ACTION_ITEM, int(action[gs.ITEM_TARGET_POS]), value, move_slot)
+        if len(action) == 2 and [action_type, value] == gd.SWITCH:
+            return cls(gs.ACTION_SWITCH)
+
+    def to_list(self, trainer: tr.Trainer) -> list[str]:
+        """
+        Returns the action in the list format for trainer's current Pokemon. The list format
+        has no switch target, so a switch always calls the Trainer's selection function.
+        """
+        if self.kind == gs.ACTION_MOVE:
+            if self.slot is None:
+                return list(gd.STRUGGLE)
+            return [gd.MOVE, trainer.current_poke.moves[self.slot].name]
+        if self.kind == gs.ACTION_ITEM:
+            action = [gd.ITEM, self.item, str(self.slot)]
+            if self.move_slot is not None:
+                action.append(str(self.move_slot))
+            return action
+        if self.kind == gs.ACTION_RECHARGE:
+            return list(gd.RECHARGING)
+        if self.kind == gs.ACTION_BIDE:
+            return list(gd.BIDING)
+        return list(gd.SWITCH)
+
+    def __eq__(self, other) -> bool:
+        return (
+            isinstance(other, Action)
+            and self.kind == other.kind
+            and self.slot == other.slot
+            and self.item == other.item
+            and self.move_slot == other.move_slot
+        )
+
+    def __hash__(self) -> int:
+        return hash((self.kind, self.slot, self.item, self.move_slot))
+
+    def __repr__(self) -> str:
+        return (
+            "Action("
+            + ", ".join(
+                [str(self.kind), str(self.slot), repr(self.item), str(self.move_slot)]
+            )
+            + ")"
+        )
+
+
+class SelectionRequest:
+    __slots__ = ("trainer", "side", "slots")
+
+    def __init__(self, trainer: tr.Trainer, side: int, slots: tuple[int, ...]):
+        """
+        A selection that a turn started with begin_turn in Battle is waiting for.
+
+        - trainer: the Trainer that has to select a Pokemon
+        - side: 1 if trainer is the battle's first Trainer and 2 if it is the second
+        - slots: the positions in trainer's party of every Pokemon that can be sent out
+        """
+        self.trainer = trainer
+        self.side = side
+        self.slots = slots
+
+    def __repr__(self) -> str:
+        return "SelectionRequest(" + str(self.side) + ", " + str(self.slots) + ")"
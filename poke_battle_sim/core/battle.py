@@ -1,5 +1,5 @@
 from __future__ import annotations
-from random import randrange
+from random import Random, getrandbits
 
 from poke_battle_sim.core.move import Move
 from poke_battle_sim.poke_sim import PokeSim
@@ -7,6 +7,10 @@ from poke_battle_sim.poke_sim import PokeSim
 import poke_battle_sim.core.pokemon as pk
 import poke_battle_sim.core.trainer as tr
 import poke_battle_sim.core.battlefield as bf
+import poke_battle_sim.core.action as ac
+import poke_battle_sim.core.policy as po
+import poke_battle_sim.core.snapshot as sn
+import poke_battle_sim.core.event_log as el
 
 import poke_battle_sim.util.process_move as pm
 import poke_battle_sim.util.process_ability as pa
@@ -17,15 +21,40 @@ import poke_battle_sim.conf.global_data as gd
 
 
 class Battle:
-    def __init__(self, t1: tr.Trainer, t2: tr.Trainer):
+    def __init__(
+        self,
+        t1: tr.Trainer,
+        t2: tr.Trainer,
+        seed: int = None,
+        log_level: int = gs.LOG_TEXT,
+    ):
         """
         Creating a battle object requires exactly two Trainers with a valid party size
         and no overlapping Pokemon or Pokemon already in battle.
 
         The order of Trainers does not affect any battle mechanics.
+
+        Every random mechanic in the battle draws from the battle's own rng, so two battles
+        created with the same seed and given the same turn actions will play out identically.
+        If no seed is provided, one is drawn from the random module and stored in seed.
+
+        log_level controls what the battle records and is a combination of:
+            1. gs.LOG_TEXT - battle text, available through get_cur_text() and get_all_text()
+            2. gs.LOG_EVENTS - structured events, available through get_cur_events() and get_all_events()
+
+        gs.LOG_NONE records nothing, which skips building battle text entirely and is the
+        fastest option for simulations that only need the result.
         """
         if not isinstance(t1, tr.Trainer) or not isinstance(t2, tr.Trainer):
             raise Exception("Attempted to create Battle with invalid Trainer")
+        if seed is not None and not isinstance(seed, int):
+            raise Exception("Attempted to create Battle with invalid seed")
+        if (
+            not isinstance(log_level, int)
+            or isinstance(log_level, bool)
+            or not gs.LOG_NONE <= log_level <= gs.LOG_ALL
+        ):
+            raise Exception("Attempted to create Battle with invalid log level")
         if t1.in_battle or t2.in_battle:
             raise Exception("Attempted to create Battle with Trainer already in battle")
         for t1_poke in t1.poke_list:
@@ -41,9 +70,19 @@ class Battle:
 
         self.t1 = t1
         self.t2 = t2
+        self.seed = seed if seed is not None else getrandbits(64)
+        self.rng = Random(self.seed)
         self.battle_started = False
+        self.log_level = log_level
+        self.log_text = bool(log_level & gs.LOG_TEXT)
+        self.log_events = bool(log_level & gs.LOG_EVENTS)
         self.all_text = []
         self.cur_text = []
+        self.events = el.EventLog(gs.EVENT_LOG_CAPACITY if self.log_events else 0)
+        self.replay_log = None
+        self._pending_turn = None
+        self._selection_choices = None
+        self._selection_index = 0
 
     def start(self):
         self.t1.start_pokemon(self)
@@ -58,94 +97,91 @@ class Battle:
         self.last_move = None
         self.last_move_next = None
         self.turn_count = 0
-        self.add_text(self.t1.name + " sent out " + self.t1.current_poke.nickname + "!")
-        self.add_text(self.t2.name + " sent out " + self.t2.current_poke.nickname + "!")
+        if self.log_text:
+            self.add_text(self.t1.name + " sent out " + self.t1.current_poke.nickname + "!")
+            self.add_text(self.t2.name + " sent out " + self.t2.current_poke.nickname + "!")
+        if self.log_events:
+            self.add_event(gs.EVENT_SWITCH, self.t1.current_poke)
+            self.add_event(gs.EVENT_SWITCH, self.t2.current_poke)
 
-    def turn(self, t1_turn: list[str], t2_turn: list[str]) -> bool | None:
+    def turn(
+        self, t1_turn: ac.Action | list[str], t2_turn: ac.Action | list[str]
+    ) -> bool | None:
         """
         Both trainers are required to provide a valid action for a turn to be processed.
 
         The three types of valid actions are:
-            1. Moves - formatted as ['move', $move_name]
-            2. Items - formatted as ['item', $item, $item_target_pos, $move_target_name?]
-            3. Switch-out - formatted as ['other', 'switch']
+            1. Moves - Action.move($move_slot) or ['move', $move_name]
+            2. Items - Action.use_item($item, $item_target_pos, $move_target_pos?)
+            or ['item', $item, $item_target_pos, $move_target_pos?]
+            3. Switch-out - Action.switch($poke_slot?) or ['other', 'switch']
 
-        Certain moves and switching out will call the respective trainer's selection function.
+        Certain moves and switching out without a target will call the respective trainer's selection function.
 
         If either trainer provides an invalid action, the turn will abort and an exception will be raised.
 
         To check which actions are valid, refer to is_valid_actions() in Trainer.
         """
+        if self._pending_turn:
+            raise Exception("Cannot use turn on Battle while a turn is waiting for a selection")
         self.turn_count += 1
         if not self.battle_started:
             raise Exception("Cannot use turn on Battle that hasn't started")
         if self.is_finished():
             return
 
-        t1_move = t1_turn.copy()
-        t2_move = t2_turn.copy()
-        t1_move_data = None
-        t2_move_data = None
-        t1_mv_check_bypass = False
-        t2_mv_check_bypass = False
-        t1_first = None
-        faster_did_selection = False
-
-        t1_move, t1_move_data, t1_mv_check_bypass = self._pre_process_move(
-            self.t1, [t1_move, t1_move_data, t1_mv_check_bypass]
-        )
-        t2_move, t2_move_data, t2_mv_check_bypass = self._pre_process_move(
-            self.t2, [t2_move, t2_move_data, t2_mv_check_bypass]
-        )
+        t1_move, t1_move_data, t1_mv_check_bypass = self._pre_process_move(self.t1, t1_turn)
+        t2_move, t2_move_data, t2_mv_check_bypass = self._pre_process_move(self.t2, t2_turn)
 
-        if (
-            not isinstance(t1_move, list)
-            or not all(isinstance(t1_move[i], str) for i in range(len(t1_move)))
-            or len(t1_move) < 2
-            or t1_move[gs.ACTION_TYPE].lower() not in gs.ACTION_PRIORITY
-        ):
-            raise Exception("Trainer 1 invalid turn action")
-        if (
-            not isinstance(t2_move, list)
-            or not all(isinstance(t2_move[i], str) for i in range(len(t2_move)))
-            or len(t2_move) < 2
-            or t2_move[gs.ACTION_TYPE].lower() not in gs.ACTION_PRIORITY
-        ):
-            raise Exception("Trainer 2 invalid turn action")
+        if not isinstance(t1_move, ac.Action):
+            t1_move = ac.Action.from_list(self.t1, t1_move)
+            if not t1_move:
+                raise Exception("Trainer 1 invalid turn action")
+        if not isinstance(t2_move, ac.Action):
+            t2_move = ac.Action.from_list(self.t2, t2_move)
+            if not t2_move:
+                raise Exception("Trainer 2 invalid turn action")
 
         self.t1.has_moved = False
         self.t2.has_moved = False
-        t1_move = [e.lower() for e in t1_move]
-        t2_move = [e.lower() for e in t2_move]
         self.t1_fainted = False
         self.t2_fainted = False
         self.t1.current_poke.turn_damage = False
         self.t2.current_poke.turn_damage = False
 
-        if (
-            t1_move[gs.ACTION_TYPE] == gd.MOVE
-            and not t1_mv_check_bypass
-            and not self.t1.current_poke.is_move(t1_move[gs.ACTION_VALUE])
+        if t1_move.kind == gs.ACTION_MOVE and not t1_move_data:
+            t1_move_data = self.t1.current_poke.get_slot_move(t1_move.slot)
+        if t2_move.kind == gs.ACTION_MOVE and not t2_move_data:
+            t2_move_data = self.t2.current_poke.get_slot_move(t2_move.slot)
+        if t1_move.kind == gs.ACTION_MOVE and (
+            not t1_move_data
+            or (
+                not t1_mv_check_bypass
+                and not self.t1.current_poke.is_move(t1_move_data.name)
+            )
         ):
             raise Exception("Trainer 1 attempted to use move not in Pokemon's moveset")
-        if (
-            t2_move[gs.ACTION_TYPE] == gd.MOVE
-            and not t2_mv_check_bypass
-            and not self.t2.current_poke.is_move(t2_move[gs.ACTION_VALUE])
+        if t2_move.kind == gs.ACTION_MOVE and (
+            not t2_move_data
+            or (
+                not t2_mv_check_bypass
+                and not self.t2.current_poke.is_move(t2_move_data.name)
+            )
         ):
             raise Exception("Trainer 2 attempted to use move not in Pokemon's moveset")
+        if t1_move.kind == gs.ACTION_SWITCH and not self.t1.can_switch_to(t1_move.slot):
+            raise Exception("Trainer 1 attempted to switch to invalid Pokemon")
+        if t2_move.kind == gs.ACTION_SWITCH and not self.t2.can_switch_to(t2_move.slot):
+            raise Exception("Trainer 2 attempted to switch to invalid Pokemon")
+        if t1_move.kind == gs.ACTION_SWITCH and not self.t1.can_switch_out():
+            raise Exception("Trainer 1 attempted to switch out Pokemon that's trapped")
+        if t2_move.kind == gs.ACTION_SWITCH and not self.t2.can_switch_out():
+            raise Exception("Trainer 2 attempted to switch out Pokemon that's trapped")
+        if self.replay_log is not None:
+            self.replay_log.append((t1_move, t2_move))
 
-        if not t1_move_data and t1_move[gs.ACTION_TYPE] == gd.MOVE:
-            t1_move_data = self.t1.current_poke.get_move_data(t1_move[gs.ACTION_VALUE])
-            if not t1_move_data:
-                t1_move_data = Move(PokeSim.get_single_move(t1_move[gs.ACTION_VALUE]))
-        if not t2_move_data and t2_move[gs.ACTION_TYPE] == gd.MOVE:
-            t2_move_data = self.t2.current_poke.get_move_data(t2_move[gs.ACTION_VALUE])
-            if not t2_move_data:
-                t2_move_data = Move(PokeSim.get_single_move(t2_move[gs.ACTION_VALUE]))
-
-        t1_prio = gs.ACTION_PRIORITY[t1_move[gs.ACTION_TYPE]]
-        t2_prio = gs.ACTION_PRIORITY[t2_move[gs.ACTION_TYPE]]
+        t1_prio = gs.ACTION_KIND_PRIORITY[t1_move.kind]
+        t2_prio = gs.ACTION_KIND_PRIORITY[t2_move.kind]
         t1_first = t1_prio >= t2_prio
         if t1_prio == 1 and t2_prio == 1:
             if t1_move_data.prio != t2_move_data.prio:
@@ -156,7 +192,7 @@ class Battle:
                     - self.t2.current_poke.stats_effective[gs.SPD]
                 )
                 if spd_dif == 0:
-                    t1_first = randrange(2) < 1
+                    t1_first = self.rng.randrange(2) < 1
                 else:
                     t1_first = spd_dif > 0
                     if self.battlefield.trick_room_count:
@@ -168,15 +204,18 @@ class Battle:
 
                 t1_first = self._prio_boost_check(t1_first)
 
-        self.add_text("Turn " + str(self.turn_count) + ":")
+        if self.log_text:
+            self.add_text("Turn " + str(self.turn_count) + ":")
+        if self.log_events:
+            self.add_event(gs.EVENT_TURN, value=self.turn_count)
 
         if self._pursuit_check(t1_move, t2_move, t1_move_data, t2_move_data, t1_first):
-            t1_first = t1_move == gd.PURSUIT
+            t1_first = not not t1_move_data and t1_move_data.name == "pursuit"
 
         if self._me_first_check(t1_move_data, t2_move_data):
-            t1_first = t1_move == gd.ME_FIRST
+            t1_first = t1_move_data.name == "me-first"
 
-        self._focus_punch_check(t1_move, t2_move)
+        self._focus_punch_check(t1_move_data, t2_move_data)
 
         if t1_first:
             if self.t1.current_poke.is_alive:
@@ -212,7 +251,7 @@ class Battle:
             faster = self.t2
             slower = self.t1
         else:
-            faster = self.t1 if randrange(2) < 1 else self.t2
+            faster = self.t1 if self.rng.randrange(2) < 1 else self.t2
             slower = self.t2 if faster is self.t1 else self.t1
 
         if faster.current_poke.is_alive:
@@ -230,6 +269,81 @@ class Battle:
         if not slower.current_poke.is_alive:
             self._process_selection(slower)
 
+    def begin_turn(
+        self, t1_turn: ac.Action | list[str], t2_turn: ac.Action | list[str]
+    ) -> ac.SelectionRequest | None:
+        """
+        Processes a turn like turn, except that instead of calling a Trainer's selection function,
+        the turn stops at the first selection it needs and returns a SelectionRequest for it.
+        The battle is left as it was at that point of the turn until resume_turn is called with
+        the selected Pokemon. Returns None once the turn has finished.
+
+        Selections with only one possible Pokemon are made without a SelectionRequest.
+        """
+        if self._pending_turn:
+            raise Exception("Attempted to begin turn while another turn is waiting for a selection")
+        return self._run_resumable_turn(self.snapshot(), t1_turn, t2_turn, ())
+
+    def resume_turn(self, slot: int | None) -> ac.SelectionRequest | None:
+        """
+        Continues the turn waiting for a selection with the Pokemon at position slot of the
+        selecting Trainer's party. If slot is None or not one of the request's slots, the first
+        available Pokemon is selected. Returns the next SelectionRequest, or None once the turn
+        has finished.
+        """
+        if not self._pending_turn:
+            raise Exception("Attempted to resume turn that is not waiting for a selection")
+        start, t1_turn, t2_turn, choices, _ = self._pending_turn
+        self.restore(start)
+        return self._run_resumable_turn(start, t1_turn, t2_turn, choices + (slot,))
+
+    def get_pending_selection(self) -> ac.SelectionRequest | None:
+        return self._pending_turn[4] if self._pending_turn else None
+
+    def _run_resumable_turn(
+        self,
+        start: sn.Snapshot,
+        t1_turn: ac.Action | list[str],
+        t2_turn: ac.Action | list[str],
+        choices: tuple,
+    ) -> ac.SelectionRequest | None:
+        # the turn is replayed from its start with the selections made so far, which plays out
+        # identically because the snapshot also rewinds the rng
+        self._selection_choices = choices
+        self._selection_index = 0
+        try:
+            self.turn(t1_turn, t2_turn)
+        except _SelectionNeeded as e:
+            self._pending_turn = (start, t1_turn, t2_turn, choices, e.request)
+            return e.request
+        finally:
+            self._selection_choices = None
+        self._pending_turn = None
+
+    def clone(self) -> Battle:
+        """
+        Returns an independent copy of the battle, including both Trainers, their Pokemon,
+        and the battle's rng state. Immutable csv data is shared with the original.
+
+        Turns processed on the copy do not affect the original battle and vice versa.
+        """
+        return sn.clone_battle(self)
+
+    def snapshot(self) -> sn.Snapshot:
+        """
+        Returns a Snapshot of the battle's current state that can later be passed to restore.
+        """
+        return sn.Snapshot(self)
+
+    def restore(self, snapshot: sn.Snapshot):
+        """
+        Rewinds the battle to the state saved in snapshot. The battle keeps using the same
+        Trainer and Pokemon objects, so existing references to them remain valid.
+        """
+        if not isinstance(snapshot, sn.Snapshot) or snapshot.pairs[0][0] is not self:
+            raise Exception("Attempted to restore Battle from invalid snapshot")
+        snapshot.restore()
+
     def get_cur_text(self) -> list:
         cur_t = self.cur_text
         self.cur_text = []
@@ -238,28 +352,31 @@ class Battle:
     def get_all_text(self) -> list:
         return self.all_text
 
+    def get_cur_events(self) -> list:
+        return self.events.read()
+
+    def get_all_events(self) -> list:
+        return list(self.events)
+
+    def get_event_text(self, start: int = 0) -> list[str]:
+        """
+        Renders the recorded events from position start onwards as battle text.
+        """
+        return self.events.render(self, start)
+
     def _half_turn(
         self,
         attacker: tr.Trainer,
         defender: tr.Trainer,
-        a_move: list[str],
+        a_move: ac.Action,
         a_move_data: Move = None,
     ):
         if self.winner:
             return
-        if a_move[gs.ACTION_TYPE] == "other":
+        if a_move.kind == gs.ACTION_ITEM:
+            pi.use_item(attacker, self, a_move.item, a_move.slot, a_move.move_slot)
+        elif a_move.kind != gs.ACTION_MOVE:
             self._process_other(attacker, defender, a_move)
-        elif a_move[gs.ACTION_TYPE] == "item":
-            if len(a_move) >= 4:
-                pi.use_item(
-                    a_move[gs.ACTION_VALUE],
-                    a_move[gs.ITEM_POKE_TARGET],
-                    a_move[gs.ITEM_MOVE_TARGET],
-                )
-            elif len(a_move) == 3:
-                pi.use_item(a_move[gs.ACTION_VALUE], a_move[gs.ITEM_POKE_TARGET])
-            else:
-                raise Exception("Trainer attempted to use item with invalid data format")
         elif self._process_pp(attacker.current_poke, a_move_data):
             pm.process_move(
                 attacker.current_poke,
@@ -282,9 +399,10 @@ class Battle:
         is_disabled = move_data.disabled
         attacker.reduce_disabled_count()
         if is_disabled:
-            self.add_text(move_data.name + " is disabled!")
+            if self.log_text:
+                self.add_text(move_data.name + " is disabled!")
             return False
-        if not (move_data.name in gd.TWO_TURN_CHECK and not move_data.ef_stat):
+        if not (move_data.flags & gs.MF_TWO_TURN and not move_data.ef_stat):
             move_data.cur_pp -= 1
             self._pressure_check(attacker, move_data)
         if not move_data.cur_pp and attacker.item == "leppa-berry":
@@ -303,17 +421,20 @@ class Battle:
         if trainer.wish:
             trainer.wish -= 1
             if not trainer.wish:
-                self.add_text(trainer.wish_poke + "'s wish came true!")
+                if self.log_text:
+                    self.add_text(trainer.wish_poke + "'s wish came true!")
                 trainer.current_poke.heal(trainer.current_poke.max_hp // 2)
                 trainer.wish_poke = None
         if poke.v_status[gs.INGRAIN]:
-            self.add_text(poke.nickname + " absorbed nutrients with its roots!")
+            if self.log_text:
+                self.add_text(poke.nickname + " absorbed nutrients with its roots!")
             heal_amt = max(1, poke.max_hp // 16)
             if poke.item == "big-root":
                 heal_amt = int(heal_amt * 1.3)
             poke.heal(heal_amt, text_skip=True)
         if poke.v_status[gs.AQUA_RING]:
-            self.add_text("A veil of water restored " + poke.nickname + "'s HP!")
+            if self.log_text:
+                self.add_text("A veil of water restored " + poke.nickname + "'s HP!")
             heal_amt = max(1, poke.max_hp // 16)
             if poke.item == "big-root":
                 heal_amt = int(heal_amt * 1.3)
@@ -324,35 +445,42 @@ class Battle:
             trainer.fs_count -= 1
             if not trainer.fs_count:
                 poke.take_damage(trainer.fs_dmg)
-                self.add_text(poke.nickname + " took the Future Sight attack!")
+                if self.log_text:
+                    self.add_text(poke.nickname + " took the Future Sight attack!")
         if trainer.dd_count and poke.is_alive:
             trainer.dd_count -= 1
             if not trainer.dd_count:
                 poke.take_damage(trainer.dd_dmg)
-                self.add_text(poke.nickname + " took the Doom Desire attack!")
+                if self.log_text:
+                    self.add_text(poke.nickname + " took the Doom Desire attack!")
         if trainer.reflect:
             trainer.reflect -= 1
         if trainer.light_screen:
             trainer.light_screen -= 1
-            self.add_text(trainer.name + "'s Light Screen wore off.")
+            if self.log_text:
+                self.add_text(trainer.name + "'s Light Screen wore off.")
         if trainer.safeguard:
             trainer.safeguard -= 1
             if not trainer.safeguard:
-                self.add_text(trainer.name + " is no longer protected by Safeguard.")
+                if self.log_text:
+                    self.add_text(trainer.name + " is no longer protected by Safeguard.")
         if trainer.mist:
             trainer.mist -= 1
             if not trainer.mist:
-                self.add_text(trainer.name + " is no longer protected by mist!")
+                if self.log_text:
+                    self.add_text(trainer.name + " is no longer protected by mist!")
         if trainer.tailwind_count:
             trainer.tailwind_count -= 1
             if not trainer.tailwind_count:
-                self.add_text(trainer.name + "'s " + "tailwind petered out!")
+                if self.log_text:
+                    self.add_text(trainer.name + "'s " + "tailwind petered out!")
                 for poke in trainer.poke_list:
                     poke.stats_actual[gs.SPD] //= 2
         if trainer.lucky_chant:
             trainer.lucky_chant -= 1
             if not trainer.lucky_chant:
-                self.add_text(trainer.name + "'s Lucky Chant wore off!")
+                if self.log_text:
+                    self.add_text(trainer.name + "'s Lucky Chant wore off!")
         if (
             trainer.imprisoned_poke
             and not trainer.imprisoned_poke is other.current_poke
@@ -368,34 +496,40 @@ class Battle:
             return
 
         if poke.nv_status and (
-            (poke.has_ability("shed-skin") and randrange(10) < 3)
+            (poke.has_ability("shed-skin") and self.rng.randrange(10) < 3)
             or (poke.has_ability("hydration") and self.battlefield.weather == gs.RAIN)
         ):
             pm.cure_nv_status(poke.nv_status, poke, self)
         if poke.nv_status == gs.BURNED and poke.is_alive:
-            self.add_text(poke.nickname + " was hurt by its burn!")
+            if self.log_text:
+                self.add_text(poke.nickname + " was hurt by its burn!")
             if not poke.has_ability("heatproof"):
                 poke.take_damage(max(1, poke.max_hp // 8))
             else:
                 poke.take_damage(max(1, poke.max_hp // 16))
         if poke.nv_status == gs.POISONED and poke.is_alive:
             if not poke.has_ability("poison-heal"):
-                self.add_text(poke.nickname + " was hurt by poison!")
+                if self.log_text:
+                    self.add_text(poke.nickname + " was hurt by poison!")
                 poke.take_damage(max(1, poke.max_hp // 8))
             else:
-                self.add_text(poke.nickname + " was healed by its Poison Heal!")
+                if self.log_text:
+                    self.add_text(poke.nickname + " was healed by its Poison Heal!")
                 poke.heal(max(1, poke.max_hp // 8))
         if poke.nv_status == gs.BADLY_POISONED and poke.is_alive:
             if not poke.has_ability("poison-heal"):
-                self.add_text(poke.nickname + " was hurt by poison!")
+                if self.log_text:
+                    self.add_text(poke.nickname + " was hurt by poison!")
                 poke.take_damage(max(1, poke.max_hp * poke.nv_counter // 16))
             else:
-                self.add_text(poke.nickname + " was healed by its Poison Heal!")
+                if self.log_text:
+                    self.add_text(poke.nickname + " was healed by its Poison Heal!")
                 poke.heal(max(1, poke.max_hp // 8))
             poke.nv_counter += 1
         if poke.v_status[gs.BINDING_COUNT] and poke.is_alive:
             if poke.binding_poke is other.current_poke and poke.binding_type:
-                self.add_text(poke.nickname + " is hurt by " + poke.binding_type + "!")
+                if self.log_text:
+                    self.add_text(poke.nickname + " is hurt by " + poke.binding_type + "!")
                 poke.take_damage(max(1, poke.max_hp // 16))
                 if not poke.is_alive:
                     return
@@ -408,7 +542,8 @@ class Battle:
                 poke.binding_type = None
                 poke.binding_poke = None
         if poke.v_status[gs.LEECH_SEED] and poke.is_alive:
-            self.add_text(poke.nickname + "'s health is sapped by Leech Seed!")
+            if self.log_text:
+                self.add_text(poke.nickname + "'s health is sapped by Leech Seed!")
             heal_amt = poke.take_damage(max(1, poke.max_hp // 8))
             if poke.item == "big-root":
                 heal_amt = int(heal_amt * 1.3)
@@ -422,15 +557,19 @@ class Battle:
                     other.heal(heal_amt)
                 else:
                     other.take_damage(heal_amt)
-                    self.add_text(other.nickname + " sucked up the liquid ooze!")
+                    if self.log_text:
+                        self.add_text(other.nickname + " sucked up the liquid ooze!")
         if poke.v_status[gs.NIGHTMARE] and poke.is_alive:
-            self.add_text(poke.nickname + " is locked in a nightmare!")
+            if self.log_text:
+                self.add_text(poke.nickname + " is locked in a nightmare!")
             poke.take_damage(max(1, poke.max_hp // 4))
         if poke.v_status[gs.CURSE] and poke.is_alive:
-            self.add_text(poke.nickname + " is afflicted by the curse!")
+            if self.log_text:
+                self.add_text(poke.nickname + " is afflicted by the curse!")
             poke.take_damage(max(1, poke.max_hp // 4))
         if poke.has_ability("solar-power"):
-            self.add_text(poke.nickname + "was hurt by its Solar Power!")
+            if self.log_text:
+                self.add_text(poke.nickname + "was hurt by its Solar Power!")
             poke.take_damage(max(1, poke.max_hp // 8))
         if not poke.is_alive:
             return
@@ -468,19 +607,23 @@ class Battle:
                 poke.encore_move = None
                 for move in poke.moves:
                     move.encore_blocked = False
-                    self.add_text(poke.nickname + "'s encore ended.")
+                    if self.log_text:
+                        self.add_text(poke.nickname + "'s encore ended.")
         if poke.embargo_count:
             poke.embargo_count -= 1
             if not poke.encore_count:
-                self.add_text(poke.nickname + " can use items again!")
+                if self.log_text:
+                    self.add_text(poke.nickname + " can use items again!")
         if poke.hb_count:
             poke.hb_count -= 1
             if not poke.hb_count:
-                self.add_text(poke.nickname + "'s Heal Block wore off!")
+                if self.log_text:
+                    self.add_text(poke.nickname + "'s Heal Block wore off!")
         if poke.uproar:
             poke.uproar -= 1
             if not poke.uproar:
-                self.add_text(poke.nickname + " calmed down.")
+                if self.log_text:
+                    self.add_text(poke.nickname + " calmed down.")
         if poke.protect:
             poke.protect = False
             poke.invulnerable = False
@@ -502,64 +645,80 @@ class Battle:
             poke.v_status[gs.DROWSY] -= 1
             if not poke.v_status[gs.DROWSY] and not poke.nv_status:
                 poke.nv_status = gs.ASLEEP
-                self.add_text(poke.nickname + " fell asleep!")
+                if self.log_text:
+                    self.add_text(poke.nickname + " fell asleep!")
 
-    def _pre_process_move(self, trainer: tr.Trainer, t_move: list) -> list:
-        if t_move[gs.PPM_MOVE] == gd.RECHARGING or t_move[gs.PPM_MOVE] == gd.BIDING:
+    def _pre_process_move(
+        self, trainer: tr.Trainer, t_move: ac.Action | list[str]
+    ) -> tuple[ac.Action | list[str], Move | None, bool]:
+        if t_move == gd.RECHARGING or t_move == gd.BIDING:
             raise Exception("Trainer attempted to use invalid move")
-        if trainer.current_poke.recharging:
-            t_move[gs.PPM_MOVE] = gd.RECHARGING
-        elif not trainer.current_poke.next_moves.empty():
-            t_move[gs.PPM_MOVE_DATA] = trainer.current_poke.next_moves.get()
-            t_move[gs.PPM_MOVE] = [gd.MOVE, t_move[gs.PPM_MOVE_DATA].name]
-            t_move[gs.PPM_BYPASS] = True
-        elif trainer.current_poke.encore_count:
-            t_move[gs.PPM_MOVE_DATA] = trainer.current_poke.encore_move
-            t_move[gs.PPM_MOVE] = [gd.MOVE, t_move[gs.PPM_MOVE_DATA].name]
-            if t_move[gs.PPM_MOVE_DATA].disabled:
-                t_move[gs.PPM_MOVE] = gd.STRUGGLE
-                t_move[gs.PPM_MOVE_DATA] = None
-                t_move[gs.PPM_BYPASS] = True
-        elif (
-            t_move[gs.PPM_MOVE][gs.ACTION_TYPE] == gd.MOVE
-            and trainer.current_poke.no_pp()
-        ):
-            t_move[gs.PPM_MOVE] = gd.STRUGGLE
-            t_move[gs.PPM_MOVE_DATA] = None
-            t_move[gs.PPM_BYPASS] = True
-        elif trainer.current_poke.bide_count:
-            t_move[gs.PPM_MOVE] = gd.BIDING
-        elif trainer.current_poke.rage:
-            t_move[gs.PPM_MOVE] = gd.RAGE
-            t_move[gs.PPM_BYPASS] = True
-        elif trainer.current_poke.uproar:
-            t_move[gs.PPM_MOVE] = gd.UPROAR
-            t_move[gs.PPM_BYPASS] = True
-        return t_move
+        poke = trainer.current_poke
+        if poke.recharging:
+            return ac.Action(gs.ACTION_RECHARGE), None, False
+        if poke.next_moves:
+            return ac.Action(gs.ACTION_MOVE), poke.next_moves.popleft(), True
+        if poke.encore_count:
+            if poke.encore_move.disabled:
+                return ac.Action(gs.ACTION_MOVE), self._get_move(poke, "struggle"), True
+            return ac.Action(gs.ACTION_MOVE), poke.encore_move, False
+        if (
+            t_move.kind == gs.ACTION_MOVE
+            if isinstance(t_move, ac.Action)
+            else t_move[gs.ACTION_TYPE] == gd.MOVE
+        ) and poke.no_pp():
+            return ac.Action(gs.ACTION_MOVE), self._get_move(poke, "struggle"), True
+        if poke.bide_count:
+            return ac.Action(gs.ACTION_BIDE), None, False
+        if poke.rage:
+            return ac.Action(gs.ACTION_MOVE), self._get_move(poke, "rage"), True
+        if poke.uproar:
+            return ac.Action(gs.ACTION_MOVE), self._get_move(poke, "uproar"), True
+        return t_move, None, False
+
+    def _get_move(self, poke: pk.Pokemon, move_name: str) -> Move:
+        move_data = poke.get_move_data(move_name)
+        if not move_data:
+            move_data = Move(PokeSim.get_single_move(move_name))
+        return move_data
 
     def _victory(self, winner: tr.Trainer, loser: tr.Trainer):
         self._process_end_battle()
-        self.add_text(winner.name + " has defeated " + loser.name + "!")
+        if self.log_text:
+            self.add_text(winner.name + " has defeated " + loser.name + "!")
+        if self.log_events:
+            self.add_event(gs.EVENT_WIN, value=1 if winner is self.t1 else 2)
         self.winner = winner
 
-    def _process_selection(self, selector: tr.Trainer) -> bool:
+    def _process_selection(self, selector: tr.Trainer, slot: int | None = None) -> bool:
         if self.winner:
             return True
         old_poke = selector.current_poke
-        if selector.selection:
+        if slot is not None:
+            selector.current_poke = selector.poke_list[slot]
+        elif self._selection_choices is not None:
+            self._resumable_selection(selector, old_poke)
+        elif isinstance(selector.selection, po.Policy):
+            self._policy_selection(selector, old_poke)
+        elif selector.selection:
             selector.selection(self)
         if not selector.current_poke.is_alive or selector.current_poke is old_poke:
             for p in selector.poke_list:
                 if p.is_alive and not p is old_poke:
                     selector.current_poke = p
                     break
+        if slot is None and self.replay_log is not None:
+            self.replay_log.append(selector.poke_list.index(selector.current_poke))
         if not selector.current_poke.is_alive or selector.current_poke is old_poke:
             return True
         if old_poke.is_alive:
             old_poke.switch_out()
-        self.add_text(
-            selector.name + " sent out " + selector.current_poke.nickname + "!"
-        )
+        if self.log_text:
+            self.add_text(
+                selector.name + " sent out " + selector.current_poke.nickname + "!"
+            )
+        if self.log_events:
+            self.add_event(gs.EVENT_SWITCH, selector.current_poke)
 
         if self.battlefield.gravity_count:
             selector.current_poke.grounded = True
@@ -579,14 +738,16 @@ class Battle:
             else:
                 mult = 4
             selector.current_poke.take_damage(selector.current_poke.max_hp // mult)
-            self.add_text(selector.current_poke.nickname + " was hurt by the spikes!")
+            if self.log_text:
+                self.add_text(selector.current_poke.nickname + " was hurt by the spikes!")
         if selector.toxic_spikes and "poison" in selector.current_poke.types:
             selector.toxic_spikes = 0
-            self.add_text(
-                "The poison spikes disappeared from the ground around "
-                + selector.name
-                + "."
-            )
+            if self.log_text:
+                self.add_text(
+                    "The poison spikes disappeared from the ground around "
+                    + selector.name
+                    + "."
+                )
         if (
             selector.toxic_spikes
             and not selector.current_poke.nv_status
@@ -608,55 +769,105 @@ class Battle:
         ):
             if selector.toxic_spikes == 1:
                 selector.current_poke.nv_status = gs.POISONED
-                self.add_text(selector.current_poke.nickname + " was poisoned!")
+                if self.log_text:
+                    self.add_text(selector.current_poke.nickname + " was poisoned!")
+                if self.log_events:
+                    self.add_event(gs.EVENT_STATUS, selector.current_poke, gs.POISONED)
             else:
                 selector.current_poke.nv_status = gs.BADLY_POISONED
                 selector.current_poke.nv_counter = 1
-                self.add_text(selector.current_poke.nickname + " was badly poisoned!")
+                if self.log_text:
+                    self.add_text(selector.current_poke.nickname + " was badly poisoned!")
+                if self.log_events:
+                    self.add_event(
+                        gs.EVENT_STATUS, selector.current_poke, gs.BADLY_POISONED
+                    )
         if selector.stealth_rock and not selector.current_poke.has_ability(
             "magic-guard"
         ):
-            t_mult = PokeSim.get_type_ef("rock", selector.current_poke.types[0])
-            if selector.current_poke.types[1]:
-                t_mult *= PokeSim.get_type_ef("rock", selector.current_poke.types[1])
+            t_mult = PokeSim.get_types_ef(
+                PokeSim.get_type_id("rock"), selector.current_poke.types_id
+            )
             if t_mult:
                 selector.current_poke.take_damage(
                     int(selector.current_poke.max_hp * 0.125 * t_mult)
                 )
-                self.add_text(
-                    "Pointed stones dug into " + selector.current_poke.nickname + "!"
-                )
+                if self.log_text:
+                    self.add_text(
+                        "Pointed stones dug into " + selector.current_poke.nickname + "!"
+                    )
 
         pa.enemy_selection_abilities(selector.current_poke, self.battlefield, self)
         pa.selection_abilities(selector.current_poke, self.battlefield, self)
         return False
 
     def _process_other(
-        self, attacker: tr.Trainer, defender: tr.Trainer, a_move: list[str]
+        self, attacker: tr.Trainer, defender: tr.Trainer, a_move: ac.Action
     ):
-        if a_move == gd.SWITCH:
+        if a_move.kind == gs.ACTION_SWITCH:
+            # switches are checked when the turn starts, so a Pokemon that is trapped here was
+            # trapped earlier in the turn (i.e. by the other Trainer switching in Shadow Tag)
             if attacker.can_switch_out():
-                self._process_selection(attacker)
-            else:
-                raise Exception("Trainer attempted to switch out Pokemon that's trapped")
-        if a_move[gs.ACTION_VALUE] == "recharging":
-            self.add_text(attacker.current_poke.nickname + " must recharge!")
+                self._process_selection(attacker, a_move.slot)
+            elif self.log_text:
+                self.add_text(attacker.current_poke.nickname + " can't escape!")
+        elif a_move.kind == gs.ACTION_RECHARGE:
+            if self.log_text:
+                self.add_text(attacker.current_poke.nickname + " must recharge!")
             attacker.current_poke.recharging = False
-        if a_move[gs.ACTION_VALUE] == "biding":
-            self.add_text(attacker.current_poke.nickname + " is storing energy!")
+        elif a_move.kind == gs.ACTION_BIDE:
+            if self.log_text:
+                self.add_text(attacker.current_poke.nickname + " is storing energy!")
+
+    def _get_selection_slots(
+        self, selector: tr.Trainer, old_poke: pk.Pokemon
+    ) -> tuple[int, ...]:
+        return tuple(
+            i
+            for i in range(len(selector.poke_list))
+            if selector.poke_list[i].is_alive and selector.poke_list[i] is not old_poke
+        )
+
+    def _policy_selection(self, selector: tr.Trainer, old_poke: pk.Pokemon):
+        slots = self._get_selection_slots(selector, old_poke)
+        if len(slots) < 2:
+            return
+        slot = selector.selection.get_selection(
+            self, ac.SelectionRequest(selector, 1 if selector is self.t1 else 2, slots)
+        )
+        selector.current_poke = selector.poke_list[slot]
+
+    def _resumable_selection(self, selector: tr.Trainer, old_poke: pk.Pokemon):
+        slots = self._get_selection_slots(selector, old_poke)
+        if len(slots) < 2:
+            return
+        if self._selection_index == len(self._selection_choices):
+            raise _SelectionNeeded(
+                ac.SelectionRequest(selector, 1 if selector is self.t1 else 2, slots)
+            )
+        slot = self._selection_choices[self._selection_index]
+        self._selection_index += 1
+        if slot in slots:
+            selector.current_poke = selector.poke_list[slot]
 
     def _faint_check(self):
         if self.winner:
             return
         if not self.t1_fainted and not self.t1.current_poke.is_alive:
-            self.add_text(self.t1.current_poke.nickname + " fainted!")
+            if self.log_text:
+                self.add_text(self.t1.current_poke.nickname + " fainted!")
+            if self.log_events:
+                self.add_event(gs.EVENT_FAINT, self.t1.current_poke)
             self.t1_fainted = True
             self.t1.num_fainted += 1
             if self.t1.num_fainted == len(self.t1.poke_list):
                 self._victory(self.t2, self.t1)
                 return
         if not self.t2_fainted and not self.t2.current_poke.is_alive:
-            self.add_text(self.t2.current_poke.nickname + " fainted!")
+            if self.log_text:
+                self.add_text(self.t2.current_poke.nickname + " fainted!")
+            if self.log_events:
+                self.add_event(gs.EVENT_FAINT, self.t2.current_poke)
             self.t2_fainted = True
             self.t2.num_fainted += 1
             if self.t2.num_fainted == len(self.t2.poke_list):
@@ -673,18 +884,18 @@ class Battle:
 
     def _pursuit_check(
         self,
-        t1_move: list[str],
-        t2_move: list[str],
+        t1_move: ac.Action,
+        t2_move: ac.Action,
         t1_move_data: Move,
         t2_move_data: Move,
         t1_first: bool,
     ) -> bool:
-        if t1_move == gd.PURSUIT and (
-            t2_move == gd.SWITCH
-            or (
-                t2_move[gs.ACTION_TYPE] == gd.MOVE
-                and t2_move[gs.ACTION_VALUE] in gd.PURSUIT_CHECK
-                and not t1_first
+        if (
+            t1_move_data
+            and t1_move_data.name == "pursuit"
+            and (
+                t2_move.kind == gs.ACTION_SWITCH
+                or (t2_move_data and t2_move_data.flags & gs.MF_PURSUIT and not t1_first)
             )
         ):
             t1_move_data.cur_pp -= 1
@@ -692,12 +903,12 @@ class Battle:
             t1_move_data = t1_move_data.get_tcopy()
             t1_move_data.power *= 2
             return True
-        elif t2_move == gd.PURSUIT and (
-            t1_move == gd.SWITCH
-            or (
-                t1_move[gs.ACTION_TYPE] == gd.MOVE
-                and t1_move[gs.ACTION_VALUE] in gd.PURSUIT_CHECK
-                and t1_first
+        elif (
+            t2_move_data
+            and t2_move_data.name == "pursuit"
+            and (
+                t1_move.kind == gs.ACTION_SWITCH
+                or (t1_move_data and t1_move_data.flags & gs.MF_PURSUIT and t1_first)
             )
         ):
             t2_move_data.cur_pp -= 1
@@ -718,11 +929,13 @@ class Battle:
             return True
         return False
 
-    def _focus_punch_check(self, t1_move: list[str], t2_move: list[str]):
-        if t1_move == gd.FOCUS_PUNCH:
-            self.add_text(self.t1.current_poke.nickname + " is tightening its focus!")
-        if t2_move == gd.FOCUS_PUNCH:
-            self.add_text(self.t2.current_poke.nickname + " is tightening its focus!")
+    def _focus_punch_check(self, t1_move_data: Move, t2_move_data: Move):
+        if t1_move_data and t1_move_data.name == "focus-punch":
+            if self.log_text:
+                self.add_text(self.t1.current_poke.nickname + " is tightening its focus!")
+        if t2_move_data and t2_move_data.name == "focus-punch":
+            if self.log_text:
+                self.add_text(self.t2.current_poke.nickname + " is tightening its focus!")
 
     def _stall_check(self) -> bool:
         return self.t1.current_poke.has_ability(
@@ -742,7 +955,7 @@ class Battle:
                     < self.t2.current_poke.stats_effective[gs.SPD]
                 )
             else:
-                return randrange(2) < 1
+                return self.rng.randrange(2) < 1
         return self.t2.current_poke.has_ability("stall")
 
     def _ltail_check(self) -> bool:
@@ -770,7 +983,7 @@ class Battle:
                     < self.t2.current_poke.stats_effective[gs.SPD]
                 )
             else:
-                return randrange(2) < 1
+                return self.rng.randrange(2) < 1
         return (
             self.t2.current_poke.item == "lagging-tail"
             or self.t2.current_poke.item == "full-incense"
@@ -794,23 +1007,52 @@ class Battle:
 
     def _prio_boost_check(self, t1_first: bool) -> bool:
         if self.t1.current_poke.prio_boost and self.t2.current_poke.prio_boost:
-            return randrange(2) < 1
+            return self.rng.randrange(2) < 1
         elif self.t1.current_poke.prio_boost or self.t2.current_poke.prio_boost:
             return self.t1.current_poke.prio_boost
         else:
             return t1_first
 
     def add_text(self, txt: str):
-        if not self.winner:
+        if self.log_text and not self.winner:
             self.all_text.append(txt)
             self.cur_text.append(txt)
 
     def _pop_text(self):
+        # the removed line is always the one announcing the move being used, so its event goes too
+        if self.log_events and self.events.size and self.events[-1][0] == gs.EVENT_MOVE:
+            self.events.pop()
+        if not self.log_text:
+            return
         self.all_text.pop()
         self.cur_text.pop()
 
+    def add_event(self, kind: int, poke: pk.Pokemon = None, value: int = 0):
+        """
+        Records an event in the EventLog as (kind, side, slot, value), where side is 1 or 2
+        for the Trainer owning poke (0 for field events) and slot is poke's party position.
+        """
+        if self.winner:
+            return
+        if poke is None:
+            self.events.add(kind, 0, 0, value)
+        else:
+            trainer = poke.trainer
+            self.events.add(
+                kind,
+                1 if trainer is self.t1 else 2,
+                trainer.poke_list.index(poke),
+                value,
+            )
+
     def is_finished(self) -> bool:
         return not not self.winner
 
     def get_winner(self) -> tr.Trainer | None:
         return self.winner
+
+
+class _SelectionNeeded(Exception):
+    def __init__(self, request: ac.SelectionRequest):
+        super().__init__()
+        self.request = request
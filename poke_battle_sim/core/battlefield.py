@@ -22,22 +22,30 @@ class Battlefield:
             self.weather_count -= 1
             if self.weather_count:
                 if self.weather == gs.SANDSTORM:
-                    self.cur_battle.add_text("The sandstorm is raging.")
+                    if self.cur_battle.log_text:
+                        self.cur_battle.add_text("The sandstorm is raging.")
                 elif self.weather == gs.RAIN:
-                    self.cur_battle.add_text("Rain continues to fall.")
+                    if self.cur_battle.log_text:
+                        self.cur_battle.add_text("Rain continues to fall.")
                 elif self.weather == gs.HARSH_SUNLIGHT:
-                    self.cur_battle.add_text("The sunlight is strong.")
+                    if self.cur_battle.log_text:
+                        self.cur_battle.add_text("The sunlight is strong.")
                 elif self.weather == gs.HAIL:
-                    self.cur_battle.add_text("The hail is crashing down.")
+                    if self.cur_battle.log_text:
+                        self.cur_battle.add_text("The hail is crashing down.")
             else:
                 if self.weather == gs.SANDSTORM:
-                    self.cur_battle.add_text("The sandstorm subsided.")
+                    if self.cur_battle.log_text:
+                        self.cur_battle.add_text("The sandstorm subsided.")
                 elif self.weather == gs.RAIN:
-                    self.cur_battle.add_text("The rain stopped.")
+                    if self.cur_battle.log_text:
+                        self.cur_battle.add_text("The rain stopped.")
                 elif self.weather == gs.HARSH_SUNLIGHT:
-                    self.cur_battle.add_text("The harsh sunlight faded.")
+                    if self.cur_battle.log_text:
+                        self.cur_battle.add_text("The harsh sunlight faded.")
                 elif self.weather == gs.HAIL:
-                    self.cur_battle.add_text("The hail stopped.")
+                    if self.cur_battle.log_text:
+                        self.cur_battle.add_text("The hail stopped.")
         if self.gravity_count:
             self.gravity_count -= 1
             if not self.gravity_count:
@@ -47,11 +55,14 @@ class Battlefield:
         if self.trick_room_count:
             self.trick_room_count -= 1
             if not self.trick_room_count:
-                self.cur_battle.add_text("The twisted dimensions returned to normal!")
+                if self.cur_battle.log_text:
+                    self.cur_battle.add_text("The twisted dimensions returned to normal!")
 
     def change_weather(self, weather: int):
         if self.weather != weather:
             self.weather = weather
+            if self.cur_battle.log_events:
+                self.cur_battle.add_event(gs.EVENT_WEATHER, value=weather)
             pa.weather_change_abilities(self.cur_battle, self)
 
     def process_weather_effects(self, poke: pk.Pokemon):
@@ -64,7 +75,8 @@ class Battlefield:
             and not poke.in_water
             and not any(type in poke.types for type in ["ground", "steel", "rock"])
         ):
-            self.cur_battle.add_text(poke.nickname + " is buffeted by the Sandstorm!")
+            if self.cur_battle.log_text:
+                self.cur_battle.add_text(poke.nickname + " is buffeted by the Sandstorm!")
             poke.take_damage(max(1, poke.max_hp // 16))
         if (
             self.weather == gs.HAIL
@@ -73,14 +85,18 @@ class Battlefield:
             and not poke.in_water
             and not any(type in poke.types for type in ["ice"])
         ):
-            self.cur_battle.add_text(poke.nickname + " is buffeted by the Hail!")
+            if self.cur_battle.log_text:
+                self.cur_battle.add_text(poke.nickname + " is buffeted by the Hail!")
             poke.take_damage(max(1, poke.max_hp // 16))
         if self.weather == gs.HAIL and poke.has_ability("ice-body"):
-            self.cur_battle.add_text(poke.nickname + " was healed by its Ice Body!")
+            if self.cur_battle.log_text:
+                self.cur_battle.add_text(poke.nickname + " was healed by its Ice Body!")
             poke.heal(max(1, poke.max_hp // 16), text_skip=True)
         if self.weather == gs.RAIN and poke.has_ability("dry-skin"):
-            self.cur_battle.add_text(poke.nickname + " was healed by its Dry Skin!")
+            if self.cur_battle.log_text:
+                self.cur_battle.add_text(poke.nickname + " was healed by its Dry Skin!")
             poke.heal(max(1, poke.max_hp // 8), text_skip=True)
         if self.weather == gs.HARSH_SUNLIGHT and poke.has_ability("dry-skin"):
-            self.cur_battle.add_text(poke.nickname + " was hurt by its Dry Skin!")
+            if self.cur_battle.log_text:
+                self.cur_battle.add_text(poke.nickname + " was hurt by its Dry Skin!")
             poke.take_damage(max(1, poke.max_hp // 8))
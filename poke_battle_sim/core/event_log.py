@@ -0,0 +1,180 @@
+from __future__ import annotations
+from array import array
+
+from poke_battle_sim.poke_sim import PokeSim
+
+import poke_battle_sim.core.battle as bt
+
+import poke_battle_sim.util.process_move as pm
+
+import poke_battle_sim.conf.global_settings as gs
+
+_STATUS_TEXT = {
+    gs.BURNED: " was burned!",
+    gs.FROZEN: " was frozen solid!",
+    gs.PARALYZED: " is paralyzed! It may be unable to move!",
+    gs.POISONED: " was poisoned!",
+    gs.ASLEEP: " fell asleep!",
+    gs.BADLY_POISONED: " was badly poisoned!",
+}
+
+_CURE_TEXT = {
+    gs.BURNED: "'s burn was healed!",
+    gs.FROZEN: " thawed out!",
+    gs.PARALYZED: " was cured of paralysis!",
+    gs.POISONED: " was cured of poison!",
+    gs.ASLEEP: " woke up!",
+    gs.BADLY_POISONED: " was cured of poison!",
+}
+
+_WEATHER_TEXT = {
+    gs.CLEAR: "The effects of weather disappeared.",
+    gs.HARSH_SUNLIGHT: "The sunlight turned harsh!",
+    gs.RAIN: "It started to rain!",
+    gs.SANDSTORM: "A sandstorm brewed",
+    gs.HAIL: "It started to hail!",
+}
+
+
+class EventLog:
+    _ITEM_SIZE = array("i").itemsize
+
+    def __init__(self, capacity: int = gs.EVENT_LOG_CAPACITY):
+        """
+        Stores battle events as fixed-size records of gs.EVENT_SIZE ints in a preallocated
+        buffer, which doubles in size only when it fills up.
+
+        Each record is (kind, side, slot, value) as described in add_event() in Battle.
+        """
+        self.buf = array("i", bytes(capacity * gs.EVENT_SIZE * self._ITEM_SIZE))
+        self.size = 0
+        self.read_pos = 0
+
+    def add(self, kind: int, side: int, slot: int, value: int):
+        pos = self.size * gs.EVENT_SIZE
+        if pos == len(self.buf):
+            self.buf.extend(bytes(max(pos, gs.EVENT_SIZE) * self._ITEM_SIZE))
+        buf = self.buf
+        buf[pos] = kind
+        buf[pos + 1] = side
+        buf[pos + 2] = slot
+        buf[pos + 3] = value
+        self.size += 1
+
+    def pop(self) -> tuple[int, int, int, int]:
+        """
+        Removes and returns the last event.
+        """
+        event = self[-1]
+        self.size -= 1
+        self.read_pos = min(self.read_pos, self.size)
+        return event
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __getitem__(self, index: int) -> tuple[int, int, int, int]:
+        if index < 0:
+            index += self.size
+        if not 0 <= index < self.size:
+            raise IndexError("event index out of range")
+        pos = index * gs.EVENT_SIZE
+        return tuple(self.buf[pos : pos + gs.EVENT_SIZE])
+
+    def __iter__(self):
+        return self.iter_from(0)
+
+    def iter_from(self, start: int):
+        buf = self.buf
+        for pos in range(start * gs.EVENT_SIZE, self.size * gs.EVENT_SIZE, gs.EVENT_SIZE):
+            yield buf[pos], buf[pos + 1], buf[pos + 2], buf[pos + 3]
+
+    def read(self) -> list[tuple[int, int, int, int]]:
+        """
+        Returns the events added since the last call to read().
+        """
+        events = list(self.iter_from(self.read_pos))
+        self.read_pos = self.size
+        return events
+
+    def view(self) -> memoryview:
+        """
+        Returns a read-only memoryview of the used part of the buffer without copying,
+        e.g. for numpy.frombuffer(log.view(), dtype=numpy.int32).reshape(-1, gs.EVENT_SIZE).
+        """
+        return memoryview(self.buf)[: self.size * gs.EVENT_SIZE].toreadonly()
+
+    def copy(self) -> EventLog:
+        new = EventLog.__new__(EventLog)
+        new.buf = array("i", self.buf)
+        new.size = self.size
+        new.read_pos = self.read_pos
+        return new
+
+    def render(self, battle: bt.Battle, start: int = 0) -> list[str]:
+        """
+        Returns the lines of battle text for the events from position start onwards.
+
+        Every rendered line is written exactly as the battle writes it, in the same order, but
+        only lines that have an event are rendered, so the result is a subset of the battle
+        text (i.e. stat changes and most move effects have no event). EVENT_DAMAGE and EVENT_HEAL
+        carry amounts that the battle text does not show and are not rendered.
+        """
+        text = []
+        prev = None
+        for event in self.iter_from(start):
+            txt = render_event(battle, event, prev)
+            if txt:
+                text.append(txt)
+            prev = event
+        return text
+
+
+def render_event(
+    battle: bt.Battle, event: tuple[int, int, int, int], prev: tuple = None
+) -> str | None:
+    """
+    Returns the line of battle text for event, or None if it has no line. prev is the event
+    before it, which tells Rest apart from other moves that put a Pokemon to sleep.
+    """
+    kind, side, slot, value = event
+    if kind == gs.EVENT_TURN:
+        return "Turn " + str(value) + ":"
+    if kind == gs.EVENT_FAIL:
+        return "But, it failed!"
+    if kind == gs.EVENT_WEATHER:
+        return _WEATHER_TEXT.get(value)
+    if kind == gs.EVENT_WIN:
+        winner, loser = (battle.t1, battle.t2) if value == 1 else (battle.t2, battle.t1)
+        return winner.name + " has defeated " + loser.name + "!"
+
+    trainer = battle.t1 if side == 1 else battle.t2
+    name = trainer.poke_list[slot].nickname
+    if kind == gs.EVENT_MOVE:
+        return name + " used " + pm.cap_name(PokeSim.get_move_name(value)) + "!"
+    if kind == gs.EVENT_SWITCH:
+        return trainer.name + " sent out " + name + "!"
+    if kind == gs.EVENT_MISS:
+        return name + "'s attack missed!"
+    if kind == gs.EVENT_STATUS:
+        if (
+            value == gs.ASLEEP
+            and prev
+            and prev[:3] == (gs.EVENT_MOVE, side, slot)
+            and PokeSim.get_move_name(prev[3]) == "rest"
+        ):
+            return name + " went to sleep!"
+        return name + _STATUS_TEXT[value]
+    if kind == gs.EVENT_CURE:
+        return name + _CURE_TEXT[value]
+    if kind == gs.EVENT_FAINT:
+        return name + " fainted!"
+    if kind == gs.EVENT_CRIT:
+        return "A critical hit!"
+    if kind == gs.EVENT_EFFECTIVENESS:
+        if not value:
+            return "It doesn't affect " + name
+        if value < gs.EFFECTIVENESS_SCALE:
+            return "It's not very effective..."
+        return "It's super effective!"
+
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from poke_battle_sim.poke_sim import PokeSim
+
 import poke_battle_sim.conf.global_settings as gs
 
 
@@ -20,6 +22,7 @@ class Move:
         self.ef_chance = move_data[gs.MOVE_EFFECT_CHANCE]
         self.ef_amount = move_data[gs.MOVE_EFFECT_AMT]
         self.ef_stat = move_data[gs.MOVE_EFFECT_STAT]
+        self.flags = move_data[gs.MOVE_FLAGS]
         self.cur_pp = self.max_pp
         self.pos = None
         self.disabled = 0
@@ -40,6 +43,15 @@ class Move:
         self.ef_amount = self.md[gs.MOVE_EFFECT_AMT]
         self.ef_stat = self.md[gs.MOVE_EFFECT_STAT]
 
+    @property
+    def type(self) -> str:
+        return self._type
+
+    @type.setter
+    def type(self, move_type: str):
+        self.type_id = PokeSim.get_type_id(move_type)
+        self._type = move_type
+
     def get_tcopy(self) -> Move:
         copy = Move(self.md)
         copy.ef_id = self.ef_id
@@ -1,6 +1,5 @@
 from __future__ import annotations
-from random import randrange
-from queue import Queue
+from collections import deque
 
 from poke_battle_sim.poke_sim import PokeSim
 from poke_battle_sim.core.move import Move
@@ -100,7 +99,7 @@ class Pokemon:
                 ]
             ):
                 raise Exception("Attempted to create Pokemon with invalid stats")
-            self.stats_actual = stats_actual
+            self.stats_actual = [stat for stat in stats_actual]
             self.ivs = None
             self.evs = None
             self.nature = None
@@ -171,8 +170,8 @@ class Pokemon:
             self.nv_status = gs.NV_STATUSES[status]
         else:
             self.nv_status = 0
-        if self.nv_status == gs.NV_STATUSES["asleep"]:
-            self.nv_counter = randrange(2, 6)
+        # the sleep counter of a Pokemon created asleep is drawn from its battle's rng in
+        # start_battle
         if self.nv_status == gs.NV_STATUSES["badly poisoned"]:
             self.nv_counter = 1
         else:
@@ -186,6 +185,7 @@ class Pokemon:
         self.in_battle = False
         self.transformed = False
         self.invulnerable = False
+        self.reset_stats()
 
     def calculate_stats_actual(self):
         stats_actual = []
@@ -208,22 +208,60 @@ class Pokemon:
         self.stats_actual = [int(stat) for stat in stats_actual]
 
     def calculate_stats_effective(self, ignore_stats: bool = False):
+        """
+        Sets stats_effective from stats_actual, stat stages, abilities, held items and
+        paralysis. ignore_stats leaves out stat stages (e.g. against Unaware).
+
+        The result of each variant is cached and reused until the Pokemon's stats, stat
+        stages or paralysis change. Pokemon whose ability or held item takes part in stat
+        calculation are always recalculated, since those also depend on weather, status,
+        and other battle state.
+        """
+        cacheable = (
+            not self.ability_hooks & gs.HOOK_STAT_CALC
+            and not self.item_hooks & gs.ITEM_HOOK_STAT_CALC
+        )
+        if cacheable:
+            key = (
+                self.nv_status == gs.PARALYZED,
+                tuple(self.stat_stages),
+                tuple(self.stats_actual),
+            )
+            cached = self.stats_cache[ignore_stats]
+            if cached and cached[0] == key:
+                self.stats_effective = list(cached[1])
+                return
+
+        self.stats_effective = self.get_stats_effective(ignore_stats)
+        pi.stat_calc_item_effects(self)
+        if cacheable:
+            self.stats_cache[ignore_stats] = (key, tuple(self.stats_effective))
+
+    def get_stats_effective(self, ignore_stats: bool = False, weather: int = None) -> list[int]:
+        """
+        Returns the stats that calculate_stats_effective sets, without changing the Pokemon.
+        weather defaults to the weather of the Pokemon's current battle.
+        """
         if not ignore_stats:
+            stats = [self.stats_actual[gs.HP]]
             for s in range(1, 6):
-                self.stats_effective[s] = max(
-                    1,
-                    int(
-                        self.stats_actual[s]
-                        * max(2, 2 + self.stat_stages[s])
-                        / max(2, 2 - self.stat_stages[s])
-                    ),
+                stats.append(
+                    max(
+                        1,
+                        int(
+                            self.stats_actual[s]
+                            * max(2, 2 + self.stat_stages[s])
+                            / max(2, 2 - self.stat_stages[s])
+                        ),
+                    )
                 )
         else:
-            self.stats_effective = [s for s in self.stats_actual]
-        pa.stat_calc_abilities(self)
-        pi.stat_calc_items(self)
+            stats = [s for s in self.stats_actual]
+        pa.stat_calc_abilities(self, stats, weather)
+        pi.stat_calc_items(self, stats)
         if self.nv_status == gs.PARALYZED and not self.has_ability("quick-feet"):
-            self.stats_effective[gs.SPD] //= 4
+            stats[gs.SPD] //= 4
+        return stats
 
     def reset_stats(self):
         self.v_status = [0 for _ in range(gs.V_STATUS_NUM)]
@@ -305,9 +343,37 @@ class Pokemon:
         self.item = self.o_item
         self.h_item = self.item
         self.old_pp = [move.cur_pp for move in self.moves]
-        self.next_moves = Queue()
+        self.next_moves = deque()
         self.types = (self.stats_base[gs.TYPE1], self.stats_base[gs.TYPE2])
-        self.stats_effective = self.stats_actual
+        self.stats_effective = [stat for stat in self.stats_actual]
+        self.stats_cache = [None, None]
+
+    @property
+    def types(self) -> tuple[str, str | None]:
+        return self._types
+
+    @types.setter
+    def types(self, types: tuple[str, str | None]):
+        self.types_id = PokeSim.get_types_id(types)
+        self._types = types
+
+    @property
+    def ability(self) -> str | None:
+        return self._ability
+
+    @ability.setter
+    def ability(self, ability: str | None):
+        self.ability_hooks = pa.get_ability_hooks(ability)
+        self._ability = ability
+
+    @property
+    def item(self) -> str | None:
+        return self._item
+
+    @item.setter
+    def item(self, item: str | None):
+        self.item_hooks, self.item_boost = pi.get_item_data(item)
+        self._item = item
 
     def start_battle(self, battle: bt.Battle):
         self.cur_battle = battle
@@ -318,17 +384,21 @@ class Pokemon:
             if self.cur_battle.t1 is self.trainer
             else self.cur_battle.t1
         )
+        if self.nv_status == gs.ASLEEP and not self.nv_counter:
+            self.nv_counter = battle.rng.randrange(2, 6)
 
     def take_damage(self, damage: int, enemy_move: Move = None) -> int:
         if not damage or damage < 0 or not self.cur_battle:
             return 0
         if self.substitute:
-            self.cur_battle.add_text(
-                "The substitute took damage for " + self.nickname + "!"
-            )
+            if self.cur_battle.log_text:
+                self.cur_battle.add_text(
+                    "The substitute took damage for " + self.nickname + "!"
+                )
             if self.substitute - damage <= 0:
                 self.substitute = 0
-                self.cur_battle.add_text(self.nickname + "'s substitute faded!")
+                if self.cur_battle.log_text:
+                    self.cur_battle.add_text(self.nickname + "'s substitute faded!")
             else:
                 self.substitute -= damage
             return 0
@@ -350,6 +420,10 @@ class Pokemon:
             self.last_damage_taken = self.cur_hp
             if self._endure_check() or self._fband_check() or self._fsash_check():
                 self.cur_hp = 1
+                if self.cur_battle.log_events:
+                    self.cur_battle.add_event(
+                        gs.EVENT_DAMAGE, self, self.last_damage_taken - 1
+                    )
                 return self.last_damage_taken - 1
             self._db_check()
             if (
@@ -358,16 +432,19 @@ class Pokemon:
                 and enemy_move
                 and self.enemy.current_poke.is_alive
             ):
-                self.cur_battle.add_text(
-                    self.enemy.current_poke.name
-                    + "'s "
-                    + enemy_move
-                    + " lost all its PP due to the grudge!"
-                )
+                if self.cur_battle.log_text:
+                    self.cur_battle.add_text(
+                        self.enemy.current_poke.name
+                        + "'s "
+                        + enemy_move
+                        + " lost all its PP due to the grudge!"
+                    )
                 enemy_move.cur_pp = 0
             if not self.cur_battle:
                 return
             self.cur_hp = 0
+            if self.cur_battle.log_events:
+                self.cur_battle.add_event(gs.EVENT_DAMAGE, self, self.last_damage_taken)
             self.is_alive = False
             self.reset_stats()
             self.cur_battle._faint_check()
@@ -375,10 +452,13 @@ class Pokemon:
             return self.last_damage_taken
         if self.rage and self.stat_stages[gs.ATK] < 6:
             self.stat_stages[gs.ATK] += 1
-            self.cur_battle.add_text(self.nickname + "'s rage is building!")
+            if self.cur_battle.log_text:
+                self.cur_battle.add_text(self.nickname + "'s rage is building!")
         self.turn_damage = True
         self.cur_hp -= damage
         self.last_damage_taken = damage
+        if self.cur_battle.log_events:
+            self.cur_battle.add_event(gs.EVENT_DAMAGE, self, damage)
         pi.on_damage_items(self, self.cur_battle, enemy_move)
         return self.last_damage_taken
 
@@ -400,8 +480,11 @@ class Pokemon:
         else:
             self.cur_hp += heal_amount
             r_amt = heal_amount
+        if r_amt and self.cur_battle.log_events:
+            self.cur_battle.add_event(gs.EVENT_HEAL, self, r_amt)
         if not text_skip:
-            self.cur_battle.add_text(self.nickname + " regained health!")
+            if self.cur_battle.log_text:
+                self.cur_battle.add_text(self.nickname + " regained health!")
         return r_amt
 
     def get_move_data(self, move_name: str) -> Move:
@@ -423,8 +506,30 @@ class Pokemon:
                 return True
         return False
 
+    def get_move_slot(self, move_name: str) -> int | None:
+        """
+        Returns the position in moves of the move selected by ['move', move_name], where a move
+        copied with Mimic is selected through Mimic's position.
+        """
+        if self.copied and self.copied.cur_pp:
+            if move_name == "mimic":
+                return
+            if move_name == self.copied.name:
+                move_name = "mimic"
+        for i in range(len(self.moves)):
+            if self.moves[i].name == move_name:
+                return i
+
+    def get_slot_move(self, slot: int | None) -> Move | None:
+        if slot is None or slot >= len(self.moves):
+            return
+        move = self.moves[slot]
+        if move.name == "mimic" and self.copied and self.copied.cur_pp:
+            return self.copied
+        return move
+
     def get_available_moves(self) -> list | None:
-        if not self.next_moves.empty() or self.recharging:
+        if self.next_moves or self.recharging:
             return
         av_moves = [move for move in self.moves if not move.disabled and move.cur_pp]
         if self.copied and self.copied.cur_pp:
@@ -436,9 +541,9 @@ class Pokemon:
         if self.taunt and av_moves:
             av_moves = [move for move in av_moves if move.category != gs.STATUS]
         if self.grounded and av_moves:
-            av_moves = [move for move in av_moves if move not in gd.GROUNDED_CHECK]
+            av_moves = [move for move in av_moves if not move.flags & gs.MF_GROUNDED]
         if self.hb_count and av_moves:
-            av_moves = [move for move in av_moves if move not in gd.HEAL_BLOCK_CHECK]
+            av_moves = [move for move in av_moves if not move.flags & gs.MF_HEAL_BLOCK]
         if (
             self.trainer.imprisoned_poke
             and self.trainer.imprisoned_poke is self.enemy.current_poke
@@ -482,7 +587,7 @@ class Pokemon:
         for move in self.moves:
             move.max_pp = min(5, move.max_pp)
             move.cur_pp = move.max_pp
-        self.stats_actual = target.stats_actual
+        self.stats_actual = [stat for stat in target.stats_actual]
         self.stat_stages = target.stat_stages
         self.accuracy_stage = target.accuracy_stage
         self.evasion_stage = target.evasion_stage
@@ -559,7 +664,7 @@ class Pokemon:
             self.trapped
             or self.perma_trapped
             or self.recharging
-            or not self.next_moves.empty()
+            or self.next_moves
         ):
             return False
         enemy_poke = self.enemy.current_poke
@@ -586,7 +691,7 @@ class Pokemon:
         return not self.embargo_count
 
     def has_ability(self, ability_name: str) -> bool:
-        return not self.ability_suppressed and self.ability == ability_name
+        return not self.ability_suppressed and self._ability == ability_name
 
     def reset_stages(self):
         self.accuracy_stage = 0
@@ -596,14 +701,16 @@ class Pokemon:
 
     def _endure_check(self) -> bool:
         if self.endure:
-            self.cur_battle.add_text(self.nickname + " endured the hit!")
+            if self.cur_battle.log_text:
+                self.cur_battle.add_text(self.nickname + " endured the hit!")
             self.cur_hp = 1
             return True
         return False
 
     def _fband_check(self) -> bool:
-        if self.item == "focus-band" and randrange(10) < 1:
-            self.cur_battle.add_text(self.nickname + " hung on using its Focus Band!")
+        if self.item == "focus-band" and self.cur_battle.rng.randrange(10) < 1:
+            if self.cur_battle.log_text:
+                self.cur_battle.add_text(self.nickname + " hung on using its Focus Band!")
             return True
         return False
 
@@ -613,7 +720,8 @@ class Pokemon:
             and self.cur_hp == self.max_hp
             and not self.item_activated
         ):
-            self.cur_battle.add_text(self.nickname + " hung on using its Focus Sash!")
+            if self.cur_battle.log_text:
+                self.cur_battle.add_text(self.nickname + " hung on using its Focus Sash!")
             self.item_activated = True
             return True
         return False
@@ -622,28 +730,33 @@ class Pokemon:
         if not self.db_count:
             return False
         enemy_poke = self.enemy.current_poke
-        self.cur_battle.add_text(
-            self.nickname + " took down " + enemy_poke.nickname + " down with it!"
-        )
+        if self.cur_battle.log_text:
+            self.cur_battle.add_text(
+                self.nickname + " took down " + enemy_poke.nickname + " down with it!"
+            )
         enemy_poke.faint()
         return True
 
     def _aftermath_check(self, enemy_move: Move):
         if (
             self.has_ability("aftermath")
-            and enemy_move in gd.CONTACT_CHECK
+            and enemy_move
+            and enemy_move.flags & gs.MF_CONTACT
+            and self.cur_battle
             and self.enemy.current_poke.is_alive
             and not self.enemy.current_poke.has_ability("damp")
         ):
             self.enemy.current_poke.take_damage(
                 max(1, self.enemy.current_poke.max_hp // 4)
             )
-            self.cur_battle.add_text(
-                self.enemy.current_poke.nickname
-                + " was hurt by "
-                + self.nickname
-                + "'s Aftermath!"
-            )
+            # the damage can end the battle, which releases the Pokemon from it
+            if self.cur_battle and self.cur_battle.log_text:
+                self.cur_battle.add_text(
+                    self.enemy.current_poke.nickname
+                    + " was hurt by "
+                    + self.nickname
+                    + "'s Aftermath!"
+                )
 
     def give_item(self, item: str):
         self.item = item
@@ -669,11 +782,13 @@ class Pokemon:
         for move in self.moves:
             if move.name == move_name:
                 move.cur_pp = min(move.cur_pp + amount, move.max_pp)
-        self.cur_battle.add_text(
-            self.nickname + "'s " + pm.cap_name(move_name) + "'s pp was restored!"
-        )
+        if self.cur_battle.log_text:
+            self.cur_battle.add_text(
+                self.nickname + "'s " + pm.cap_name(move_name) + "'s pp was restored!"
+            )
 
     def restore_all_pp(self, amount: int):
         for move in self.moves:
             move.cur_pp = min(move.cur_pp + amount, move.max_pp)
-        self.cur_battle.add_text(self.nickname + "'s move's pp were restored!")
+        if self.cur_battle.log_text:
+            self.cur_battle.add_text(self.nickname + "'s move's pp were restored!")
@@ -0,0 +1,219 @@
+from __future__ import annotations
+import queue
+import asyncio
+import threading
+import functools
+from concurrent.futures import Future
+
+import poke_battle_sim.core.trainer as tr
+import poke_battle_sim.core.battle as bt
+import poke_battle_sim.core.action as ac
+
+
+class Policy:
+    def __init__(
+        self,
+        action: callable = None,
+        selection: callable = None,
+        timeout: float = None,
+    ):
+        """
+        A Policy decides a Trainer's turn actions and the Pokemon it sends out in the middle of a turn.
+
+        Optional
+
+        - action: function called as action(battle, trainer) that returns a turn action
+        - selection: function called as selection(battle, request) with a SelectionRequest that
+        returns the position in the party of the Pokemon to send out
+        - timeout: number of seconds each decision may take
+
+        Instead of passing functions, a subclass can override act and select. Either may be a
+        regular function or an async function.
+
+        If a decision raises an exception, takes longer than timeout, or returns an invalid
+        action, the Policy falls back to fallback_action or fallback_selection, which use the
+        current Pokemon's first available move and the first available Pokemon in the party.
+        The number of fallbacks is counted in num_fallbacks.
+
+        Regular functions with a timeout run on the Policy's own threads and are given a copy of
+        the battle, since a decision that runs over its timeout is left to finish on its own.
+        """
+        if action is not None and not callable(action):
+            raise Exception("Attempted to create Policy with invalid action function")
+        if selection is not None and not callable(selection):
+            raise Exception("Attempted to create Policy with invalid selection function")
+        if timeout is not None and (
+            not isinstance(timeout, (int, float)) or isinstance(timeout, bool) or timeout <= 0
+        ):
+            raise Exception("Attempted to create Policy with invalid timeout")
+        self.action = action if action else self.act
+        self.selection = selection if selection else self.select
+        self.timeout = timeout
+        self.num_fallbacks = 0
+        self._idle_workers = []
+
+    def act(self, battle: bt.Battle, trainer: tr.Trainer) -> ac.Action | list[str]:
+        return self.fallback_action(battle, trainer)
+
+    def select(self, battle: bt.Battle, request: ac.SelectionRequest) -> int | None:
+        return self.fallback_selection(battle, request)
+
+    def fallback_action(self, battle: bt.Battle, trainer: tr.Trainer) -> ac.Action:
+        return first_move_policy(battle, trainer)
+
+    def fallback_selection(self, battle: bt.Battle, request: ac.SelectionRequest) -> int:
+        return request.slots[0]
+
+    def get_action(self, battle: bt.Battle, trainer: tr.Trainer) -> ac.Action | list[str]:
+        """
+        Returns the Policy's turn action for trainer, waiting at most timeout seconds.
+        """
+        return self._check_action(battle, trainer, self._run(self.action, battle, trainer))
+
+    def get_selection(self, battle: bt.Battle, request: ac.SelectionRequest) -> int:
+        """
+        Returns the Policy's selection for request, waiting at most timeout seconds.
+        """
+        return self._check_selection(battle, request, self._run(self.selection, battle, request))
+
+    async def decide_action(
+        self, battle: bt.Battle, trainer: tr.Trainer
+    ) -> ac.Action | list[str]:
+        """
+        Same as get_action, but awaits the decision instead of blocking the event loop.
+        """
+        return self._check_action(
+            battle, trainer, await self._run_async(self.action, battle, trainer)
+        )
+
+    async def decide_selection(
+        self, battle: bt.Battle, request: ac.SelectionRequest
+    ) -> int:
+        """
+        Same as get_selection, but awaits the decision instead of blocking the event loop.
+        """
+        return self._check_selection(
+            battle, request, await self._run_async(self.selection, battle, request)
+        )
+
+    def __call__(self, battle: bt.Battle, trainer: tr.Trainer) -> ac.Action | list[str]:
+        return self.get_action(battle, trainer)
+
+    def _check_action(self, battle: bt.Battle, trainer: tr.Trainer, action):
+        if action is None or not (
+            trainer.has_forced_action() or trainer.is_valid_action(action)
+        ):
+            self.num_fallbacks += 1
+            return self.fallback_action(battle, trainer)
+        return action
+
+    def _check_selection(self, battle: bt.Battle, request: ac.SelectionRequest, slot):
+        if slot not in request.slots or isinstance(slot, bool):
+            self.num_fallbacks += 1
+            return self.fallback_selection(battle, request)
+        return slot
+
+    def _run(self, func: callable, battle: bt.Battle, arg):
+        try:
+            if asyncio.iscoroutinefunction(func) and not _in_event_loop():
+                return asyncio.run(asyncio.wait_for(func(battle, arg), self.timeout))
+            if self.timeout is None and not asyncio.iscoroutinefunction(func):
+                return func(battle, arg)
+            return self._submit(func, battle, arg).result(timeout=self.timeout)
+        except Exception:
+            return
+
+    async def _run_async(self, func: callable, battle: bt.Battle, arg):
+        try:
+            if asyncio.iscoroutinefunction(func):
+                return await asyncio.wait_for(func(battle, arg), self.timeout)
+            if self.timeout is None:
+                return func(battle, arg)
+            return await asyncio.wait_for(
+                asyncio.wrap_future(self._submit(func, battle, arg)), self.timeout
+            )
+        except Exception:
+            return
+
+    def _submit(self, func: callable, battle: bt.Battle, arg) -> Future:
+        # the battle keeps changing after a decision times out, so a decision that can time out
+        # is given its own copy of the battle
+        if self.timeout is not None:
+            battle, arg = _copy_args(battle, arg)
+        if asyncio.iscoroutinefunction(func):
+            # asyncio.run cannot be called inside a running event loop (i.e. when a Trainer's
+            # selection is called by a turn processed in async code), so the coroutine is run
+            # on its own event loop in the worker's thread
+            func = functools.partial(_run_coroutine, func)
+
+        # a worker is reused once its decision returns, so a decision that never returns only
+        # keeps its own worker and the clock for every decision starts when it starts running
+        worker = self._idle_workers.pop() if self._idle_workers else _Worker()
+        future = worker.submit(func, battle, arg)
+        future.add_done_callback(lambda _: self._idle_workers.append(worker))
+        return future
+
+
+class _Worker:
+    def __init__(self):
+        # daemon threads do not keep the interpreter from exiting while a decision is stuck
+        self._tasks = queue.SimpleQueue()
+        threading.Thread(target=self._work, daemon=True).start()
+
+    def submit(self, func: callable, *args) -> Future:
+        future = Future()
+        self._tasks.put((future, func, args))
+        return future
+
+    def _work(self):
+        while True:
+            future, func, args = self._tasks.get()
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(func(*args))
+            except BaseException as e:
+                future.set_exception(e)
+
+
+async def play_turn(battle: bt.Battle, t1_policy: Policy, t2_policy: Policy):
+    """
+    Processes one turn of battle with a Policy for each Trainer. Both turn actions are awaited
+    at the same time, and the turn's selections are awaited as they come up.
+    """
+    t1_action, t2_action = await asyncio.gather(
+        t1_policy.decide_action(battle, battle.t1),
+        t2_policy.decide_action(battle, battle.t2),
+    )
+    request = battle.begin_turn(t1_action, t2_action)
+    while request:
+        policy = t1_policy if request.side == 1 else t2_policy
+        request = battle.resume_turn(await policy.decide_selection(battle, request))
+
+
+def first_move_policy(battle: bt.Battle, trainer: tr.Trainer) -> ac.Action:
+    poke = trainer.current_poke
+    av_moves = poke.get_available_moves()
+    if av_moves:
+        return ac.Action.move(poke.get_move_slot(av_moves[0].name))
+    return ac.Action.move(0)
+
+
+def _copy_args(battle: bt.Battle, arg) -> tuple:
+    copy = battle.clone()
+    if isinstance(arg, ac.SelectionRequest):
+        trainer = copy.t1 if arg.side == 1 else copy.t2
+        return copy, ac.SelectionRequest(trainer, arg.side, arg.slots)
+    return copy, copy.t1 if arg is battle.t1 else copy.t2
+
+
+def _run_coroutine(func: callable, *args):
+    return asyncio.run(func(*args))
+
+
+def _in_event_loop() -> bool:
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
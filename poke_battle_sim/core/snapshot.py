@@ -0,0 +1,184 @@
+from __future__ import annotations
+from collections import deque
+from random import Random
+
+from poke_battle_sim.core.move import Move
+
+import poke_battle_sim.core.pokemon as pk
+import poke_battle_sim.core.trainer as tr
+import poke_battle_sim.core.battle as bt
+import poke_battle_sim.core.battlefield as bf
+
+# Values of these types are never mutated in place, so copies can share them
+_IMMUTABLE = {int, float, str, bool, type(None), tuple, frozenset}
+
+# Attributes that may hold other battle objects or mutable containers, per class.
+# Every other attribute holds immutable data (or PokeSim rows and callbacks that are
+# shared between copies), so it is carried over by the attribute dict copy alone.
+_REF_ATTRS = {
+    "Battle": ("t1", "t2", "battlefield", "winner", "last_move", "last_move_next", "rng"),
+    "Trainer": ("poke_list", "current_poke", "imprisoned_poke"),
+    "Battlefield": ("cur_battle", "gravity_stats"),
+    "Pokemon": (
+        "moves",
+        "o_moves",
+        "original",
+        "next_moves",
+        "trainer",
+        "enemy",
+        "cur_battle",
+        "last_move",
+        "last_successful_move",
+        "last_move_next",
+        "last_successful_move_next",
+        "last_move_hit_by",
+        "copied",
+        "binding_poke",
+        "encore_move",
+        "mr_target",
+        "infatuation",
+        "mf_move",
+        "foresight_target",
+        "me_target",
+    ),
+}
+
+# Attributes that only ever hold lists of immutable values (or an EventLog), per class.
+# replay_log also holds Actions, which are never changed after they are created.
+_FLAT_ATTRS = {
+    "Battle": ("all_text", "cur_text", "events", "replay_log"),
+    "Trainer": (),
+    "Battlefield": (),
+    "Pokemon": (
+        "v_status",
+        "stat_stages",
+        "stats_actual",
+        "stats_effective",
+        "stats_cache",
+        "base",
+        "old_pp",
+        "ivs",
+        "evs",
+    ),
+}
+
+_battle_classes = None
+
+
+class Snapshot:
+    def __init__(self, battle: bt.Battle):
+        """
+        A Snapshot holds a private copy of all mutable state reachable from a Battle.
+
+        Restoring a Snapshot writes that state back into the original Battle, Trainer,
+        Pokemon, Battlefield, and Move objects, so outside references to them stay valid.
+        The same Snapshot can be restored any number of times.
+        """
+        copier = _Copier()
+        self.battle = copier.copy(battle)
+        self.pairs = copier.pairs
+        self.rng_states = copier.rng_states
+
+    def restore(self):
+        # the Snapshot's own copies are never used, so the rng states read when it was made
+        # are still current and are not read again
+        copier = _Copier({id(copy): orig for orig, copy in self.pairs}, dict(self.rng_states))
+        for orig, copy in self.pairs:
+            if orig.__class__ is Move:
+                orig.__dict__ = copy.__dict__.copy()
+            else:
+                orig.__dict__ = copier.copy_dict(copy)
+
+
+def clone_battle(battle: bt.Battle) -> bt.Battle:
+    return _Copier().copy(battle)
+
+
+class _Copier:
+    def __init__(self, memo: dict = None, rng_states: dict = None):
+        global _battle_classes
+        if not _battle_classes:
+            _battle_classes = {
+                cls: (_REF_ATTRS[cls.__name__], _FLAT_ATTRS[cls.__name__])
+                for cls in (bt.Battle, tr.Trainer, pk.Pokemon, bf.Battlefield)
+            }
+        self.memo = memo if memo else {}
+        self.pairs = []
+        self.rng_states = rng_states if rng_states else {}
+
+    def copy(self, value):
+        cls = value.__class__
+        if cls in _IMMUTABLE:
+            return value
+        memo = self.memo
+        new = memo.get(id(value))
+        if new is not None:
+            return new
+        if cls is Move:
+            new = object.__new__(cls)
+            memo[id(value)] = new
+            self.pairs.append((value, new))
+            new.__dict__ = value.__dict__.copy()
+        elif cls in _battle_classes:
+            new = object.__new__(cls)
+            memo[id(value)] = new
+            self.pairs.append((value, new))
+            new.__dict__ = self.copy_dict(value)
+        elif cls is list:
+            new = []
+            memo[id(value)] = new
+            # lists of Moves are the most common, so their copies are made here
+            for v in value:
+                if v.__class__ in _IMMUTABLE:
+                    new.append(v)
+                    continue
+                copy = memo.get(id(v))
+                if copy is None:
+                    if v.__class__ is Move:
+                        copy = memo[id(v)] = object.__new__(Move)
+                        self.pairs.append((v, copy))
+                        copy.__dict__ = v.__dict__.copy()
+                    else:
+                        copy = self.copy(v)
+                new.append(copy)
+        elif cls is dict:
+            new = {}
+            memo[id(value)] = new
+            for k, v in value.items():
+                new[k] = self.copy(v)
+        elif cls is deque:
+            new = deque(self.copy(v) for v in value)
+            memo[id(value)] = new
+        elif cls is Random:
+            # reading the state takes longer than the rest of the copy, so it is only done once
+            state = self.rng_states.get(id(value))
+            if state is None:
+                state = value.getstate()
+            new = Random.__new__(Random)
+            new.setstate(state)
+            memo[id(value)] = new
+            self.rng_states[id(new)] = state
+        elif cls is set:
+            new = set(value)
+            memo[id(value)] = new
+        else:
+            return value
+        return new
+
+    def copy_dict(self, obj) -> dict:
+        memo = self.memo
+        ref_attrs, flat_attrs = _battle_classes[obj.__class__]
+        new_dict = obj.__dict__.copy()
+        for k in ref_attrs:
+            v = new_dict.get(k)
+            if v.__class__ not in _IMMUTABLE:
+                new = memo.get(id(v))
+                new_dict[k] = new if new is not None else self.copy(v)
+        for k in flat_attrs:
+            v = new_dict.get(k)
+            if v is not None:
+                new = memo.get(id(v))
+                if new is None:
+                    new = memo[id(v)] = v.copy()
+                new_dict[k] = new
+        return new_dict
@@ -2,11 +2,11 @@ from __future__ import annotations
 
 import poke_battle_sim.core.pokemon as pk
 import poke_battle_sim.core.battle as bt
+import poke_battle_sim.core.action as ac
 
 import poke_battle_sim.util.process_item as pi
 
 import poke_battle_sim.conf.global_settings as gs
-import poke_battle_sim.conf.global_data as gd
 
 
 class Trainer:
@@ -23,7 +23,8 @@ class Trainer:
 
         Optional
 
-        - selection: function that will be called whenever a selection needs to be made (except for using items)
+        - selection: function that will be called whenever a selection needs to be made (except for using items),
+        or a Policy whose selections are used instead
 
         If no selection function is provided or the provided selection function does not select a Pokemon correctly,
         the first available Pokemon in the party will be automatically selected.
@@ -42,7 +43,7 @@ class Trainer:
             )
         if not name or not isinstance(name, str):
             raise Exception("Attempted to create Trainer without providing name")
-        if selection and not isinstance(selection, callable):
+        if selection and not callable(selection):
             raise Exception(
                 "Attempted to create Trainer with invalid selection function"
             )
@@ -77,56 +78,130 @@ class Trainer:
         self.in_battle = False
         self.has_moved = False
 
-    def is_valid_action(self, action: list[str]) -> bool:
-        if not isinstance(action, list) or len(action) < 2:
-            return False
-        if action[gs.ACTION_TYPE] == gd.MOVE:
-            return self.can_use_move(action)
-        if action == gd.SWITCH:
-            return self.can_switch_out()
-        if action[gs.ACTION_TYPE] == gd.ITEM:
+    def is_valid_action(self, action: ac.Action | list[str]) -> bool:
+        if not isinstance(action, ac.Action):
+            action = ac.Action.from_list(self, action)
+            if not action:
+                return False
+        if action.kind == gs.ACTION_MOVE:
             return self.can_use_move(action)
+        if action.kind == gs.ACTION_SWITCH:
+            return self.can_switch_out() and self.can_switch_to(action.slot)
+        if action.kind == gs.ACTION_ITEM:
+            return self.can_use_item(action)
         return False
 
     def can_switch_out(self) -> bool:
         return self.current_poke.can_switch_out()
 
-    def can_use_item(self, item_action: list[str]) -> bool:
-        if (
-            not isinstance(item_action, list)
-            or not isinstance(item_action[gs.ACTION_TYPE], str)
-            or item_action[gs.ACTION_TYPE] != "item"
-        ):
+    def can_switch_to(self, slot: int | None) -> bool:
+        if slot is None:
+            return True
+        return (
+            slot < len(self.poke_list)
+            and self.poke_list[slot].is_alive
+            and self.poke_list[slot] is not self.current_poke
+        )
+
+    def can_use_item(self, item_action: ac.Action | list[str]) -> bool:
+        if not isinstance(item_action, ac.Action):
+            item_action = ac.Action.from_list(self, item_action)
+        if not item_action or item_action.kind != gs.ACTION_ITEM:
             return False
-        if len(item_action) == 3:
-            return pi.can_use_item(
-                self,
-                self.cur_battle,
-                item_action[gs.ACTION_VALUE],
-                item_action[gs.ITEM_TARGET_POS],
-            )
-        elif len(item_action) == 4:
-            return pi.can_use_item(
-                self,
-                self.cur_battle,
-                item_action[gs.ACTION_VALUE],
-                item_action[gs.ITEM_TARGET_POS],
-                item_action[gs.MOVE_TARGET_POS],
-            )
-        return False
+        return pi.can_use_item(
+            self,
+            self.current_poke.cur_battle,
+            item_action.item,
+            item_action.slot,
+            item_action.move_slot,
+        )
 
-    def can_use_move(self, move_action: list[str]) -> bool:
-        if (
-            not isinstance(move_action, list)
-            or not isinstance(move_action[gs.ACTION_TYPE], str)
-            or move_action[gs.ACTION_TYPE] != "move"
-        ):
+    def can_use_move(self, move_action: ac.Action | list[str]) -> bool:
+        if not isinstance(move_action, ac.Action):
+            move_action = ac.Action.from_list(self, move_action)
+        if not move_action or move_action.kind != gs.ACTION_MOVE:
             return False
-        if len(move_action) == 2:
-            return any(
-                [
-                    move_action[gs.ACTION_VALUE] == move.name
-                    for move in self.current_poke.get_available_moves()
-                ]
-            )
-        return False
+        if not self.has_forced_action() and self.current_poke.no_pp():
+            return True
+        move = self.current_poke.get_slot_move(move_action.slot)
+        return not not move and self.current_poke.is_move(move.name)
+
+    def has_forced_action(self) -> bool:
+        """
+        Returns True if the current Pokemon's action this turn is decided for it (i.e. while it is
+        recharging or locked into a move), in which case turn in Battle ignores the Trainer's action.
+        """
+        poke = self.current_poke
+        return not not (
+            poke.recharging
+            or poke.next_moves
+            or poke.encore_count
+            or poke.bide_count
+            or poke.rage
+            or poke.uproar
+        )
+
+    def legal_action_mask(self, out=None):
+        """
+        Returns a numpy bool array of length gs.ACTION_SPACE_SIZE marking which actions the Trainer
+        can take this turn, laid out as:
+
+        - gs.ACTION_SPACE_MOVES + i: use the move in position i of the current Pokemon's moves
+        - gs.ACTION_SPACE_SWITCHES + j: switch to the j-th other Pokemon in the party, in party order
+        - gs.ACTION_SPACE_STRUGGLE: use Struggle; this is also the only legal action while the
+        current Pokemon's action is decided for it, i.e. while it is recharging
+
+        If out is provided, the mask is written into it instead of a new array.
+        get_action converts the index of a legal action into an Action. Requires numpy.
+
+        The mask describes the state at the start of the turn. If both Trainers switch and the
+        Pokemon switched in first traps the other Trainer's current Pokemon (i.e. with Shadow Tag
+        or Arena Trap), the second switch is skipped and that Pokemon stays in.
+        """
+        import numpy as np
+
+        if out is None:
+            out = np.zeros(gs.ACTION_SPACE_SIZE, dtype=bool)
+        else:
+            out[:] = False
+        poke = self.current_poke
+        if self.has_forced_action():
+            out[gs.ACTION_SPACE_STRUGGLE] = True
+            return out
+
+        av_moves = poke.get_available_moves()
+        if all(not move.cur_pp or move.disabled or move.encore_blocked for move in av_moves):
+            out[gs.ACTION_SPACE_STRUGGLE] = True
+        else:
+            copied = poke.copied if poke.copied and poke.copied.cur_pp else None
+            for i in range(min(len(poke.moves), gs.MAX_MOVES)):
+                move = poke.moves[i]
+                if copied and move.name == "mimic":
+                    move = copied
+                out[gs.ACTION_SPACE_MOVES + i] = move is copied or move in av_moves
+
+        if poke.can_switch_out():
+            j = gs.ACTION_SPACE_SWITCHES
+            for other in self.poke_list:
+                if other is not poke:
+                    out[j] = other.is_alive
+                    j += 1
+        return out
+
+    def get_action(self, index: int) -> ac.Action:
+        """
+        Returns the Action for an index of the mask returned by legal_action_mask.
+        """
+        index = int(index)
+        if gs.ACTION_SPACE_MOVES <= index < gs.ACTION_SPACE_SWITCHES:
+            return ac.Action.move(index - gs.ACTION_SPACE_MOVES)
+        if gs.ACTION_SPACE_SWITCHES <= index < gs.ACTION_SPACE_STRUGGLE:
+            j = gs.ACTION_SPACE_SWITCHES
+            for slot in range(len(self.poke_list)):
+                if self.poke_list[slot] is not self.current_poke:
+                    if j == index:
+                        return ac.Action.switch(slot)
+                    j += 1
+        if index == gs.ACTION_SPACE_STRUGGLE:
+            return ac.Action.struggle()
+        raise Exception("Attempted to get Action with invalid index")
@@ -1,78 +1,236 @@
-import csv
+import os
+import sys
+import zlib
+import struct
 import random
-import importlib.resources
+import marshal
 
 import poke_battle_sim.conf.global_settings as gs
+import poke_battle_sim.conf.global_data as gd
+
+
+class _LazyTable:
+    def __init__(self, csv_name: str):
+        """
+        Stands in for a PokeSim table until the table is first used.
+
+        The first access loads every table parsed from csv_name, which replaces all
+        of their placeholders, so later accesses are plain class attribute lookups.
+        """
+        self.csv_name = csv_name
+
+    def __set_name__(self, owner, name: str):
+        self.name = name
+
+    def __get__(self, instance, owner):
+        owner._load_csv(self.csv_name)
+        return owner.__dict__[self.name]
 
 
 class PokeSim:
-    _pokemon_stats = []
-    _name_to_id = {}
-    _natures = {}
-    _nature_list = []
-    _move_list = []
-    _move_name_to_id = {}
-    _type_effectives = []
-    _type_to_id = {}
-    _ability_list = []
-    _abilities = {}
-    _item_list = []
-    _items = {}
-
-    @classmethod
-    def start(cls):
-        if len(cls._pokemon_stats):
+    _pokemon_stats = _LazyTable(gs.POKEMON_STATS_CSV)
+    _name_to_id = _LazyTable(gs.POKEMON_STATS_CSV)
+    _natures = _LazyTable(gs.NATURES_CSV)
+    _nature_list = _LazyTable(gs.NATURES_CSV)
+    _move_list = _LazyTable(gs.MOVES_CSV)
+    _move_name_to_id = _LazyTable(gs.MOVES_CSV)
+    _type_effectives = _LazyTable(gs.TYPE_EF_CSV)
+    _type_to_id = _LazyTable(gs.TYPE_EF_CSV)
+    _type_ids = _LazyTable(gs.TYPE_EF_CSV)
+    _type_slot_num = _LazyTable(gs.TYPE_EF_CSV)
+    _types_ef = _LazyTable(gs.TYPE_EF_CSV)
+    _ability_list = _LazyTable(gs.ABILITIES_CSV)
+    _abilities = _LazyTable(gs.ABILITIES_CSV)
+    _item_list = _LazyTable(gs.ITEMS_CSV)
+    _items = _LazyTable(gs.ITEMS_CSV)
+
+    _csv_tables = {
+        gs.POKEMON_STATS_CSV: ("_pokemon_stats", "_name_to_id"),
+        gs.NATURES_CSV: ("_natures", "_nature_list"),
+        gs.MOVES_CSV: ("_move_list", "_move_name_to_id"),
+        gs.TYPE_EF_CSV: ("_type_effectives", "_type_to_id"),
+        gs.ABILITIES_CSV: ("_ability_list", "_abilities"),
+        gs.ITEMS_CSV: ("_item_list", "_items"),
+    }
+
+    @classmethod
+    def start(cls, use_cache: bool = True):
+        """
+        Loads all csv data used by the simulator. Calling start again has no effect.
+
+        Calling start is optional: each table is loaded independently the first time it is used.
+        start is still useful to pay the loading cost up front, i.e. in worker processes.
+
+        If use_cache is True, each parsed csv is read from a binary cache file in a single read.
+        The cache is rebuilt automatically when it is missing, was written by a different version
+        of the package or Python, or when its csv file changed. If the cache directory cannot be
+        read or written, the csv files are parsed as usual.
+        """
+        for csv_name in gs.DATA_CSVS:
+            cls._load_csv(csv_name, use_cache)
+
+    @classmethod
+    def build_cache(cls) -> list[str] | None:
+        """
+        Parses every csv file and writes its binary cache, i.e. as a build step before starting workers.
+
+        Returns the paths of the cache files, or None if they could not be written.
+        """
+        cache_paths = []
+        for csv_name in gs.DATA_CSVS:
+            csv_text = cls._read_csv(csv_name)
+            signature = cls._csv_signature(csv_text)
+            cache_path = cls._write_cache(csv_name, signature, cls._parse_csv(csv_name, csv_text))
+            if not cache_path:
+                return
+            cache_paths.append(cache_path)
+        return cache_paths
+
+    @classmethod
+    def _load_csv(cls, csv_name: str, use_cache: bool = True):
+        table_names = cls._csv_tables[csv_name]
+        if not isinstance(cls.__dict__[table_names[0]], _LazyTable):
             return
 
-        with open(importlib.resources.files(gs.DATA_DIR).joinpath(gs.POKEMON_STATS_CSV)) as csv_file:
-            csv_reader = csv.reader(csv_file, delimiter=",")
-            next(csv_reader)
+        csv_text = cls._read_csv(csv_name)
+        signature = cls._csv_signature(csv_text)
+        tables = cls._read_cache(csv_name, signature) if use_cache else None
+        if tables is None or len(tables) != len(table_names):
+            tables = cls._parse_csv(csv_name, csv_text)
+            if use_cache:
+                cls._write_cache(csv_name, signature, tables)
+
+        for table_name, table in zip(table_names, tables):
+            setattr(cls, table_name, table)
+        if csv_name == gs.TYPE_EF_CSV:
+            cls._build_types_ef()
+        elif csv_name == gs.MOVES_CSV:
+            cls._build_move_flags()
+
+    @classmethod
+    def _read_csv(cls, csv_name: str) -> bytes:
+        try:
+            with open(os.path.join(os.path.dirname(__file__), "data", csv_name), "rb") as csv_file:
+                return csv_file.read()
+        except OSError:
+            import importlib.resources
+
+            return importlib.resources.files(gs.DATA_DIR).joinpath(csv_name).read_bytes()
+
+    @classmethod
+    def _parse_csv(cls, csv_name: str, csv_text: bytes) -> tuple:
+        import io
+        import csv
+
+        csv_reader = csv.reader(io.StringIO(csv_text.decode()), delimiter=",")
+        next(csv_reader)
+
+        if csv_name == gs.POKEMON_STATS_CSV:
+            pokemon_stats = []
+            name_to_id = {}
             for row in csv_reader:
                 for num in gs.POKEMON_STATS_NUMS:
                     row[num] = int(row[num])
-                cls._pokemon_stats.append(row)
-                cls._name_to_id[row[1]] = row[0]
+                pokemon_stats.append(row)
+                name_to_id[row[1]] = row[0]
+            return pokemon_stats, name_to_id
 
-        with open(importlib.resources.files(gs.DATA_DIR).joinpath(gs.NATURES_CSV)) as csv_file:
-            csv_reader = csv.reader(csv_file, delimiter=",")
-            next(csv_reader)
+        if csv_name == gs.NATURES_CSV:
+            natures = {}
+            nature_list = []
             for row in csv_reader:
-                cls._natures[row[0]] = (int(row[1]), int(row[2]))
-                cls._nature_list.append(row[0])
+                natures[row[0]] = (int(row[1]), int(row[2]))
+                nature_list.append(row[0])
+            return natures, nature_list
 
-        with open(importlib.resources.files(gs.DATA_DIR).joinpath(gs.MOVES_CSV)) as csv_file:
-            csv_reader = csv.reader(csv_file, delimiter=",")
-            next(csv_reader)
+        if csv_name == gs.MOVES_CSV:
+            move_list = []
+            move_name_to_id = {}
             for row in csv_reader:
                 for num in gs.MOVES_NUM:
                     if row[num]:
                         row[num] = int(row[num])
-                cls._move_list.append(row)
-                cls._move_name_to_id[row[1]] = row[0]
+                move_list.append(row)
+                move_name_to_id[row[1]] = row[0]
+            return move_list, move_name_to_id
 
-        with open(importlib.resources.files(gs.DATA_DIR).joinpath(gs.TYPE_EF_CSV)) as csv_file:
-            csv_reader = csv.reader(csv_file, delimiter=",")
-            next(csv_reader)
+        if csv_name == gs.TYPE_EF_CSV:
+            type_effectives = []
+            type_to_id = {}
             line_count = 0
             for row in csv_reader:
-                cls._type_to_id[row[0]] = line_count
+                type_to_id[row[0]] = line_count
                 row = [float(row[i]) for i in range(1, len(row))]
-                cls._type_effectives.append(row)
+                type_effectives.append(row)
                 line_count += 1
+            return type_effectives, type_to_id
 
-        with open(importlib.resources.files(gs.DATA_DIR).joinpath(gs.ABILITIES_CSV)) as csv_file:
-            csv_reader = csv.reader(csv_file, delimiter=",")
-            next(csv_reader)
+        if csv_name == gs.ABILITIES_CSV:
+            ability_list = []
+            abilities = {}
             for row in csv_reader:
-                cls._abilities[row[1]] = (row[0], row[2])
-                cls._ability_list.append(row[1])
+                abilities[row[1]] = (row[0], row[2])
+                ability_list.append(row[1])
+            return ability_list, abilities
 
-        with open(importlib.resources.files(gs.DATA_DIR).joinpath(gs.ITEMS_CSV)) as csv_file:
-            csv_reader = csv.reader(csv_file, delimiter=",")
-            next(csv_reader)
-            for row in csv_reader:
-                cls._items[row[1]] = (row[0], row[2])
-                cls._item_list.append(row[1])
+        item_list = []
+        items = {}
+        for row in csv_reader:
+            items[row[1]] = (row[0], row[2])
+            item_list.append(row[1])
+        return item_list, items
+
+    @classmethod
+    def _csv_signature(cls, csv_text: bytes) -> bytes:
+        return struct.pack(
+            gs.CACHE_HEADER_FORMAT,
+            gs.CACHE_MAGIC,
+            gs.CACHE_VERSION,
+            marshal.version,
+            sys.hexversion >> 16,
+            zlib.crc32(csv_text),
+        )
+
+    @classmethod
+    def _cache_path(cls, csv_name: str) -> str:
+        cache_dir = os.environ.get(gs.CACHE_DIR_ENV)
+        if not cache_dir:
+            cache_dir = os.path.join(
+                os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"),
+                gs.CACHE_DIR_NAME,
+            )
+        return os.path.join(cache_dir, csv_name + gs.CACHE_SUFFIX)
+
+    @classmethod
+    def _read_cache(cls, csv_name: str, signature: bytes) -> tuple | None:
+        try:
+            with open(cls._cache_path(csv_name), "rb") as cache_file:
+                data = cache_file.read()
+            if data[: len(signature)] != signature:
+                return
+            tables = marshal.loads(data[len(signature) :])
+        except (OSError, EOFError, ValueError, TypeError):
+            return
+        if not isinstance(tables, tuple):
+            return
+        return tables
+
+    @classmethod
+    def _write_cache(cls, csv_name: str, signature: bytes, tables: tuple) -> str | None:
+        cache_path = cls._cache_path(csv_name)
+        tmp_path = cache_path + "." + str(os.getpid()) + ".tmp"
+        try:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            with open(tmp_path, "wb") as cache_file:
+                cache_file.write(signature + marshal.dumps(tables))
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            return
+        return cache_path
 
     @classmethod
     def _convert_name_to_id(cls, name: str) -> int:
@@ -93,7 +251,9 @@ class PokeSim:
 
     @classmethod
     def get_pokemon(cls, name_or_id: str | int) -> list | None:
-        p_id = cls.get_valid_name_or_id(name_or_id.lower())
+        if isinstance(name_or_id, str):
+            name_or_id = name_or_id.lower()
+        p_id = cls.get_valid_name_or_id(name_or_id)
         if not p_id:
             return
         return cls._pokemon_stats[p_id - 1]
@@ -123,6 +283,14 @@ class PokeSim:
     def get_single_move(cls, move: str):
         return cls._move_list[cls._move_name_to_id[move] - 1]
 
+    @classmethod
+    def get_move_id(cls, move: str) -> int | None:
+        return cls._move_name_to_id.get(move)
+
+    @classmethod
+    def get_move_name(cls, move_id: int) -> str:
+        return cls._move_list[move_id - 1][gs.MOVE_NAME]
+
     @classmethod
     def check_status(cls, status: str):
         return
@@ -135,6 +303,73 @@ class PokeSim:
             cls._type_to_id[def_type]
         ]
 
+    @classmethod
+    def _build_types_ef(cls):
+        type_num = len(cls._type_to_id)
+        cls._type_ids = dict(cls._type_to_id)
+        cls._type_ids["typeless"] = type_num
+        cls._type_ids[None] = cls._type_ids[""] = type_num + 1
+        cls._type_slot_num = type_num + 2
+
+        type_efs = [row + [1.0, 1.0] for row in cls._type_effectives]
+        type_efs.append([1.0 for _ in range(cls._type_slot_num)])
+        cls._types_ef = [
+            atk_row[type1] * atk_row[type2]
+            for atk_row in type_efs
+            for type1 in range(cls._type_slot_num)
+            for type2 in range(cls._type_slot_num)
+        ]
+
+    @classmethod
+    def _build_move_flags(cls):
+        move_flags = {}
+        for flag, moves in (
+            (gs.MF_PURSUIT, gd.PURSUIT_CHECK),
+            (gs.MF_GROUNDED, gd.GROUNDED_CHECK),
+            (gs.MF_HEAL_BLOCK, gd.HEAL_BLOCK_CHECK),
+            (gs.MF_METRONOME, gd.METRONOME_CHECK),
+            (gs.MF_ENCORE, gd.ENCORE_CHECK),
+            (gs.MF_ASSIST, gd.ASSIST_CHECK),
+            (gs.MF_MAGIC_COAT, gd.MAGIC_COAT_CHECK),
+            (gs.MF_SNATCH, gd.SNATCH_CHECK),
+            (gs.MF_SOUNDPROOF, gd.SOUNDPROOF_CHECK),
+            (gs.MF_FREEZE, gd.FREEZE_CHECK),
+            (gs.MF_PUNCH, gd.PUNCH_CHECK),
+            (gs.MF_RECOIL, gd.RECOIL_CHECK),
+            (gs.MF_CONTACT, gd.CONTACT_CHECK),
+            (gs.MF_EXTRA_FLINCH, gd.EXTRA_FLINCH_CHECK),
+            (gs.MF_TWO_TURN, gd.TWO_TURN_CHECK),
+        ):
+            for move in moves:
+                move_flags[move] = move_flags.get(move, 0) | flag
+
+        for row in cls._move_list:
+            row.append(move_flags.get(row[gs.MOVE_NAME], 0))
+
+    @classmethod
+    def get_move_flags(cls, move: str) -> int:
+        if move not in cls._move_name_to_id:
+            return 0
+        return cls._move_list[cls._move_name_to_id[move] - 1][gs.MOVE_FLAGS]
+
+    @classmethod
+    def get_type_id(cls, type: str | None) -> int:
+        if type not in cls._type_ids:
+            raise Exception("Attempted to get id of invalid type")
+        return cls._type_ids[type]
+
+    @classmethod
+    def get_types_id(cls, types: tuple[str, str | None]) -> int:
+        return cls.get_type_id(types[0]) * cls._type_slot_num + cls.get_type_id(types[1])
+
+    @classmethod
+    def get_types_ef(cls, move_type_id: int, types_id: int) -> float:
+        return cls._types_ef[move_type_id * cls._type_slot_num ** 2 + types_id]
+
+    @classmethod
+    def get_types_ef_table(cls) -> list[float]:
+        return cls._types_ef
+
     @classmethod
     def get_all_types(cls) -> list:
         return list(cls._type_to_id.keys())
@@ -148,36 +383,37 @@ class PokeSim:
         return [type for type in types if type in cls._type_to_id]
 
     @classmethod
-    def get_rand_move(cls) -> list:
-        return cls._move_list[random.randrange(gs.COMPLETED_MOVES)]
+    def get_rand_move(cls, rng: random.Random = None) -> list:
+        return cls._move_list[(rng or random).randrange(gs.COMPLETED_MOVES)]
 
     @classmethod
-    def get_rand_ability(cls) -> str:
-        return cls._ability_list[random.randrange(len(cls._ability_list))]
+    def get_rand_ability(cls, rng: random.Random = None) -> str:
+        return cls._ability_list[(rng or random).randrange(len(cls._ability_list))]
 
     @classmethod
-    def get_rand_item(cls) -> str:
-        return cls._item_list[random.randrange(len(cls._item_list))]
+    def get_rand_item(cls, rng: random.Random = None) -> str:
+        return cls._item_list[(rng or random).randrange(len(cls._item_list))]
 
     @classmethod
-    def get_rand_poke_id(cls) -> int:
-        return random.randrange(1, len(cls._pokemon_stats))
+    def get_rand_poke_id(cls, rng: random.Random = None) -> int:
+        return (rng or random).randrange(1, len(cls._pokemon_stats))
 
     @classmethod
-    def get_rand_stats(cls) -> list[int]:
-        return [random.randrange(gs.STAT_ACTUAL_MIN, gs.STAT_ACTUAL_MAX + 1) for _ in range(6)]
+    def get_rand_stats(cls, rng: random.Random = None) -> list[int]:
+        rng = rng or random
+        return [rng.randrange(gs.STAT_ACTUAL_MIN, gs.STAT_ACTUAL_MAX + 1) for _ in range(6)]
 
     @classmethod
-    def get_rand_gender(cls) -> str:
-        return gs.POSSIBLE_GENDERS[random.randrange(len(gs.POSSIBLE_GENDERS))]
+    def get_rand_gender(cls, rng: random.Random = None) -> str:
+        return gs.POSSIBLE_GENDERS[(rng or random).randrange(len(gs.POSSIBLE_GENDERS))]
 
     @classmethod
-    def get_rand_level(cls) -> int:
-        return random.randrange(gs.LEVEL_MIN, gs.LEVEL_MAX + 1)
+    def get_rand_level(cls, rng: random.Random = None) -> int:
+        return (rng or random).randrange(gs.LEVEL_MIN, gs.LEVEL_MAX + 1)
 
     @classmethod
-    def get_rand_nature(cls) -> str:
-        return cls._nature_list[random.randrange(len(cls._nature_list))]
+    def get_rand_nature(cls, rng: random.Random = None) -> str:
+        return cls._nature_list[(rng or random).randrange(len(cls._nature_list))]
 
     @classmethod
     def check_ability(cls, ability: str) -> bool:
@@ -0,0 +1,229 @@
+from __future__ import annotations
+import os
+import mmap
+import operator
+import struct
+import hashlib
+
+from poke_battle_sim.tools.replay import Replay, encode_team
+
+import poke_battle_sim.conf.global_settings as gs
+
+# Index records are (team_1_hash, team_2_hash, offset, length, turn_count, winner)
+_INDEX_RECORD = struct.Struct("<QQQIIB3x")
+
+
+class ReplayArchive:
+    def __init__(self, path: str, writable: bool = False):
+        """
+        An append-only file of replays with a sidecar index file (path + gs.ARCHIVE_INDEX_SUFFIX).
+
+        Required
+
+        - path: path of the archive's data file
+
+        Optional
+
+        - writable: if True, the archive is created if it does not exist and replays can be appended
+
+        Battle ids are the positions of replays in the archive, starting from 0. The index holds a
+        fixed-size record per battle with both teams' hashes, the winner, the turn count, and the
+        replay's position in the data file, and both files are memory-mapped, so opening an archive
+        does not read it and any replay can be fetched directly.
+        """
+        self.path = path
+        self.index_path = path + gs.ARCHIVE_INDEX_SUFFIX
+        self.writable = writable
+        self._data_file = None
+        self._index_file = None
+        self._data_map = None
+        self._index_map = None
+        if writable:
+            self._data_file = open(path, "ab")
+            self._index_file = open(self.index_path, "ab")
+            if not self._data_file.tell():
+                self._write_header(self._data_file, gs.ARCHIVE_MAGIC)
+            if not self._index_file.tell():
+                self._write_header(self._index_file, gs.ARCHIVE_INDEX_MAGIC)
+        self._check_header(path, gs.ARCHIVE_MAGIC)
+        self._check_header(self.index_path, gs.ARCHIVE_INDEX_MAGIC)
+
+        # an append that was cut off leaves a partial index record (or a replay without one),
+        # which is dropped, and the next replay is written after it
+        index_size = os.path.getsize(self.index_path) - gs.ARCHIVE_HEADER_SIZE
+        self._len = index_size // _INDEX_RECORD.size
+        if writable and index_size % _INDEX_RECORD.size:
+            self._index_file.truncate(gs.ARCHIVE_HEADER_SIZE + self._len * _INDEX_RECORD.size)
+        self._mapped_len = -1
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __enter__(self) -> ReplayArchive:
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def append(self, replay: Replay, compression: int = gs.REPLAY_ZLIB) -> int:
+        """
+        Appends replay to the archive and returns its battle id. The winner and turn count are taken
+        from the replay's battle if it was recorded, and otherwise found by playing it out again.
+        """
+        if not self.writable:
+            raise Exception("Attempted to append to archive that is not writable")
+        if not isinstance(replay, Replay):
+            raise Exception("Attempted to append invalid replay to archive")
+        battle = replay.battle if replay.battle else replay.replay(gs.LOG_NONE)
+        if battle.winner is battle.t1:
+            winner = 1
+        elif battle.winner is battle.t2:
+            winner = 2
+        else:
+            winner = 0
+        data = replay.to_bytes(compression)
+
+        offset = self._data_file.seek(0, os.SEEK_END)
+        self._data_file.write(data)
+        self._data_file.flush()
+        self._index_file.write(
+            _INDEX_RECORD.pack(
+                team_hash(replay.spec[0]),
+                team_hash(replay.spec[1]),
+                offset,
+                len(data),
+                battle.turn_count,
+                winner,
+            )
+        )
+        self._index_file.flush()
+        self._len += 1
+        return self._len - 1
+
+    def get_bytes(self, battle_id: int) -> bytes:
+        """
+        Returns the binary replay of battle_id, as written by to_bytes in Replay.
+        """
+        _, _, offset, length, _, _ = self._get_record(battle_id)
+        return self._data_map[offset : offset + length]
+
+    def get(self, battle_id: int) -> Replay:
+        return Replay.from_bytes(self.get_bytes(battle_id))
+
+    def get_info(self, battle_id: int) -> tuple[int, int, int, int]:
+        """
+        Returns ($team_1_hash, $team_2_hash, $winner, $turn_count) for battle_id, where $winner is
+        1 or 2 (0 if the battle did not finish).
+        """
+        team_1_hash, team_2_hash, _, _, turn_count, winner = self._get_record(battle_id)
+        return team_1_hash, team_2_hash, winner, turn_count
+
+    def get_index(self):
+        """
+        Returns the whole index as a numpy structured array with the fields team_1_hash,
+        team_2_hash, offset, length, turn_count, and winner, indexed by battle id, i.e. for filtering
+        many battles at once. The array is a view of the memory-mapped index as it was when
+        get_index was called, and it stays valid after appends and after the archive is closed.
+        Requires numpy.
+        """
+        import numpy as np
+
+        self._map()
+        return np.frombuffer(
+            self._index_map,
+            dtype=np.dtype(
+                [
+                    ("team_1_hash", "<u8"),
+                    ("team_2_hash", "<u8"),
+                    ("offset", "<u8"),
+                    ("length", "<u4"),
+                    ("turn_count", "<u4"),
+                    ("winner", "u1"),
+                    ("", "V3"),
+                ]
+            ),
+            count=self._len,
+            offset=gs.ARCHIVE_HEADER_SIZE,
+        )
+
+    def find(self, team: list[dict] | int):
+        """
+        Returns a numpy array of the battle ids of every battle in which either Trainer used team,
+        given as a team spec or its team_hash. Requires numpy.
+        """
+        import numpy as np
+
+        t_hash = team if isinstance(team, int) else team_hash(team)
+        index = self.get_index()
+        ids = np.flatnonzero(
+            (index["team_1_hash"] == t_hash) | (index["team_2_hash"] == t_hash)
+        )
+        del index
+        return ids
+
+    def close(self):
+        self._mapped_len = -1
+        for attr in ("_data_map", "_index_map", "_data_file", "_index_file"):
+            f = getattr(self, attr)
+            setattr(self, attr, None)
+            if f:
+                _close(f)
+
+    def _get_record(self, battle_id: int) -> tuple:
+        # battle ids from find are numpy integers
+        try:
+            battle_id = operator.index(battle_id)
+        except TypeError:
+            raise Exception("Attempted to read battle not in archive")
+        if not 0 <= battle_id < self._len:
+            raise Exception("Attempted to read battle not in archive")
+        self._map()
+        return _INDEX_RECORD.unpack_from(
+            self._index_map, gs.ARCHIVE_HEADER_SIZE + battle_id * _INDEX_RECORD.size
+        )
+
+    def _map(self):
+        # appends grow the files past the end of the current maps, so they are mapped again
+        if self._mapped_len == self._len:
+            return
+        for attr in ("_data_map", "_index_map"):
+            m = getattr(self, attr)
+            setattr(self, attr, None)
+            if m:
+                _close(m)
+        with open(self.path, "rb") as f:
+            self._data_map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        with open(self.index_path, "rb") as f:
+            self._index_map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._mapped_len = self._len
+
+    def _write_header(self, f, magic: bytes):
+        f.write(
+            magic + bytes((gs.ARCHIVE_VERSION,)) + bytes(gs.ARCHIVE_HEADER_SIZE - len(magic) - 1)
+        )
+        f.flush()
+
+    def _check_header(self, path: str, magic: bytes):
+        with open(path, "rb") as f:
+            header = f.read(gs.ARCHIVE_HEADER_SIZE)
+        if len(header) < gs.ARCHIVE_HEADER_SIZE or header[: len(magic)] != magic:
+            raise Exception("Attempted to open invalid replay archive")
+        if header[len(magic)] != gs.ARCHIVE_VERSION:
+            raise Exception("Attempted to open replay archive with unsupported version")
+
+
+def _close(f):
+    # a map that arrays from get_index still point into is closed once they are deleted
+    try:
+        f.close()
+    except BufferError:
+        pass
+
+
+def team_hash(team: list[dict]) -> int:
+    """
+    Returns a 64-bit hash of a team spec, as stored in the index of a ReplayArchive.
+    """
+    return int.from_bytes(
+        hashlib.blake2b(encode_team(team), digest_size=8).digest(), "little"
+    )
@@ -0,0 +1,116 @@
+from __future__ import annotations
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from poke_battle_sim.poke_sim import PokeSim
+from poke_battle_sim.core.pokemon import Pokemon
+from poke_battle_sim.core.trainer import Trainer
+from poke_battle_sim.core.battle import Battle
+from poke_battle_sim.core.policy import first_move_policy
+
+import poke_battle_sim.conf.global_settings as gs
+
+_worker_policies = None
+_worker_max_turns = gs.MAX_TURNS
+
+
+def run_battles(
+    specs,
+    policies: tuple[callable, callable] | callable = None,
+    workers: int = None,
+    max_turns: int = gs.MAX_TURNS,
+    chunksize: int = gs.BATCH_CHUNK_SIZE,
+):
+    """
+    Simulates every battle spec and yields one compact result per spec, in the same order as specs.
+
+    A battle spec is formatted as ($team_1, $team_2, $seed?) where each team is a list of dicts holding
+    the keyword arguments of each party Pokemon, i.e. {'name_or_id': 'pikachu', 'level': 50, ...}
+    If $seed is provided, the battle's rng is seeded with it and the result is reproducible.
+
+    policies is either a single policy used by both Trainers or a (t1_policy, t2_policy) pair.
+    A policy is called as policy(battle, trainer) and must return a turn action. If no policy
+    is provided, each Trainer uses the first move available to its current Pokemon.
+
+    Results are formatted as ($winner, $turn_count, $remaining_hp) where $winner is 1 or 2
+    (0 if max_turns was reached first) and $remaining_hp holds the current hp of both parties.
+
+    When workers is greater than 1, specs are sent in chunks to a pool of worker processes, so
+    specs and policies must be picklable (i.e. policies should be module-level functions).
+    Specs are consumed lazily, meaning specs may be a generator of any length.
+    """
+    policies = _format_policies(policies)
+    if not workers or workers <= 1:
+        PokeSim.start()
+        for spec in specs:
+            yield _run_spec(spec, policies, max_turns)
+        return
+
+    spec_iter = iter(specs)
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(policies, max_turns),
+    ) as executor:
+        pending = deque()
+        while True:
+            while len(pending) < workers * gs.BATCH_MAX_PENDING:
+                chunk = list(islice(spec_iter, chunksize))
+                if not chunk:
+                    break
+                pending.append(executor.submit(_run_chunk, chunk))
+            if not pending:
+                return
+            yield from pending.popleft().result()
+
+
+def build_trainer(name: str, team: list[dict]) -> Trainer:
+    return Trainer(name, [Pokemon(**poke_spec) for poke_spec in team])
+
+
+def _format_policies(policies) -> tuple[callable, callable]:
+    if not policies:
+        return (first_move_policy, first_move_policy)
+    if callable(policies):
+        return (policies, policies)
+    if not isinstance(policies, (list, tuple)) or len(policies) != 2:
+        raise Exception("Attempted to run battles with invalid policies")
+    return tuple(policies)
+
+
+def _init_worker(policies: tuple[callable, callable], max_turns: int):
+    global _worker_policies, _worker_max_turns
+    PokeSim.start()
+    _worker_policies = policies
+    _worker_max_turns = max_turns
+
+
+def _run_chunk(chunk: list) -> list[tuple]:
+    return [_run_spec(spec, _worker_policies, _worker_max_turns) for spec in chunk]
+
+
+def _run_spec(spec, policies: tuple[callable, callable], max_turns: int) -> tuple:
+    t1 = build_trainer("Trainer 1", spec[0])
+    t2 = build_trainer("Trainer 2", spec[1])
+    battle = Battle(
+        t1, t2, seed=spec[2] if len(spec) > 2 else None, log_level=gs.LOG_NONE
+    )
+    battle.start()
+    while not battle.is_finished() and battle.turn_count < max_turns:
+        battle.turn(policies[0](battle, t1), policies[1](battle, t2))
+
+    if battle.winner is t1:
+        winner = 1
+    elif battle.winner is t2:
+        winner = 2
+    else:
+        winner = 0
+    return (
+        winner,
+        battle.turn_count,
+        (
+            tuple(poke.cur_hp for poke in t1.poke_list),
+            tuple(poke.cur_hp for poke in t2.poke_list),
+        ),
+    )
@@ -0,0 +1,240 @@
+from __future__ import annotations
+
+import numpy as np
+
+from poke_battle_sim.poke_sim import PokeSim
+from poke_battle_sim.core.pokemon import Pokemon
+
+import poke_battle_sim.conf.global_settings as gs
+import poke_battle_sim.conf.global_data as gd
+
+_ROLLS = np.arange(gs.DAMAGE_ROLL_MIN, gs.DAMAGE_ROLL_MAX + 1) / 100
+
+_PINCH_ABILITIES = {"overgrow": "grass", "blaze": "fire", "torrent": "water", "swarm": "bug"}
+
+_CATEGORY_BOOST_ITEMS = {"muscle-band": gs.PHYSICAL, "wise-glasses": gs.SPECIAL}
+
+
+def damage_matrix(
+    attackers: list[Pokemon],
+    defenders: list[Pokemon],
+    battlefield_state: dict = None,
+) -> np.ndarray:
+    """
+    Calculates every possible damage roll of every move of every attacker against every defender.
+
+    Returns an int array of shape (len(attackers), 4, len(defenders), 2, 16) where index [a, m, d, c, r]
+    is the damage attackers[a]'s m-th move deals to defenders[d] without (c = 0) or with (c = 1)
+    a critical hit, using the r-th random roll (85% to 100%). Empty move slots, status moves and
+    moves the defender is immune to deal 0 damage. Defenders that cannot be critically hit
+    (Battle Armor, Shell Armor, or Lucky Chant on their side) have identical critical and
+    non-critical damage.
+
+    battlefield_state is an optional dict describing the battle the damage is dealt in:
+    - weather: weather type as defined in global_settings.py, defaults to gs.CLEAR
+    - reflect: whether Reflect is active on the defenders' side, defaults to False
+    - light_screen: whether Light Screen is active on the defenders' side, defaults to False
+
+    The calculation follows pm._calculate_damage, including STAB, weather, screens, burn, stat
+    stages, and the ability and item multipliers applied there, but has no side effects: no
+    text is added, no move, Pokemon, or item state is changed, and no rng is consumed.
+    Power set by a move's own effect (i.e. Low Kick, Return) and the Metronome item are not
+    applied, so those moves use their listed power.
+    """
+    if not attackers or not defenders:
+        raise Exception("Attempted to calculate damage matrix without attackers or defenders")
+    if not all(isinstance(poke, Pokemon) for poke in attackers + defenders):
+        raise Exception("Attempted to calculate damage matrix with invalid Pokemon")
+    state = battlefield_state or {}
+    weather = state.get("weather", gs.CLEAR)
+    reflect = bool(state.get("reflect", False))
+    light_screen = bool(state.get("light_screen", False))
+
+    type_id = PokeSim.get_type_id
+    empty_id = type_id(None)
+    types_ef = np.array(PokeSim.get_types_ef_table()).reshape(-1, empty_id + 1, empty_id + 1)
+
+    n_att, n_def = len(attackers), len(defenders)
+    shape = (n_att, gs.MAX_MOVES, n_def)
+    power = np.zeros((n_att, gs.MAX_MOVES, 1))
+    move_type = np.full((n_att, gs.MAX_MOVES, 1), type_id("typeless"))
+    category = np.full((n_att, gs.MAX_MOVES, 1), gs.STATUS)
+    punch = np.zeros((n_att, gs.MAX_MOVES, 1), dtype=bool)
+    recoil = np.zeros((n_att, gs.MAX_MOVES, 1), dtype=bool)
+    for a, attacker in enumerate(attackers):
+        for m, move in enumerate(attacker.moves[: gs.MAX_MOVES]):
+            power[a, m] = move.power or 0
+            move_type[a, m] = move.type_id
+            category[a, m] = move.category
+            punch[a, m] = move.flags & gs.MF_PUNCH
+            recoil[a, m] = move.flags & gs.MF_RECOIL
+    physical = category == gs.PHYSICAL
+    special = category == gs.SPECIAL
+
+    def att_array(get) -> np.ndarray:
+        return np.array([get(poke) for poke in attackers]).reshape(n_att, 1, 1)
+
+    def def_array(get) -> np.ndarray:
+        return np.array([get(poke) for poke in defenders]).reshape(1, 1, n_def)
+
+    def att_ability(ability: str) -> np.ndarray:
+        return att_array(lambda poke: poke.has_ability(ability))
+
+    def def_ability(ability: str) -> np.ndarray:
+        return def_array(lambda poke: poke.has_ability(ability))
+
+    def is_type(types: np.ndarray, type_name: str) -> np.ndarray:
+        return types == type_id(type_name)
+
+    # type effectiveness, taken per defender type slot so single slots can be ignored
+    d_type1 = def_array(lambda poke: type_id(poke.types[0]))
+    d_type2 = def_array(lambda poke: type_id(poke.types[1]))
+    sees_flying = is_type(move_type, "ground") & def_array(lambda poke: poke.grounded)
+    sees_ghost = (
+        att_ability("scrappy") | def_array(lambda poke: bool(poke.foresight_target))
+    ) & (is_type(move_type, "normal") | is_type(move_type, "fighting"))
+    sees_dark = is_type(move_type, "psychic") & def_array(lambda poke: bool(poke.me_target))
+    t_mult = 1
+    for d_type in (d_type1, d_type2):
+        vulnerable = (
+            sees_flying & is_type(d_type, "flying")
+            | sees_ghost & is_type(d_type, "ghost")
+            | sees_dark & is_type(d_type, "dark")
+        )
+        t_mult = t_mult * np.where(vulnerable, 1, types_ef[move_type, d_type, empty_id])
+    levitating = ~def_array(lambda poke: poke.grounded) & def_array(
+        lambda poke: poke.magnet_rise or poke.has_ability("levitate")
+    )
+    t_mult = np.where(is_type(move_type, "ground") & levitating, 0, t_mult)
+    t_mult = np.where(is_type(move_type, "typeless"), 1, t_mult)
+
+    immune = np.broadcast_to(
+        (category == gs.STATUS)
+        | (power == 0)
+        | (t_mult == 0)
+        | def_ability("wonder-guard") & (t_mult < 2)
+        | def_ability("volt-absorb") & is_type(move_type, "electric")
+        | def_ability("water-absorb") & is_type(move_type, "water")
+        | def_ability("flash-fire") & is_type(move_type, "fire"),
+        shape,
+    )
+
+    # move power, changed in the same order and with the same truncation as in battle
+    elec = is_type(move_type, "electric")
+    fire = is_type(move_type, "fire")
+    power = np.broadcast_to(power, shape)
+    power = np.where(att_array(lambda poke: bool(poke.charged)) & elec, power * 2, power)
+    mud_sport = att_array(lambda poke: poke.mud_sport) | def_array(lambda poke: poke.mud_sport)
+    power = np.where(mud_sport & elec, power // 2, power)
+    water_sport = att_array(lambda poke: poke.water_sport) | def_array(
+        lambda poke: poke.water_sport
+    )
+    power = np.where(water_sport & fire, power // 2, power)
+
+    pinch = att_array(lambda poke: poke.cur_hp <= poke.max_hp // 3)
+    same_gender = att_array(lambda poke: poke.gender) == def_array(lambda poke: poke.gender)
+    gendered = att_array(lambda poke: poke.gender in ("male", "female")) & def_array(
+        lambda poke: poke.gender in ("male", "female")
+    )
+    boost = (
+        att_ability("flash-fire") & att_array(lambda poke: poke.ability_activated) & fire
+        | att_ability("technician") & (power <= 60)
+    )
+    for ability, pinch_type in _PINCH_ABILITIES.items():
+        boost = boost | att_ability(ability) & pinch & is_type(move_type, pinch_type)
+    power = np.where(boost, np.trunc(power * 1.5), power)
+    rivalry = att_ability("rivalry") & gendered
+    power = np.where(rivalry & same_gender, np.trunc(power * 1.25), power)
+    power = np.where(rivalry & ~same_gender, np.trunc(power * 0.75), power)
+    power = np.where(att_ability("iron-fist") & punch, power * np.trunc(power * 1.2), power)
+    power = np.where(att_ability("tinted-lens") & (t_mult < 1), power * 2, power)
+    power = np.where(att_ability("reckless") & recoil, np.trunc(power * 1.2), power)
+    eff_type = np.where(att_ability("normalize"), type_id("normal"), move_type)
+
+    eff_fire = is_type(eff_type, "fire")
+    eff_water = is_type(eff_type, "water")
+    heatproof = def_ability("heatproof")
+    power = np.where(heatproof & eff_fire, power // 2, power)
+    solid = (def_ability("filter") | def_ability("solid-rock")) & ~heatproof
+    power = np.where(solid & (t_mult > 1), power * 0.75, power)
+
+    item_boost = np.ones(shape)
+    for a, attacker in enumerate(attackers):
+        item = attacker.item
+        if not _holds_working_item(attacker):
+            continue
+        if attacker.item_boost:
+            species, boost_types, factor = attacker.item_boost
+            if not species or attacker.name in species:
+                boosted = np.isin(eff_type[a], [type_id(t) for t in boost_types])
+                item_boost[a] = np.where(boosted, factor, 1)
+        elif item in _CATEGORY_BOOST_ITEMS:
+            item_boost[a] = np.where(category[a] == _CATEGORY_BOOST_ITEMS[item], 1.1, 1)
+    power = np.where(item_boost != 1, np.trunc(power * item_boost), power)
+
+    # attacking and defending stats, with and without the stat stages each side may ignore
+    a_eff = np.array([[poke.get_stats_effective(i, weather) for i in (0, 1)] for poke in attackers])
+    d_eff = np.array([[poke.get_stats_effective(i, weather) for i in (0, 1)] for poke in defenders])
+    a_act = np.array([poke.stats_actual for poke in attackers])
+    d_act = np.array([poke.stats_actual for poke in defenders])
+    a_stat = np.where(physical, gs.ATK, gs.SP_ATK)
+    d_stat = np.where(physical, gs.DEF, gs.SP_DEF)
+    a_idx = np.arange(n_att).reshape(n_att, 1, 1)
+    d_idx = np.arange(n_def).reshape(1, 1, n_def)
+    atk = a_eff[a_idx, def_ability("unaware").astype(int), a_stat]
+    dfn = d_eff[d_idx, att_ability("unaware").astype(int), d_stat]
+    can_crit = ~(
+        def_ability("battle-armor")
+        | def_ability("shell-armor")
+        | def_array(lambda poke: bool(poke.trainer and poke.trainer.lucky_chant))
+    )
+    atk_crit = np.where(can_crit, np.maximum(a_act[a_idx, a_stat], atk), atk)
+    dfn_crit = np.where(can_crit, np.minimum(d_act[d_idx, d_stat], dfn), dfn)
+    ad_ratio = np.stack(np.broadcast_arrays(atk / dfn, atk_crit / dfn_crit), axis=-1)
+
+    burn = np.where(
+        att_array(lambda poke: poke.nv_status == gs.BURNED) & ~att_ability("guts"), 0.5, 1
+    )
+    screen = np.where((t_mult <= 1) & physical & reflect | special & light_screen, 0.5, 1)
+    if weather == gs.HARSH_SUNLIGHT:
+        weather_mult = np.where(eff_fire, 1.5, np.where(eff_water, 0.5, 1))
+    elif weather == gs.RAIN:
+        weather_mult = np.where(eff_fire, 0.5, np.where(eff_water, 1.5, 1))
+    else:
+        weather_mult = 1
+    stab = np.where(
+        (eff_type == att_array(lambda poke: type_id(poke.types[0])))
+        | (eff_type == att_array(lambda poke: type_id(poke.types[1]))),
+        np.where(att_ability("adaptability"), 2, 1.5),
+        1,
+    )
+    crit_mult = np.where(can_crit, np.where(att_ability("sniper"), 3, 2), 1)
+    crit_mult = np.stack(np.broadcast_arrays(np.ones(shape), crit_mult), axis=-1)
+    berry_type = def_array(_pre_hit_berry_type)
+    berry_mult = np.where((t_mult > 1) & (eff_type == berry_type), 0.5, 1)
+    expert_belt = att_array(lambda poke: _holds_working_item(poke) and poke.item == "expert-belt")
+    life_orb = att_array(lambda poke: _holds_working_item(poke) and poke.item == "life-orb")
+    item_mult = np.where(expert_belt & (t_mult > 1), 1.2, np.where(life_orb, 1.3, 1))
+    level = att_array(lambda poke: poke.level)
+
+    def per_crit(arr) -> np.ndarray:
+        return np.broadcast_to(arr, shape)[..., None]
+
+    damage = per_crit((2 * level / 5 + 2) * power) * ad_ratio / 50
+    damage = damage * per_crit(burn) * per_crit(screen) * per_crit(weather_mult) + 2
+    mult = crit_mult[..., None] * per_crit(item_mult)[..., None] * _ROLLS
+    mult = mult * per_crit(stab)[..., None] * per_crit(t_mult)[..., None]
+    mult = mult * per_crit(berry_mult)[..., None]
+    damage = np.trunc(damage[..., None] * mult).astype(np.int64)
+    damage[immune] = 0
+    return damage
+
+
+def _holds_working_item(poke: Pokemon) -> bool:
+    return bool(poke.item) and not poke.has_ability("klutz") and not poke.embargo_count
+
+
+def _pre_hit_berry_type(poke: Pokemon) -> int:
+    if not poke.is_alive or poke.item not in gd.PRE_HIT_BERRIES or not _holds_working_item(poke):
+        return -1
+    return PokeSim.get_type_id(gd.PRE_HIT_BERRIES[poke.item])
@@ -0,0 +1,209 @@
+from __future__ import annotations
+from random import Random
+
+import numpy as np
+
+from poke_battle_sim.core.battle import Battle
+from poke_battle_sim.core.action import SelectionRequest
+from poke_battle_sim.core.policy import Policy
+from poke_battle_sim.tools.batch import build_trainer, first_move_policy
+from poke_battle_sim.tools.observation import encode_observation
+
+import poke_battle_sim.conf.global_settings as gs
+
+
+class VectorBattleEnv:
+    def __init__(
+        self,
+        n: int,
+        specs: list,
+        opponent: callable = first_move_policy,
+        max_turns: int = gs.MAX_TURNS,
+        seed: int = None,
+        obs_dtype=np.float32,
+        agent_selections: bool = False,
+    ):
+        """
+        Steps n battles in lockstep, with the agent controlling the first Trainer of every battle.
+
+        Required
+
+        - n: number of battles
+        - specs: list of battle specs formatted as in run_battles; battle i uses specs[i % len(specs)]
+
+        Optional
+
+        - opponent: policy for the second Trainer, called as opponent(battle, trainer)
+        - max_turns: number of turns after which a battle is truncated
+        - seed: seed for the seeds of every episode, so a run can be reproduced; seeds in the
+        specs are not used
+        - obs_dtype: numpy dtype of the observations, i.e. np.float32 or np.int16
+        - agent_selections: if True, the agent also selects the Pokemon the first Trainer sends
+        out in the middle of a turn (i.e. after a faint, U-turn, or Baton Pass)
+
+        Observations, rewards, done flags and action masks are returned as numpy arrays that are
+        allocated once and overwritten on every step, so copy them if they need to be kept.
+        Actions are indexes of the action space described in legal_action_mask() in Trainer.
+        Each observation is the first Trainer's view of its battle, encoded as in
+        encode_observation; hp is a fraction for float dtypes and per-mille for int dtypes.
+
+        Without agent_selections, the first Trainer's selections in the middle of a turn always
+        send out the first available Pokemon. With agent_selections, turns are processed with
+        begin_turn, and a turn that needs a selection from the agent stops there: that step
+        returns the battle's state in the middle of the turn with a mask that only allows the
+        switches to the Pokemon that can be sent out, and the next step's action for the battle
+        is the selection. The opponent's selections are made by opponent if it is a Policy and
+        are the first available Pokemon otherwise.
+        """
+        if not isinstance(n, int) or n < 1:
+            raise Exception("Attempted to create VectorBattleEnv with invalid number of battles")
+        if not specs:
+            raise Exception("Attempted to create VectorBattleEnv without battle specs")
+        if not callable(opponent):
+            raise Exception("Attempted to create VectorBattleEnv with invalid opponent policy")
+        self.n = n
+        self.opponent = opponent
+        self.max_turns = max_turns
+        self.agent_selections = agent_selections
+        self.requests = [None] * n
+        self.rng = Random(seed)
+        self.battles = []
+        self.start_states = []
+        for i in range(n):
+            spec = specs[i % len(specs)]
+            battle = Battle(
+                build_trainer("Trainer 1", spec[0]),
+                build_trainer("Trainer 2", spec[1]),
+                seed=self.rng.getrandbits(64),
+                log_level=gs.LOG_NONE,
+            )
+            # the snapshot is taken before start, so the rng draws made by start (i.e. the
+            # sleep counter of a Pokemon that starts asleep) are made again in every episode
+            self.battles.append(battle)
+            self.start_states.append(battle.snapshot())
+            battle.start()
+
+        self.obs = np.zeros((n, gs.OBS_SIZE), dtype=obs_dtype)
+        self.final_obs = np.zeros((n, gs.OBS_SIZE), dtype=obs_dtype)
+        self.hp_scale = (
+            gs.OBS_HP_SCALE_INT if np.issubdtype(self.obs.dtype, np.integer) else 1.0
+        )
+        self.rewards = np.zeros(n, dtype=np.float32)
+        self.terminated = np.zeros(n, dtype=bool)
+        self.truncated = np.zeros(n, dtype=bool)
+        self.masks = np.zeros((n, gs.ACTION_SPACE_SIZE), dtype=bool)
+        self.episodes = np.zeros(n, dtype=np.int64)
+
+    def reset(self, seed: int = None) -> tuple[np.ndarray, dict]:
+        """
+        Restarts every battle and returns (observations, info), where info holds the action masks.
+        """
+        if seed is not None:
+            self.rng.seed(seed)
+        for i in range(self.n):
+            self._reset_battle(i)
+            self._write_obs(i)
+            self.battles[i].t1.legal_action_mask(self.masks[i])
+        self.requests = [None] * self.n
+        self.episodes[:] = 0
+        return self.obs, {"action_mask": self.masks}
+
+    def step(
+        self, actions
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, dict]:
+        """
+        Processes one turn of every battle, where actions[i] is the action index for battle i.
+
+        Returns (observations, rewards, terminated, truncated, info). A reward is 1 for a win,
+        -1 for a loss and 0 otherwise. Finished battles are restarted right away, so their row
+        of observations already belongs to the next episode; the last observation of the finished
+        episode is in info['final_obs'].
+        """
+        if len(actions) != self.n:
+            raise Exception("Attempted to step VectorBattleEnv with invalid number of actions")
+        for i in range(self.n):
+            battle = self.battles[i]
+            request = self.requests[i]
+            if request:
+                request = self._finish_selections(
+                    battle, battle.resume_turn(self._get_selection(battle, request, actions[i]))
+                )
+            elif self.agent_selections:
+                request = self._finish_selections(
+                    battle,
+                    battle.begin_turn(
+                        battle.t1.get_action(actions[i]), self.opponent(battle, battle.t2)
+                    ),
+                )
+            else:
+                battle.turn(
+                    battle.t1.get_action(actions[i]), self.opponent(battle, battle.t2)
+                )
+            self.requests[i] = request
+            if request:
+                self.rewards[i] = 0
+                self.terminated[i] = self.truncated[i] = False
+                self._write_obs(i)
+                self._write_selection_mask(i, request)
+                continue
+
+            winner = battle.winner
+            self.terminated[i] = winner is not None
+            self.truncated[i] = winner is None and battle.turn_count >= self.max_turns
+            if winner is None:
+                self.rewards[i] = 0
+            else:
+                self.rewards[i] = (
+                    gs.ENV_REWARD_WIN if winner is battle.t1 else gs.ENV_REWARD_LOSS
+                )
+            if self.terminated[i] or self.truncated[i]:
+                self._write_obs(i)
+                self.final_obs[i] = self.obs[i]
+                self._reset_battle(i)
+                self.episodes[i] += 1
+            self._write_obs(i)
+            battle.t1.legal_action_mask(self.masks[i])
+        return (
+            self.obs,
+            self.rewards,
+            self.terminated,
+            self.truncated,
+            {"action_mask": self.masks, "final_obs": self.final_obs},
+        )
+
+    def _finish_selections(self, battle: Battle, request: SelectionRequest | None):
+        # only the agent's selections are returned from step
+        while request and request.side == 2:
+            if isinstance(self.opponent, Policy):
+                request = battle.resume_turn(self.opponent.get_selection(battle, request))
+            else:
+                request = battle.resume_turn(None)
+        return request
+
+    def _get_selection(self, battle: Battle, request: SelectionRequest, index: int) -> int:
+        action = battle.t1.get_action(index)
+        if action.kind != gs.ACTION_SWITCH or action.slot not in request.slots:
+            raise Exception("Attempted to step VectorBattleEnv with invalid selection")
+        return action.slot
+
+    def _write_selection_mask(self, i: int, request: SelectionRequest):
+        mask = self.masks[i]
+        mask[:] = False
+        trainer = request.trainer
+        j = gs.ACTION_SPACE_SWITCHES
+        for slot in range(len(trainer.poke_list)):
+            if trainer.poke_list[slot] is not trainer.current_poke:
+                mask[j] = slot in request.slots
+                j += 1
+
+    def _reset_battle(self, i: int):
+        # battle_end_reset already released the Pokemon when the battle ended, and restoring the
+        # snapshot rewinds the same Trainer and Pokemon objects to before the battle started
+        battle = self.battles[i]
+        battle.restore(self.start_states[i])
+        battle.seed = self.rng.getrandbits(64)
+        battle.rng.seed(battle.seed)
+        battle.start()
+
+    def _write_obs(self, i: int):
+        encode_observation(self.battles[i], 1, self.obs[i], hp_scale=self.hp_scale)
@@ -0,0 +1,189 @@
+from __future__ import annotations
+import math
+from random import getrandbits
+from statistics import NormalDist
+
+from poke_battle_sim.tools.batch import run_battles
+
+import poke_battle_sim.conf.global_settings as gs
+
+
+def estimate_win_rate(
+    team_1: list[dict],
+    team_2: list[dict],
+    policies: tuple[callable, callable] | callable = None,
+    precision: float = gs.ESTIMATE_PRECISION,
+    threshold: float = None,
+    confidence: float = gs.ESTIMATE_CONFIDENCE,
+    interval: int = gs.ESTIMATE_WILSON,
+    batch_size: int = gs.ESTIMATE_BATCH_SIZE,
+    max_battles: int = gs.ESTIMATE_MAX_BATTLES,
+    swap_sides: bool = True,
+    seed: int = None,
+    workers: int = None,
+    max_turns: int = gs.MAX_TURNS,
+    chunksize: int = gs.BATCH_CHUNK_SIZE,
+) -> tuple[float, float, float, int]:
+    """
+    Estimates the probability that team_1 beats team_2 by running battles in batches until the
+    estimate is good enough, and returns ($win_rate, $low, $high, $num_battles).
+
+    Teams are lists of dicts and policies, workers, max_turns, and chunksize are used as in
+    run_battles. Draws count as half a win.
+
+    After every batch_size battles, a confidence interval ($low, $high) is found for the win rate
+    with the given confidence, either a Wilson score interval (gs.ESTIMATE_WILSON) or a Bayesian
+    interval from a Beta posterior with a Jeffreys prior (gs.ESTIMATE_BETA). Battles stop once
+    the interval is within precision of the win rate on both sides, once it no longer contains
+    threshold (i.e. 0.5 to only find which team is favoured), or once max_battles have been run.
+    Either precision or threshold may be None.
+
+    If swap_sides is True, battles are run in pairs that share a seed, with team_1 as Trainer 1
+    in the first battle and as Trainer 2 in the second, so any advantage of either side cancels
+    out. The seed of each battle only depends on seed and the battle's position, so estimates
+    with the same seed use common random numbers, i.e. for comparing team_1 against several
+    opponents. If seed is not provided, one is drawn.
+    """
+    if precision is not None and not 0 < precision < 1:
+        raise Exception("Attempted to estimate win rate with invalid precision")
+    if threshold is not None and not 0 < threshold < 1:
+        raise Exception("Attempted to estimate win rate with invalid threshold")
+    if not 0 < confidence < 1:
+        raise Exception("Attempted to estimate win rate with invalid confidence")
+    if interval not in (gs.ESTIMATE_WILSON, gs.ESTIMATE_BETA):
+        raise Exception("Attempted to estimate win rate with invalid interval")
+    if not isinstance(batch_size, int) or batch_size < 1:
+        raise Exception("Attempted to estimate win rate with invalid batch size")
+    if not isinstance(max_battles, int) or max_battles < 1:
+        raise Exception("Attempted to estimate win rate with invalid number of battles")
+    if seed is None:
+        seed = getrandbits(64)
+
+    results = run_battles(
+        _get_specs(team_1, team_2, max_battles, swap_sides, seed),
+        policies,
+        workers=workers,
+        max_turns=max_turns,
+        chunksize=chunksize,
+    )
+    wins = 0.0
+    num_battles = 0
+    try:
+        for winner, _, _ in results:
+            # the second battle of each pair has team_1 as Trainer 2
+            if not winner:
+                wins += 0.5
+            elif (winner == 1) != (swap_sides and num_battles % 2 == 1):
+                wins += 1
+            num_battles += 1
+            if num_battles % batch_size and num_battles < max_battles:
+                continue
+            if swap_sides and num_battles % 2 and num_battles < max_battles:
+                continue
+            low, high = get_interval(wins, num_battles, confidence, interval)
+            win_rate = wins / num_battles
+            if (
+                precision is not None
+                and win_rate - low <= precision
+                and high - win_rate <= precision
+            ):
+                break
+            if threshold is not None and not low <= threshold <= high:
+                break
+    finally:
+        results.close()
+    low, high = get_interval(wins, num_battles, confidence, interval)
+    return wins / num_battles, low, high, num_battles
+
+
+def get_interval(
+    wins: float,
+    num_battles: int,
+    confidence: float = gs.ESTIMATE_CONFIDENCE,
+    interval: int = gs.ESTIMATE_WILSON,
+) -> tuple[float, float]:
+    """
+    Returns the ($low, $high) confidence interval of a win rate from wins out of num_battles, as
+    used by estimate_win_rate.
+    """
+    if interval == gs.ESTIMATE_BETA:
+        alpha = (1 - confidence) / 2
+        a = wins + 0.5
+        b = num_battles - wins + 0.5
+        return _beta_quantile(alpha, a, b), _beta_quantile(1 - alpha, a, b)
+
+    z = NormalDist().inv_cdf(1 - (1 - confidence) / 2)
+    p = wins / num_battles
+    denom = 1 + z * z / num_battles
+    center = (p + z * z / (2 * num_battles)) / denom
+    half = (
+        z
+        * math.sqrt(p * (1 - p) / num_battles + z * z / (4 * num_battles * num_battles))
+        / denom
+    )
+    return max(0.0, center - half), min(1.0, center + half)
+
+
+def _get_specs(
+    team_1: list[dict], team_2: list[dict], max_battles: int, swap_sides: bool, seed: int
+):
+    for i in range(max_battles):
+        if not swap_sides:
+            yield team_1, team_2, seed + (i << 64)
+        elif not i % 2:
+            yield team_1, team_2, seed + (i // 2 << 64)
+        else:
+            yield team_2, team_1, seed + (i // 2 << 64)
+
+
+def _beta_quantile(q: float, a: float, b: float) -> float:
+    # the regularized incomplete beta function is increasing in x, so it is inverted by bisection
+    low, high = 0.0, 1.0
+    for _ in range(60):
+        mid = (low + high) / 2
+        if _beta_cdf(mid, a, b) < q:
+            low = mid
+        else:
+            high = mid
+    return (low + high) / 2
+
+
+def _beta_cdf(x: float, a: float, b: float) -> float:
+    if x <= 0:
+        return 0.0
+    if x >= 1:
+        return 1.0
+    front = math.exp(
+        math.lgamma(a + b)
+        - math.lgamma(a)
+        - math.lgamma(b)
+        + a * math.log(x)
+        + b * math.log(1 - x)
+    )
+    # the continued fraction converges quickly on the side of the distribution's mean
+    if x < (a + 1) / (a + b + 2):
+        return front * _beta_cont_frac(x, a, b) / a
+    return 1 - front * _beta_cont_frac(1 - x, b, a) / b
+
+
+def _beta_cont_frac(x: float, a: float, b: float) -> float:
+    # modified Lentz's method
+    tiny = 1e-300
+    c = 1.0
+    d = 1 - (a + b) * x / (a + 1)
+    d = 1 / (d if abs(d) > tiny else tiny)
+    h = d
+    for m in range(1, 300):
+        m2 = 2 * m
+        for num in (
+            m * (b - m) * x / ((a + m2 - 1) * (a + m2)),
+            -(a + m) * (a + b + m) * x / ((a + m2) * (a + m2 + 1)),
+        ):
+            d = 1 + num * d
+            d = 1 / (d if abs(d) > tiny else tiny)
+            c = 1 + num / c
+            c = c if abs(c) > tiny else tiny
+            h *= d * c
+        if abs(d * c - 1) < 1e-12:
+            break
+    return h
@@ -0,0 +1,186 @@
+from __future__ import annotations
+import asyncio
+from concurrent.futures import Executor
+
+from poke_battle_sim.core.trainer import Trainer
+from poke_battle_sim.core.battle import Battle
+from poke_battle_sim.core.action import Action, SelectionRequest
+from poke_battle_sim.core.policy import Policy
+
+
+class BattleHost:
+    def __init__(self, executor: Executor = None):
+        """
+        Hosts many in-memory battles on one asyncio event loop.
+
+        Optional
+
+        - executor: executor that processes turns, which must share memory with the event loop
+        (i.e. a ThreadPoolExecutor); if not provided, the event loop's default executor is used
+
+        Players submit their actions with submit as they arrive, and a battle's turn is processed
+        on the executor once both of its Trainers have submitted, so waiting on slow players does
+        not hold up any thread. Selections made in the middle of a turn (i.e. after a faint, U-turn,
+        or Baton Pass) are awaited as coroutines, see add_battle.
+        """
+        self.executor = executor
+        self.battles = {}
+        self._next_id = 0
+
+    def add_battle(
+        self,
+        battle: Battle,
+        selections: tuple[callable, callable] = None,
+        battle_id=None,
+    ):
+        """
+        Adds battle to the host, starting it if it has not started yet, and returns its battle id.
+
+        selections is an optional (t1_selection, t2_selection) pair of async functions, called as
+        await selection(battle, trainer) whenever the Trainer has to select a Pokemon in the middle
+        of a turn. A selection returns the position in the party of the Pokemon to send out; if it
+        returns None or an invalid position, the first available Pokemon is selected. A selection
+        can also be a Policy, whose decide_selection is awaited instead. A Trainer without a
+        selection here keeps its own selection function.
+
+        Turns are processed with begin_turn in Battle, so a turn does not hold an executor thread
+        while one of its selections is awaited.
+        """
+        if not isinstance(battle, Battle):
+            raise Exception("Attempted to add invalid battle to BattleHost")
+        if battle_id is None:
+            battle_id = self._next_id
+            self._next_id += 1
+        if battle_id in self.battles:
+            raise Exception("Attempted to add battle with duplicate battle id to BattleHost")
+        if selections is None:
+            selections = (None, None)
+        if len(selections) != 2 or not all(
+            sel is None or asyncio.iscoroutinefunction(sel) or isinstance(sel, Policy)
+            for sel in selections
+        ):
+            raise Exception("Attempted to add battle with invalid selection functions")
+        if not battle.battle_started:
+            battle.start()
+        self.battles[battle_id] = _HostedBattle(battle, tuple(selections))
+        return battle_id
+
+    def remove_battle(self, battle_id) -> Battle:
+        """
+        Removes a battle from the host and returns it. Actions submitted to the battle that have
+        not been processed yet are cancelled.
+        """
+        hosted = self._get_hosted(battle_id)
+        if hosted.running:
+            raise Exception("Attempted to remove battle while its turn is being processed")
+        del self.battles[battle_id]
+        for waiter in hosted.waiters:
+            if waiter and not waiter.done():
+                waiter.cancel()
+        return hosted.battle
+
+    def get_battle(self, battle_id) -> Battle:
+        return self._get_hosted(battle_id).battle
+
+    def __len__(self) -> int:
+        return len(self.battles)
+
+    async def submit(self, battle_id, side: int, action: Action | list[str]) -> Trainer | None:
+        """
+        Submits the action of the Trainer on side (1 or 2) for the battle's next turn, and returns
+        once that turn has been processed.
+
+        Returns the battle's winner, which is None while the battle is still going. Raises an
+        exception right away if the action is invalid or the Trainer has already submitted an
+        action for the next turn.
+        """
+        hosted = self._get_hosted(battle_id)
+        battle = hosted.battle
+        if side != 1 and side != 2:
+            raise Exception("Attempted to submit action for invalid side")
+        if battle.is_finished():
+            raise Exception("Attempted to submit action to finished battle")
+        if hosted.running or hosted.waiters[side - 1]:
+            raise Exception("Attempted to submit action twice for the same turn")
+        trainer = battle.t1 if side == 1 else battle.t2
+        if not trainer.has_forced_action() and not trainer.is_valid_action(action):
+            raise Exception("Attempted to submit invalid action")
+
+        loop = asyncio.get_running_loop()
+        waiter = loop.create_future()
+        hosted.actions[side - 1] = action
+        hosted.waiters[side - 1] = waiter
+        if all(hosted.waiters):
+            loop.create_task(self._run_turn(hosted))
+        try:
+            return await waiter
+        except asyncio.CancelledError:
+            # withdraw the action if the turn has not started, so the other Trainer keeps waiting
+            if hosted.waiters[side - 1] is waiter:
+                hosted.actions[side - 1] = None
+                hosted.waiters[side - 1] = None
+            raise
+
+    async def _run_turn(self, hosted: _HostedBattle):
+        loop = asyncio.get_running_loop()
+        actions = hosted.actions
+        waiters = hosted.waiters
+        hosted.actions = [None, None]
+        hosted.waiters = [None, None]
+        hosted.running = True
+        battle = hosted.battle
+        try:
+            request = await loop.run_in_executor(
+                self.executor, battle.begin_turn, actions[0], actions[1]
+            )
+            while request:
+                slot = await hosted.select(request)
+                request = await loop.run_in_executor(
+                    self.executor, battle.resume_turn, slot
+                )
+        except Exception as e:
+            for waiter in waiters:
+                if not waiter.done():
+                    waiter.set_exception(e)
+            return
+        finally:
+            hosted.running = False
+        for waiter in waiters:
+            if not waiter.done():
+                waiter.set_result(hosted.battle.winner)
+
+    def _get_hosted(self, battle_id) -> _HostedBattle:
+        if battle_id not in self.battles:
+            raise Exception("Attempted to access battle not in BattleHost")
+        return self.battles[battle_id]
+
+
+class _HostedBattle:
+    def __init__(self, battle: Battle, selections: tuple[callable, callable]):
+        self.battle = battle
+        self.selections = selections
+        self.actions = [None, None]
+        self.waiters = [None, None]
+        self.running = False
+
+    async def select(self, request: SelectionRequest) -> int | None:
+        # a failed selection falls back to the first available Pokemon like any other
+        # invalid selection
+        trainer = request.trainer
+        selection = self.selections[request.side - 1]
+        if isinstance(selection, Policy):
+            return await selection.decide_selection(self.battle, request)
+        if selection:
+            try:
+                return await selection(self.battle, trainer)
+            except Exception:
+                return
+        if isinstance(trainer.selection, Policy):
+            return await trainer.selection.decide_selection(self.battle, request)
+        if trainer.selection:
+            # resume_turn rewinds the turn, so the Trainer's own selection function can
+            # change current_poke here
+            old_poke = trainer.current_poke
+            trainer.selection(self.battle)
+            if trainer.current_poke is not old_poke:
+                return trainer.poke_list.index(trainer.current_poke)
@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+from poke_battle_sim.core.battle import Battle
+
+import poke_battle_sim.conf.global_settings as gs
+
+
+def encode_observation(
+    battle: Battle, side: int, out, offset: int = 0, hp_scale: float = 1.0
+):
+    """
+    Writes the state of battle from the side of the Trainer on side (1 or 2) into
+    out[offset:offset + gs.OBS_SIZE].
+
+    out can be anything that accepts slice assignment from a list, i.e. a float32 or int16 numpy
+    array or a list. The values are gathered in a module-level list and written into out with
+    one slice assignment, so nothing is allocated for the output and the same buffer can be
+    reused for every state. hp values are written as a fraction of max hp multiplied by
+    hp_scale, so int buffers should use hp_scale=gs.OBS_HP_SCALE_INT to keep hp as per-mille.
+
+    The encoding is omniscient: the opponent's block holds its whole party, including Pokemon
+    that have not been sent out yet and moves that have not been used, not only what the
+    Trainer on side has seen. side only decides which Trainer's block comes first.
+
+    The layout is version gs.OBS_VERSION:
+
+    Field (gs.OBS_FIELD_SIZE values):
+    - turn count
+    - weather as one value per weather type (CLEAR, HARSH_SUNLIGHT, RAIN, SANDSTORM, HAIL, FOG),
+    1 for the current weather and 0 otherwise
+    - weather count, gravity count, trick room count
+
+    Followed by one player block (gs.OBS_PLAYER_SIZE values) for the Trainer on side, then one
+    for its opponent. Each player block holds:
+
+    Side conditions (gs.OBS_SIDE_SIZE values):
+    - reflect, light screen, safeguard, mist, tailwind count, lucky chant, spikes, toxic spikes,
+    stealth rock, wish, future sight count, doom desire count
+
+    Current Pokemon (gs.OBS_ACTIVE_SIZE values):
+    - party position of the current Pokemon
+    - stat stages of ATK, DEF, SP_ATK, SP_DEF and SPD, then accuracy, evasion and crit stages
+    - volatile statuses in the order of gs.V_STATUS_NUM
+    - substitute hp
+
+    Party (gs.POKE_NUM_MAX slots of gs.OBS_POKE_SIZE values, all 0 for empty slots):
+    - 1 for a Pokemon in the slot, 1 if it has not fainted, 1 if it is the current Pokemon
+    - hp, non-volatile status, types id as in PokeSim.get_types_id, level
+    - id and current pp of each of its gs.MAX_MOVES moves (0 for empty move slots)
+    """
+    if side == 1:
+        player, opponent = battle.t1, battle.t2
+    elif side == 2:
+        player, opponent = battle.t2, battle.t1
+    else:
+        raise Exception("Attempted to encode observation for invalid side")
+
+    values = _values
+    bf = battle.battlefield
+    weather = bf.weather
+    values[: gs.OBS_FIELD_SIZE] = (
+        battle.turn_count,
+        weather == gs.CLEAR,
+        weather == gs.HARSH_SUNLIGHT,
+        weather == gs.RAIN,
+        weather == gs.SANDSTORM,
+        weather == gs.HAIL,
+        weather == gs.FOG,
+        bf.weather_count,
+        bf.gravity_count,
+        bf.trick_room_count,
+    )
+    pos = gs.OBS_FIELD_SIZE
+    for trainer in (player, opponent):
+        poke = trainer.current_poke
+        values[pos : pos + _STAGES_POS] = (
+            trainer.reflect,
+            trainer.light_screen,
+            trainer.safeguard,
+            trainer.mist,
+            trainer.tailwind_count,
+            trainer.lucky_chant,
+            trainer.spikes,
+            trainer.toxic_spikes,
+            trainer.stealth_rock,
+            trainer.wish,
+            trainer.fs_count,
+            trainer.dd_count,
+            trainer.poke_list.index(poke),
+        )
+        values[pos + _STAGES_POS : pos + _V_STATUS_POS - 3] = poke.stat_stages[gs.ATK :]
+        values[pos + _V_STATUS_POS - 3 : pos + _V_STATUS_POS] = (
+            poke.accuracy_stage,
+            poke.evasion_stage,
+            poke.crit_stage,
+        )
+        values[pos + _V_STATUS_POS : pos + _PARTY_POS - 1] = poke.v_status
+        values[pos + _PARTY_POS - 1] = poke.substitute
+        slot_pos = pos + _PARTY_POS
+        for party_poke in trainer.poke_list:
+            values[slot_pos : slot_pos + _MOVES_POS] = (
+                1,
+                party_poke.is_alive,
+                party_poke is poke,
+                party_poke.cur_hp * hp_scale / party_poke.max_hp,
+                party_poke.nv_status,
+                party_poke.types_id,
+                party_poke.level,
+            )
+            move_pos = slot_pos + _MOVES_POS
+            for move in party_poke.moves:
+                values[move_pos] = move.id
+                values[move_pos + 1] = move.cur_pp
+                move_pos += 2
+            slot_pos += gs.OBS_POKE_SIZE
+            if move_pos < slot_pos:
+                values[move_pos:slot_pos] = _ZEROS[: slot_pos - move_pos]
+        pos += gs.OBS_PLAYER_SIZE
+        if slot_pos < pos:
+            values[slot_pos:pos] = _ZEROS[: pos - slot_pos]
+    out[offset : offset + gs.OBS_SIZE] = values
+    return out
+
+
+# Offsets of each part of a player block and of the moves in a party slot
+_STAGES_POS = gs.OBS_SIDE_SIZE + 1
+_V_STATUS_POS = _STAGES_POS + gs.STAT_NUM - gs.ATK + 3
+_PARTY_POS = gs.OBS_SIDE_SIZE + gs.OBS_ACTIVE_SIZE
+_MOVES_POS = 7
+
+# Observations are gathered here and written into out with one slice assignment, so encoding
+# does not build a new list for every state (which also means it is not thread-safe)
+_values = [0] * gs.OBS_SIZE
+_ZEROS = (0,) * (gs.OBS_POKE_SIZE * gs.POKE_NUM_MAX)
@@ -0,0 +1,361 @@
+from __future__ import annotations
+
+from poke_battle_sim.poke_sim import PokeSim
+from poke_battle_sim.core.battle import Battle
+from poke_battle_sim.core.trainer import Trainer
+from poke_battle_sim.core.action import Action
+from poke_battle_sim.tools.batch import build_trainer
+
+import poke_battle_sim.conf.global_settings as gs
+
+# Pokemon arguments in the order they are written; each one present in a spec sets one bit
+# of the Pokemon's field mask
+_POKE_FIELDS = (
+    "name_or_id",
+    "level",
+    "moves",
+    "gender",
+    "ability",
+    "nature",
+    "cur_hp",
+    "stats_actual",
+    "ivs",
+    "evs",
+    "item",
+    "status",
+    "nickname",
+    "friendship",
+)
+_STR_FIELDS = {"gender", "ability", "nature", "item", "status", "nickname"}
+_STATS_FIELDS = {"stats_actual", "ivs", "evs"}
+
+
+class Replay:
+    def __init__(
+        self,
+        spec: tuple,
+        log: list = None,
+        names: tuple[str, str] = ("Trainer 1", "Trainer 2"),
+    ):
+        """
+        A Replay holds everything needed to play a battle out again: its spec, formatted as
+        ($team_1, $team_2, $seed) as in run_battles, the Trainers' names, and the battle's
+        replay_log of turn actions and selections.
+
+        Replays are usually created with record or from_bytes rather than directly.
+        """
+        if not isinstance(spec, (list, tuple)) or len(spec) != 3 or not isinstance(spec[2], int):
+            raise Exception("Attempted to create Replay with invalid battle spec")
+        self.spec = tuple(spec)
+        self.names = tuple(names)
+        self.battle = None
+        self._log = log if log is not None else []
+
+    @classmethod
+    def record(
+        cls,
+        spec: tuple,
+        log_level: int = gs.LOG_TEXT,
+        names: tuple[str, str] = ("Trainer 1", "Trainer 2"),
+    ) -> Replay:
+        """
+        Creates and starts the battle for spec and returns a Replay that records it. The battle is
+        in the Replay's battle field, and every turn processed on it (with turn or begin_turn) is
+        recorded along with the Pokemon its Trainers select. If spec has no seed, the seed drawn
+        by the battle is recorded.
+        """
+        battle = Battle(
+            build_trainer(names[0], spec[0]),
+            build_trainer(names[1], spec[1]),
+            seed=spec[2] if len(spec) > 2 else None,
+            log_level=log_level,
+        )
+        battle.replay_log = []
+        battle.start()
+        replay = cls((spec[0], spec[1], battle.seed), names=names)
+        replay.battle = battle
+        return replay
+
+    @property
+    def log(self) -> list:
+        # restoring a snapshot of a recorded battle replaces its log, so it is looked up every time
+        return self.battle.replay_log if self.battle else self._log
+
+    def replay(self, log_level: int = gs.LOG_TEXT) -> Battle:
+        """
+        Plays the battle out again from the start and returns the new Battle, i.e. to read its
+        battle text or events.
+        """
+        t1 = build_trainer(self.names[0], self.spec[0])
+        t2 = build_trainer(self.names[1], self.spec[1])
+        choices = iter([entry for entry in self.log if isinstance(entry, int)])
+        t1.selection = _make_selection(t1, choices)
+        t2.selection = _make_selection(t2, choices)
+        battle = Battle(t1, t2, seed=self.spec[2], log_level=log_level)
+        battle.start()
+        for entry in self.log:
+            if isinstance(entry, tuple):
+                battle.turn(entry[0], entry[1])
+        return battle
+
+    def to_bytes(self, compression: int = gs.REPLAY_ZLIB) -> bytes:
+        """
+        Encodes the Replay into its binary format. compression is gs.REPLAY_NONE, gs.REPLAY_ZLIB,
+        or gs.REPLAY_LZMA.
+        """
+        out = bytearray()
+        for name in self.names:
+            _write_str(out, name)
+        _write_varint(out, _zigzag(self.spec[2]))
+        for team in self.spec[:2]:
+            _write_team(out, team)
+
+        turns = []
+        for entry in self.log:
+            if isinstance(entry, tuple):
+                turns.append([entry])
+            elif turns:
+                turns[-1].append(entry)
+        _write_varint(out, len(turns))
+        for turn in turns:
+            _write_action(out, turn[0][0])
+            _write_action(out, turn[0][1])
+            _write_varint(out, len(turn) - 1)
+            for slot in turn[1:]:
+                _write_varint(out, slot)
+        return (
+            gs.REPLAY_MAGIC
+            + bytes((gs.REPLAY_VERSION, compression))
+            + _compress(bytes(out), compression)
+        )
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> Replay:
+        """
+        Decodes a Replay created with to_bytes.
+        """
+        header = len(gs.REPLAY_MAGIC)
+        if len(data) < header + 2 or data[:header] != gs.REPLAY_MAGIC:
+            raise Exception("Attempted to read invalid replay")
+        if data[header] != gs.REPLAY_VERSION:
+            raise Exception("Attempted to read replay with unsupported version")
+        data = _decompress(data[header + 2 :], data[header + 1])
+
+        pos = 0
+        t1_name, pos = _read_str(data, pos)
+        t2_name, pos = _read_str(data, pos)
+        seed, pos = _read_varint(data, pos)
+        team_1, pos = _read_team(data, pos)
+        team_2, pos = _read_team(data, pos)
+        log = []
+        num_turns, pos = _read_varint(data, pos)
+        for _ in range(num_turns):
+            t1_action, pos = _read_action(data, pos)
+            t2_action, pos = _read_action(data, pos)
+            log.append((t1_action, t2_action))
+            num_selections, pos = _read_varint(data, pos)
+            for _ in range(num_selections):
+                slot, pos = _read_varint(data, pos)
+                log.append(slot)
+        return cls((team_1, team_2, _unzigzag(seed)), log, (t1_name, t2_name))
+
+
+def replay(data: bytes, log_level: int = gs.LOG_TEXT) -> Battle:
+    """
+    Decodes a Replay created with to_bytes and plays it out again, returning the new Battle.
+    """
+    return Replay.from_bytes(data).replay(log_level)
+
+
+def encode_team(team: list[dict]) -> bytes:
+    """
+    Returns a team spec in the binary format used by replays. The encoding does not depend on
+    the order of each Pokemon's arguments or on whether Pokemon are given by name or id.
+    """
+    out = bytearray()
+    _write_team(out, team)
+    return bytes(out)
+
+
+def _make_selection(trainer: Trainer, choices) -> callable:
+    def select(battle: Battle):
+        slot = next(choices, None)
+        if slot is not None and slot < len(trainer.poke_list):
+            trainer.current_poke = trainer.poke_list[slot]
+
+    return select
+
+
+def _compress(data: bytes, compression: int) -> bytes:
+    if compression == gs.REPLAY_NONE:
+        return data
+    if compression == gs.REPLAY_ZLIB:
+        import zlib
+
+        return zlib.compress(data, 9)
+    if compression == gs.REPLAY_LZMA:
+        import lzma
+
+        # raw lzma streams skip the container header, which is larger than most replays, and
+        # a small dictionary keeps compression from allocating far more memory than it needs
+        return lzma.compress(
+            data,
+            format=lzma.FORMAT_RAW,
+            filters=[
+                {
+                    "id": lzma.FILTER_LZMA2,
+                    "preset": 9,
+                    "dict_size": gs.REPLAY_LZMA_DICT_SIZE,
+                }
+            ],
+        )
+    raise Exception("Attempted to write replay with invalid compression")
+
+
+def _decompress(data: bytes, compression: int) -> bytes:
+    if compression == gs.REPLAY_NONE:
+        return data
+    if compression == gs.REPLAY_ZLIB:
+        import zlib
+
+        return zlib.decompress(data)
+    if compression == gs.REPLAY_LZMA:
+        import lzma
+
+        return lzma.decompress(
+            data,
+            format=lzma.FORMAT_RAW,
+            filters=[{"id": lzma.FILTER_LZMA2, "dict_size": gs.REPLAY_LZMA_DICT_SIZE}],
+        )
+    raise Exception("Attempted to read replay with invalid compression")
+
+
+def _write_team(out: bytearray, team: list[dict]):
+    _write_varint(out, len(team))
+    for poke in team:
+        if not isinstance(poke, dict) or not all(k in _POKE_FIELDS for k in poke):
+            raise Exception("Attempted to write replay with invalid team")
+        fields = [k for k in _POKE_FIELDS if poke.get(k) is not None]
+        _write_varint(out, sum(1 << _POKE_FIELDS.index(k) for k in fields))
+        for k in fields:
+            value = poke[k]
+            if k == "name_or_id":
+                p_id = PokeSim.get_valid_name_or_id(
+                    value.lower() if isinstance(value, str) else value
+                )
+                if not p_id:
+                    raise Exception("Attempted to write replay with invalid Pokemon")
+                _write_varint(out, p_id)
+            elif k == "moves":
+                _write_varint(out, len(value))
+                for move in value:
+                    move_id = PokeSim.get_move_id(move)
+                    if not move_id:
+                        raise Exception("Attempted to write replay with invalid move")
+                    _write_varint(out, move_id)
+            elif k in _STATS_FIELDS:
+                if len(value) != gs.STAT_NUM:
+                    raise Exception("Attempted to write replay with invalid stats")
+                for stat in value:
+                    _write_varint(out, stat)
+            elif k in _STR_FIELDS:
+                _write_str(out, value)
+            else:
+                _write_varint(out, value)
+
+
+def _read_team(data: bytes, pos: int) -> tuple[list[dict], int]:
+    team = []
+    num_pokes, pos = _read_varint(data, pos)
+    for _ in range(num_pokes):
+        mask, pos = _read_varint(data, pos)
+        poke = {}
+        for i in range(len(_POKE_FIELDS)):
+            if not mask & 1 << i:
+                continue
+            k = _POKE_FIELDS[i]
+            if k == "moves":
+                num_moves, pos = _read_varint(data, pos)
+                moves = []
+                for _ in range(num_moves):
+                    move_id, pos = _read_varint(data, pos)
+                    moves.append(PokeSim.get_move_name(move_id))
+                poke[k] = moves
+            elif k in _STATS_FIELDS:
+                stats = []
+                for _ in range(gs.STAT_NUM):
+                    stat, pos = _read_varint(data, pos)
+                    stats.append(stat)
+                poke[k] = stats
+            elif k in _STR_FIELDS:
+                poke[k], pos = _read_str(data, pos)
+            else:
+                poke[k], pos = _read_varint(data, pos)
+        team.append(poke)
+    return team, pos
+
+
+def _write_action(out: bytearray, action: Action):
+    # the kind and slot share one byte for everything but items
+    slot = 0 if action.slot is None else action.slot + 1
+    _write_varint(out, action.kind | slot << 3)
+    if action.kind == gs.ACTION_ITEM:
+        _write_str(out, action.item)
+        _write_varint(out, 0 if action.move_slot is None else action.move_slot + 1)
+
+
+def _read_action(data: bytes, pos: int) -> tuple[Action, int]:
+    code, pos = _read_varint(data, pos)
+    kind = code & 7
+    slot = (code >> 3) - 1 if code >> 3 else None
+    if kind == gs.ACTION_ITEM:
+        item, pos = _read_str(data, pos)
+        move_slot, pos = _read_varint(data, pos)
+        return Action.use_item(item, slot, move_slot - 1 if move_slot else None), pos
+    return Action(kind, slot), pos
+
+
+def _write_varint(out: bytearray, value: int):
+    if not isinstance(value, int) or value < 0:
+        raise Exception("Attempted to write replay with invalid value")
+    while value > 0x7F:
+        out.append(value & 0x7F | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _read_varint(data: bytes, pos: int) -> tuple[int, int]:
+    value = 0
+    shift = 0
+    while True:
+        if pos >= len(data):
+            raise Exception("Attempted to read truncated replay")
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+
+def _write_str(out: bytearray, value: str):
+    if not isinstance(value, str):
+        raise Exception("Attempted to write replay with invalid value")
+    encoded = value.encode()
+    _write_varint(out, len(encoded))
+    out += encoded
+
+
+def _read_str(data: bytes, pos: int) -> tuple[str, int]:
+    length, pos = _read_varint(data, pos)
+    if pos + length > len(data):
+        raise Exception("Attempted to read truncated replay")
+    return data[pos : pos + length].decode(), pos + length
+
+
+def _zigzag(value: int) -> int:
+    return value << 1 if value >= 0 else (-value << 1) - 1
+
+
+def _unzigzag(value: int) -> int:
+    return value >> 1 if not value & 1 else -((value + 1) >> 1)
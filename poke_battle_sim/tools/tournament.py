@@ -0,0 +1,302 @@
+from __future__ import annotations
+import os
+import hashlib
+from random import getrandbits
+
+import numpy as np
+
+from poke_battle_sim.tools.batch import run_battles
+from poke_battle_sim.tools.replay import encode_team
+
+import poke_battle_sim.conf.global_settings as gs
+
+# Checkpoints hold one record per battle in the order the battles were scheduled
+_RECORD = np.dtype([("winner", "u1"), ("turn_count", "<u4")])
+_HEADER_SIZE = 40
+
+
+class Tournament:
+    def __init__(
+        self,
+        teams: list[list[dict]],
+        battles_per_pair: int = 1,
+        policies: tuple[callable, callable] | callable = None,
+        max_turns: int = gs.MAX_TURNS,
+        seed: int = None,
+    ):
+        """
+        A round-robin tournament in which every team battles every other team.
+
+        Required
+
+        - teams: list of teams, each a list of dicts formatted as in run_battles
+
+        Optional
+
+        - battles_per_pair: number of battles between each pair of teams
+        - policies: policies as in run_battles, used for whichever team is on each side
+        - max_turns: number of turns after which a battle is counted as a draw
+        - seed: seed for the seeds of every battle, so a tournament can be reproduced and resumed;
+        if not provided, one is drawn and stored in seed
+
+        Each pair of teams is only scheduled once, and the teams swap sides between their battles,
+        so the first team is Trainer 1 in even battles and Trainer 2 in odd ones. Results are
+        stored once per pair of teams (not as N x N matrices, which would take gigabytes for
+        thousands of teams) and are expanded with get_wins, get_draws, get_turns, get_games, and
+        get_win_rates, or looked up for one pair with get_pair.
+        """
+        if not isinstance(teams, list) or len(teams) < 2:
+            raise Exception("Attempted to create Tournament with fewer than two teams")
+        if not isinstance(battles_per_pair, int) or battles_per_pair < 1:
+            raise Exception("Attempted to create Tournament with invalid number of battles per pair")
+        if seed is not None and not isinstance(seed, int):
+            raise Exception("Attempted to create Tournament with invalid seed")
+        n = len(teams)
+        self.teams = teams
+        self.battles_per_pair = battles_per_pair
+        self.policies = policies
+        self.max_turns = max_turns
+        self.seed = seed if seed is not None else getrandbits(64)
+        self._seed_provided = seed is not None
+        self.num_battles = n * (n - 1) // 2 * battles_per_pair
+        self._fingerprint = None
+        self._reset()
+
+    def run(
+        self,
+        workers: int = None,
+        checkpoint: str = None,
+        checkpoint_every: int = gs.TOURNAMENT_CHECKPOINT_EVERY,
+        chunksize: int = gs.BATCH_CHUNK_SIZE,
+    ) -> Tournament:
+        """
+        Runs every battle of the tournament that has not been run yet and returns the Tournament.
+
+        workers and chunksize are passed to run_battles. Results are added every checkpoint_every
+        battles and when run stops for any reason (i.e. it is interrupted). If checkpoint is a
+        path, the results of those battles are also appended to the checkpoint file there, and if
+        a checkpoint already exists there, the tournament resumes from it.
+        """
+        if not isinstance(checkpoint_every, int) or checkpoint_every < 1:
+            raise Exception("Attempted to run Tournament with invalid checkpoint interval")
+        f = self._open_checkpoint(checkpoint) if checkpoint else None
+        results = run_battles(
+            self._get_specs(self.completed),
+            self.policies,
+            workers=workers,
+            max_turns=self.max_turns,
+            chunksize=chunksize,
+        )
+        pending = []
+        try:
+            for winner, turn_count, _ in results:
+                pending.append((winner, turn_count))
+                if len(pending) >= checkpoint_every:
+                    self._add_results(pending, f)
+        finally:
+            results.close()
+            try:
+                self._add_results(pending, f)
+            finally:
+                if f:
+                    f.close()
+        return self
+
+    def is_finished(self) -> bool:
+        return self.completed == self.num_battles
+
+    def get_pair(self, i: int, j: int) -> tuple[int, int, int, int]:
+        """
+        Returns ($wins_i, $wins_j, $draws, $turns) for the battles between teams i and j, where
+        $turns is the total number of turns of those battles.
+        """
+        if i == j or not 0 <= i < len(self.teams) or not 0 <= j < len(self.teams):
+            raise Exception("Attempted to get results of invalid pair of teams")
+        p = self._get_pair_index(min(i, j), max(i, j))
+        wins_i, wins_j = int(self._wins[p]), int(self._losses[p])
+        if i > j:
+            wins_i, wins_j = wins_j, wins_i
+        return wins_i, wins_j, int(self._draws[p]), int(self._turns[p])
+
+    def get_wins(self) -> np.ndarray:
+        """
+        Returns the N x N matrix where [i, j] is the number of battles team i won against team j.
+        """
+        return self._to_matrix(self._wins, self._losses)
+
+    def get_draws(self) -> np.ndarray:
+        """
+        Returns the N x N matrix where [i, j] is the number of battles between teams i and j that
+        reached max_turns.
+        """
+        return self._to_matrix(self._draws, self._draws)
+
+    def get_turns(self) -> np.ndarray:
+        """
+        Returns the N x N matrix where [i, j] is the total number of turns of the battles between
+        teams i and j.
+        """
+        return self._to_matrix(self._turns, self._turns)
+
+    def get_games(self) -> np.ndarray:
+        """
+        Returns the N x N matrix of the number of battles played between each pair of teams.
+        """
+        games = self._wins + self._losses + self._draws
+        return self._to_matrix(games, games)
+
+    def get_win_rates(self) -> np.ndarray:
+        """
+        Returns the N x N matrix of the fraction of battles team i won against team j, which is
+        nan for pairs that have not battled.
+        """
+        games = self.get_games()
+        rates = np.full(games.shape, np.nan)
+        np.divide(self.get_wins(), games, out=rates, where=games > 0)
+        return rates
+
+    def load(self, path: str):
+        """
+        Loads the results in a checkpoint written by run, replacing the Tournament's results. The
+        checkpoint must come from a tournament with the same teams, battles per pair, max_turns,
+        and seed (if a seed was provided).
+        """
+        with open(path, "rb") as f:
+            header = f.read(_HEADER_SIZE)
+        if len(header) < _HEADER_SIZE or header[: len(gs.TOURNAMENT_MAGIC)] != gs.TOURNAMENT_MAGIC:
+            raise Exception("Attempted to load invalid tournament checkpoint")
+        if header[len(gs.TOURNAMENT_MAGIC)] != gs.TOURNAMENT_VERSION:
+            raise Exception("Attempted to load tournament checkpoint with unsupported version")
+        seed = int.from_bytes(header[24:40], "little", signed=True)
+        if header[8:24] != self._get_fingerprint() or (self._seed_provided and seed != self.seed):
+            raise Exception("Attempted to load checkpoint of a different tournament")
+
+        # a record cut off by an interruption is ignored and written again when the run resumes
+        num_records = min(
+            (os.path.getsize(path) - _HEADER_SIZE) // _RECORD.itemsize, self.num_battles
+        )
+        self.seed = seed
+        self._reset()
+        if not num_records:
+            return
+        records = np.memmap(
+            path, dtype=_RECORD, mode="r", offset=_HEADER_SIZE, shape=(num_records,)
+        )
+        for start in range(0, num_records, gs.TOURNAMENT_LOAD_CHUNK):
+            self._aggregate(np.array(records[start : start + gs.TOURNAMENT_LOAD_CHUNK]))
+        del records
+
+    def _reset(self):
+        # results are stored per pair (i, j) with i < j in the order pairs are scheduled, so
+        # wins are team i's wins and losses are team j's wins
+        num_pairs = len(self.teams) * (len(self.teams) - 1) // 2
+        count_dtype = np.min_scalar_type(self.battles_per_pair)
+        self._wins = np.zeros(num_pairs, dtype=count_dtype)
+        self._losses = np.zeros(num_pairs, dtype=count_dtype)
+        self._draws = np.zeros(num_pairs, dtype=count_dtype)
+        self._turns = np.zeros(
+            num_pairs, dtype=np.min_scalar_type(self.battles_per_pair * self.max_turns)
+        )
+        self.completed = 0
+
+    def _open_checkpoint(self, path: str):
+        if os.path.exists(path):
+            self.load(path)
+            f = open(path, "r+b")
+            f.truncate(_HEADER_SIZE + self.completed * _RECORD.itemsize)
+            f.seek(0, os.SEEK_END)
+            return f
+        f = open(path, "wb")
+        f.write(
+            gs.TOURNAMENT_MAGIC
+            + bytes((gs.TOURNAMENT_VERSION,))
+            + bytes(8 - len(gs.TOURNAMENT_MAGIC) - 1)
+            + self._get_fingerprint()
+            + self.seed.to_bytes(16, "little", signed=True)
+        )
+        f.flush()
+        return f
+
+    def _add_results(self, pending: list, f):
+        # the pending results are taken first, so results are never added twice even if this
+        # is interrupted, and the checkpoint is written before they are aggregated, so the
+        # checkpoint never holds fewer results than the Tournament
+        if not pending:
+            return
+        records = np.array(pending, dtype=_RECORD)
+        pending.clear()
+        if f:
+            f.write(records.tobytes())
+            f.flush()
+        self._aggregate(records)
+
+    def _aggregate(self, records: np.ndarray):
+        k = np.arange(self.completed, self.completed + len(records), dtype=np.int64)
+        pair, k = np.divmod(k, self.battles_per_pair)
+        first = int(pair[0])
+        pair -= first
+        num_pairs = int(pair[-1]) + 1
+
+        # odd battles of each pair have the pair's first team as Trainer 2
+        swapped = (k % 2).astype(bool)
+        winner = records["winner"]
+        first_won = ((winner == 1) & ~swapped) | ((winner == 2) & swapped)
+        second_won = ((winner == 2) & ~swapped) | ((winner == 1) & swapped)
+        wins = np.bincount(pair, first_won, num_pairs)
+        losses = np.bincount(pair, second_won, num_pairs)
+        draws = np.bincount(pair, winner == 0, num_pairs)
+        turns = np.bincount(pair, records["turn_count"], num_pairs)
+
+        # every delta is found before any result is added, so completed always matches them
+        end = first + num_pairs
+        self._wins[first:end] += wins.astype(self._wins.dtype)
+        self._losses[first:end] += losses.astype(self._losses.dtype)
+        self._draws[first:end] += draws.astype(self._draws.dtype)
+        self._turns[first:end] += turns.astype(self._turns.dtype)
+        self.completed += len(records)
+
+    def _to_matrix(self, upper: np.ndarray, lower: np.ndarray) -> np.ndarray:
+        n = len(self.teams)
+        matrix = np.zeros((n, n), dtype=upper.dtype)
+        start = 0
+        for i in range(n - 1):
+            end = start + n - 1 - i
+            matrix[i, i + 1 :] = upper[start:end]
+            matrix[i + 1 :, i] = lower[start:end]
+            start = end
+        return matrix
+
+    def _get_pair_index(self, i: int, j: int) -> int:
+        return i * (2 * len(self.teams) - i - 1) // 2 + j - i - 1
+
+    def _get_specs(self, start: int):
+        # run_battles returns results in the order of specs, so the results are matched to their
+        # pairs by position
+        n = len(self.teams)
+        pair, k = divmod(start, self.battles_per_pair)
+        i = 0
+        while i < n - 1 and pair >= n - 1 - i:
+            pair -= n - 1 - i
+            i += 1
+        j = i + 1 + pair
+        idx = start
+        for i in range(i, n - 1):
+            for j in range(j, n):
+                for k in range(k, self.battles_per_pair):
+                    t1, t2 = (i, j) if not k % 2 else (j, i)
+                    yield self.teams[t1], self.teams[t2], self.seed + (idx << 64)
+                    idx += 1
+                k = 0
+            j = i + 2
+
+    def _get_fingerprint(self) -> bytes:
+        if not self._fingerprint:
+            h = hashlib.blake2b(digest_size=16)
+            h.update(self.battles_per_pair.to_bytes(4, "little"))
+            h.update(self.max_turns.to_bytes(4, "little"))
+            for team in self.teams:
+                encoded = encode_team(team)
+                h.update(len(encoded).to_bytes(4, "little"))
+                h.update(encoded)
+            self._fingerprint = h.digest()
+        return self._fingerprint
@@ -1,5 +1,4 @@
 from __future__ import annotations
-from random import randrange
 
 from poke_battle_sim.poke_sim import PokeSim
 from poke_battle_sim.core.move import Move
@@ -14,25 +13,63 @@ import poke_battle_sim.conf.global_settings as gs
 import poke_battle_sim.conf.global_data as gd
 
 
+def _build_ability_hooks() -> dict[str, int]:
+    ability_hooks = {}
+    for hook, abilities in (
+        (gs.HOOK_SELECTION, gd.SELECTION_ABILITY_CHECK),
+        (gs.HOOK_ENEMY_SELECTION, gd.ENEMY_SELECTION_ABILITY_CHECK),
+        (gs.HOOK_END_TURN, gd.END_TURN_ABILITY_CHECK),
+        (gs.HOOK_TYPE_PROTECTION, gd.TYPE_PROTECTION_ABILITY_CHECK),
+        (gs.HOOK_ON_HIT, gd.ON_HIT_ABILITY_CHECK),
+        (gs.HOOK_STAT_CALC, gd.STAT_CALC_ABILITY_CHECK),
+        (gs.HOOK_ATTACKER_DMG, gd.ATTACKER_DMG_ABILITY_CHECK),
+        (gs.HOOK_DEFENDER_DMG, gd.DEFENDER_DMG_ABILITY_CHECK),
+        (gs.HOOK_HOMC, gd.HOMC_ABILITY_CHECK),
+        (gs.HOOK_PRE_MOVE, gd.PRE_MOVE_ABILITY_CHECK),
+        (gs.HOOK_WEATHER_CHANGE, gd.WEATHER_CHANGE_ABILITY_CHECK),
+    ):
+        for ability in abilities:
+            ability_hooks[ability] = ability_hooks.get(ability, 0) | hook
+    return ability_hooks
+
+
+_ABILITY_HOOKS = _build_ability_hooks()
+
+
+def get_ability_hooks(ability: str | None) -> int:
+    """
+    Returns the gs.HOOK_* flags of every ability pass that ability takes part in.
+
+    Each pass below returns immediately for Pokemon whose ability_hooks lack its flag.
+    """
+    return _ABILITY_HOOKS.get(ability, 0)
+
+
 def selection_abilities(
     poke: pk.Pokemon, battlefield: bf.Battlefield, battle: bt.Battle
 ):
+    if not poke.ability_hooks & gs.HOOK_SELECTION:
+        return
     if poke.has_ability("drizzle") and battlefield.weather != gs.RAIN:
         battlefield.change_weather(gs.RAIN)
         battlefield.weather_count = 999
-        battle.add_text("It started to rain!")
+        if battle.log_text:
+            battle.add_text("It started to rain!")
     elif poke.has_ability("drought") and battlefield.weather != gs.HARSH_SUNLIGHT:
         battlefield.change_weather(gs.HARSH_SUNLIGHT)
         battlefield.weather_count = 999
-        battle.add_text("The sunlight turned harsh!")
+        if battle.log_text:
+            battle.add_text("The sunlight turned harsh!")
     elif poke.has_ability("snow-warning") and battlefield.weather != gs.HAIL:
         battlefield.change_weather(gs.HAIL)
         battlefield.weather_count = 999
-        battle.add_text("It started to hail!")
+        if battle.log_text:
+            battle.add_text("It started to hail!")
     elif poke.has_ability("sand-stream") and battlefield.weather != gs.SANDSTORM:
         battlefield.change_weather(gs.SANDSTORM)
         battlefield.weather_count = 999
-        battle.add_text("A sandstorm brewed")
+        if battle.log_text:
+            battle.add_text("A sandstorm brewed")
     elif poke.has_ability("water-veil") and poke.nv_status == gs.BURNED:
         pm.cure_nv_status(gs.BURNED, poke, battle)
     elif poke.has_ability("magma-armor") and poke.nv_status == gs.FROZEN:
@@ -47,10 +84,12 @@ def selection_abilities(
     elif (
         poke.has_ability("cloud-nine") or poke.has_ability("air-lock")
     ) and battlefield.weather != gs.CLEAR:
-        battle.add_text("The effects of weather disappeared.")
+        if battle.log_text:
+            battle.add_text("The effects of weather disappeared.")
         battlefield.change_weather(gs.CLEAR)
     elif poke.has_ability("own-tempo") and poke.v_status[gs.CONFUSED]:
-        battle.add_text(poke.nickname + " snapped out of its confusion!")
+        if battle.log_text:
+            battle.add_text(poke.nickname + " snapped out of its confusion!")
         poke.v_status[gs.CONFUSED] = 0
     elif (
         poke.has_ability("trace")
@@ -58,14 +97,15 @@ def selection_abilities(
         and poke.enemy.current_poke.ability
         and not poke.enemy.current_poke.has_ability("trace")
     ):
-        battle.add_text(
-            poke.nickname
-            + " copied "
-            + poke.enemy.current_poke.nickname
-            + "'s "
-            + poke.enemy.current_poke.ability
-            + "!"
-        )
+        if battle.log_text:
+            battle.add_text(
+                poke.nickname
+                + " copied "
+                + poke.enemy.current_poke.nickname
+                + "'s "
+                + poke.enemy.current_poke.ability
+                + "!"
+            )
         poke.give_ability(poke.enemy.current_poke.ability)
     elif poke.has_ability("forecast"):
         _forecast_check(poke, battle, battlefield)
@@ -90,47 +130,52 @@ def selection_abilities(
                 for move in poke.enemy.current_poke.moves
             ]
         ):
-            battle.add_text(poke.nickname + " shuddered!")
+            if battle.log_text:
+                battle.add_text(poke.nickname + " shuddered!")
     elif poke.has_ability("forewarn") and poke.enemy.current_poke.is_alive:
         alert = _rand_max_power(poke.enemy.current_poke)
-        battle.add_text(poke.nickname + "'s Forewarn alerted it to " + alert.name)
+        if battle.log_text:
+            battle.add_text(poke.nickname + "'s Forewarn alerted it to " + alert.name)
     elif (
         poke.has_ability("frisk")
         and poke.enemy.current_poke.ability
         and poke.enemy.current_poke.item
     ):
-        battle.add_text(
-            poke.nickname
-            + " frisked "
-            + poke.enemy.current_poke.nickname
-            + " and found its "
-            + poke.enemy.current_poke.item
-            + "!"
-        )
+        if battle.log_text:
+            battle.add_text(
+                poke.nickname
+                + " frisked "
+                + poke.enemy.current_poke.nickname
+                + " and found its "
+                + poke.enemy.current_poke.item
+                + "!"
+            )
     elif poke.has_ability("multitype") and poke.item in gd.PLATE_DATA:
         poke.types = (gd.PLATE_DATA[poke.item], None)
-        battle.add_text(
-            poke.nickname + " transformed into the " + poke.types[0].upper() + " type!"
-        )
+        if battle.log_text:
+            battle.add_text(
+                poke.nickname + " transformed into the " + poke.types[0].upper() + " type!"
+            )
 
 
 def enemy_selection_abilities(
     enemy_poke: pk.Pokemon, battlefield: bf.Battlefield, battle: bt.Battle
 ):
     poke = enemy_poke.enemy.current_poke
-    if not poke.is_alive:
+    if not poke.is_alive or not poke.ability_hooks & gs.HOOK_ENEMY_SELECTION:
         return
     if poke.has_ability("intimidate"):
         pm.give_stat_change(enemy_poke, battle, gs.ATK, -1, forced=True)
     elif poke.has_ability("trace") and enemy_poke.ability:
-        battle.add_text(
-            poke.nickname
-            + " copied "
-            + enemy_poke.nickname
-            + "'s "
-            + enemy_poke.ability
-            + "!"
-        )
+        if battle.log_text:
+            battle.add_text(
+                poke.nickname
+                + " copied "
+                + enemy_poke.nickname
+                + "'s "
+                + enemy_poke.ability
+                + "!"
+            )
         poke.give_ability(enemy_poke.ability)
     elif poke.has_ability("download") and not poke.ability_activated:
         enemy_poke.calculate_stats_effective()
@@ -146,26 +191,31 @@ def enemy_selection_abilities(
                 for move in poke.enemy.current_poke.moves
             ]
         ):
-            battle.add_text(poke.nickname + " shuddered!")
+            if battle.log_text:
+                battle.add_text(poke.nickname + " shuddered!")
     elif poke.has_ability("forewarn"):
         alert = _rand_max_power(enemy_poke)
-        battle.add_text(poke.nickname + "'s Forewarn alerted it to " + alert.name)
+        if battle.log_text:
+            battle.add_text(poke.nickname + "'s Forewarn alerted it to " + alert.name)
     elif (
         poke.has_ability("frisk")
         and poke.enemy.current_poke.ability
         and poke.enemy.current_poke.item
     ):
-        battle.add_text(
-            poke.nickname
-            + " frisked "
-            + poke.enemy.current_poke.nickname
-            + " and found its "
-            + poke.enemy.current_poke.item
-            + "!"
-        )
+        if battle.log_text:
+            battle.add_text(
+                poke.nickname
+                + " frisked "
+                + poke.enemy.current_poke.nickname
+                + " and found its "
+                + poke.enemy.current_poke.item
+                + "!"
+            )
 
 
 def end_turn_abilities(poke: pk.Pokemon, battle: bt.Battle):
+    if not poke.ability_hooks & gs.HOOK_END_TURN:
+        return
     if poke.has_ability("speed-boost"):
         pm.give_stat_change(poke, battle, gs.SPD, 1)
     elif poke.has_ability("slow-start"):
@@ -175,29 +225,35 @@ def end_turn_abilities(poke: pk.Pokemon, battle: bt.Battle):
         and poke.enemy.current_poke.is_alive
         and poke.enemy.current_poke.nv_status == gs.ASLEEP
     ):
-        battle.add_text(poke.enemy.current_poke.nickname + " is tormented!")
+        if battle.log_text:
+            battle.add_text(poke.enemy.current_poke.nickname + " is tormented!")
         poke.enemy.current_poke.take_damage(max(1, poke.enemy.current_poke.max_hp // 8))
 
 
 def type_protection_abilities(
     defender: pk.Pokemon, move_data: Move, battle: bt.Battle
 ) -> bool:
+    if not defender.ability_hooks & gs.HOOK_TYPE_PROTECTION:
+        return False
     if defender.has_ability("volt-absorb") and move_data.type == "electric":
-        battle.add_text(
-            defender.nickname + " absorbed " + move_data.name + " with Volt Absorb!"
-        )
+        if battle.log_text:
+            battle.add_text(
+                defender.nickname + " absorbed " + move_data.name + " with Volt Absorb!"
+            )
         if not defender.cur_hp == defender.max_hp:
             defender.heal(defender.max_hp // 4)
         return True
     elif defender.has_ability("water-absorb") and move_data.type == "water":
-        battle.add_text(
-            defender.nickname + " absorbed " + move_data.name + " with Water Absorb!"
-        )
+        if battle.log_text:
+            battle.add_text(
+                defender.nickname + " absorbed " + move_data.name + " with Water Absorb!"
+            )
         if not defender.cur_hp == defender.max_hp:
             defender.heal(defender.max_hp // 4)
         return True
     elif defender.has_ability("flash-fire") and move_data.type == "fire":
-        battle.add_text("It doesn't affect " + defender.nickname)
+        if battle.log_text:
+            battle.add_text("It doesn't affect " + defender.nickname)
         defender.ability_activated = True
         return True
     return False
@@ -206,43 +262,48 @@ def type_protection_abilities(
 def on_hit_abilities(
     attacker: pk.Pokemon, defender: pk.Pokemon, battle: bt.Battle, move_data: Move
 ) -> bool:
-    made_contact = move_data.name in gd.CONTACT_CHECK
-    if defender.has_ability("static") and made_contact and randrange(10) < 3:
+    if not defender.ability_hooks & gs.HOOK_ON_HIT:
+        return False
+    made_contact = move_data.flags & gs.MF_CONTACT
+    if defender.has_ability("static") and made_contact and battle.rng.randrange(10) < 3:
         pm.paralyze(attacker, battle)
     elif defender.has_ability("rough-skin") and made_contact:
         attacker.take_damage(max(1, attacker.max_hp // 16))
-        battle.add_text(attacker.nickname + " was hurt!")
-    elif defender.has_ability("effect-spore") and made_contact and randrange(10) < 3:
-        pm.give_nv_status(randrange(3, 6), attacker, battle)
+        if battle.log_text:
+            battle.add_text(attacker.nickname + " was hurt!")
+    elif defender.has_ability("effect-spore") and made_contact and battle.rng.randrange(10) < 3:
+        pm.give_nv_status(battle.rng.randrange(3, 6), attacker, battle)
     elif (
         defender.has_ability("color-change")
         and move_data.type not in defender.types
         and PokeSim.is_valid_type(move_data.type)
     ):
         defender.types = (move_data.type, None)
-        battle.add_text(
-            defender.nickname
-            + " transformed into the "
-            + move_data.type.upper()
-            + " type!"
-        )
+        if battle.log_text:
+            battle.add_text(
+                defender.nickname
+                + " transformed into the "
+                + move_data.type.upper()
+                + " type!"
+            )
     elif (
         defender.has_ability("wonder-guard")
         and pm._calculate_type_ef(defender, move_data) < 2
     ):
-        battle.add_text("It doesn't affect " + defender.nickname)
+        if battle.log_text:
+            battle.add_text("It doesn't affect " + defender.nickname)
         return True
-    elif defender.has_ability("flame-body") and made_contact and randrange(10) < 3:
+    elif defender.has_ability("flame-body") and made_contact and battle.rng.randrange(10) < 3:
         pm.burn(attacker, battle)
     elif (
         defender.has_ability("poison-point")
         and made_contact
         and not "steel" in attacker.types
         and not "poison" in attacker.types
-        and randrange(10) < 3
+        and battle.rng.randrange(10) < 3
     ):
         pm.poison(attacker, battle)
-    elif defender.has_ability("cute-charm") and made_contact and randrange(10) < 3:
+    elif defender.has_ability("cute-charm") and made_contact and battle.rng.randrange(10) < 3:
         pm.infatuate(defender, attacker, battle)
     elif defender.has_ability("motor-drive") and move_data.type == "electric":
         pm.give_stat_change(defender, battle, gs.SPD, 1)
@@ -250,41 +311,33 @@ def on_hit_abilities(
     return False
 
 
-def stat_calc_abilities(poke: pk.Pokemon):
-    if (
-        poke.has_ability("swift-swim")
-        and poke.cur_battle.battlefield.weather == gs.RAIN
-    ):
-        poke.stats_effective[gs.SPD] *= 2
-    elif (
-        poke.has_ability("chlorophyll")
-        and poke.cur_battle.battlefield.weather == gs.HARSH_SUNLIGHT
-    ):
-        poke.stats_effective[gs.SPD] *= 2
+def stat_calc_abilities(poke: pk.Pokemon, stats: list[int], weather: int = None):
+    if not poke.ability_hooks & gs.HOOK_STAT_CALC:
+        return
+    if weather is None and poke.cur_battle:
+        weather = poke.cur_battle.battlefield.weather
+    if poke.has_ability("swift-swim") and weather == gs.RAIN:
+        stats[gs.SPD] *= 2
+    elif poke.has_ability("chlorophyll") and weather == gs.HARSH_SUNLIGHT:
+        stats[gs.SPD] *= 2
     elif poke.has_ability("huge-power") or poke.has_ability("pure-power"):
-        poke.stats_effective[gs.ATK] *= 2
+        stats[gs.ATK] *= 2
     elif poke.has_ability("hustle") or (poke.has_ability("guts") and poke.nv_status):
-        poke.stats_effective[gs.ATK] = int(poke.stats_effective[gs.ATK] * 1.5)
+        stats[gs.ATK] = int(stats[gs.ATK] * 1.5)
     elif poke.has_ability("marvel-scale") and poke.nv_status:
-        poke.stats_effective[gs.DEF] = int(poke.stats_effective[gs.DEF] * 1.5)
-    elif (
-        poke.has_ability("solar-power")
-        and poke.cur_battle.battlefield.weather == gs.HARSH_SUNLIGHT
-    ):
-        poke.stats_effective[gs.SP_ATK] = int(poke.stats_effective[gs.SP_ATK] * 1.5)
+        stats[gs.DEF] = int(stats[gs.DEF] * 1.5)
+    elif poke.has_ability("solar-power") and weather == gs.HARSH_SUNLIGHT:
+        stats[gs.SP_ATK] = int(stats[gs.SP_ATK] * 1.5)
     elif poke.has_ability("quick-feet") and poke.nv_status:
-        poke.stats_effective[gs.SPD] = int(poke.stats_effective[gs.SPD] * 1.5)
+        stats[gs.SPD] = int(stats[gs.SPD] * 1.5)
     elif poke.has_ability("slow-start") and poke.ability_count < 5:
-        poke.stats_effective[gs.ATK] //= 2
-        poke.stats_effective[gs.SPD] //= 2
-    elif (
-        poke.has_ability("flower-gift")
-        and poke.cur_battle.battlefield.weather == gs.HARSH_SUNLIGHT
-    ):
-        poke.stats_effective[gs.ATK] = int(poke.stats_effective[gs.ATK] * 1.5)
-        poke.stats_effective[gs.SP_DEF] = int(poke.stats_effective[gs.SP_DEF] * 1.5)
+        stats[gs.ATK] //= 2
+        stats[gs.SPD] //= 2
+    elif poke.has_ability("flower-gift") and weather == gs.HARSH_SUNLIGHT:
+        stats[gs.ATK] = int(stats[gs.ATK] * 1.5)
+        stats[gs.SP_DEF] = int(stats[gs.SP_DEF] * 1.5)
     elif poke.has_ability("unburden") and poke.unburden:
-        poke.stats_effective[gs.SPD] *= 2
+        stats[gs.SPD] *= 2
 
 
 def damage_calc_abilities(
@@ -293,6 +346,15 @@ def damage_calc_abilities(
     battle: bt.Battle,
     move_data: Move,
     t_mult: int,
+):
+    if attacker.ability_hooks & gs.HOOK_ATTACKER_DMG:
+        _attacker_damage_calc_abilities(attacker, defender, move_data, t_mult)
+    if defender.ability_hooks & gs.HOOK_DEFENDER_DMG:
+        _defender_damage_calc_abilities(defender, move_data, t_mult)
+
+
+def _attacker_damage_calc_abilities(
+    attacker: pk.Pokemon, defender: pk.Pokemon, move_data: Move, t_mult: int
 ):
     if (
         attacker.has_ability("flash-fire")
@@ -333,7 +395,7 @@ def damage_calc_abilities(
             attacker.gender == "male" and defender.gender == "female"
         ):
             move_data.power = int(move_data.power * 0.75)
-    elif attacker.has_ability("iron-fist") and move_data.name in gd.PUNCH_CHECK:
+    elif attacker.has_ability("iron-fist") and move_data.flags & gs.MF_PUNCH:
         move_data.power *= int(move_data.power * 1.2)
     elif attacker.has_ability("normalize"):
         move_data.type = "normal"
@@ -341,9 +403,11 @@ def damage_calc_abilities(
         move_data.power = int(move_data.power * 1.5)
     elif attacker.has_ability("tinted-lens") and t_mult < 1:
         move_data.power *= 2
-    elif attacker.has_ability("reckless") and move_data.name in gd.RECOIL_CHECK:
+    elif attacker.has_ability("reckless") and move_data.flags & gs.MF_RECOIL:
         move_data.power = int(move_data.power * 1.2)
 
+
+def _defender_damage_calc_abilities(defender: pk.Pokemon, move_data: Move, t_mult: int):
     if defender.has_ability("heatproof") and move_data.type == "fire":
         move_data.power //= 2
     elif (
@@ -359,6 +423,8 @@ def homc_abilities(
     battle: bt.Battle,
     move_data: Move,
 ) -> float:
+    if not defender.ability_hooks & gs.HOOK_HOMC:
+        return 1
     ability_mult = 1
     if defender.has_ability("sand-veil") and battlefield.weather == gs.SANDSTORM:
         ability_mult *= 0.8
@@ -380,13 +446,17 @@ def homc_abilities(
 def pre_move_abilities(
     attacker: pk.Pokemon, defender: pk.Pokemon, battle: bt.Battle, move_data: Move
 ):
+    if not attacker.ability_hooks & gs.HOOK_PRE_MOVE:
+        return
     if attacker.has_ability("serene-grace") and move_data.ef_chance:
         move_data.ef_chance *= 2
 
 
 def weather_change_abilities(battle: bt.Battle, battlefield: bf.Battlefield):
-    _forecast_check(battle.t1.current_poke, battle, battlefield)
-    _forecast_check(battle.t2.current_poke, battle, battlefield)
+    if battle.t1.current_poke.ability_hooks & gs.HOOK_WEATHER_CHANGE:
+        _forecast_check(battle.t1.current_poke, battle, battlefield)
+    if battle.t2.current_poke.ability_hooks & gs.HOOK_WEATHER_CHANGE:
+        _forecast_check(battle.t2.current_poke, battle, battlefield)
 
 
 def _forecast_check(poke: pk.Pokemon, battle: bt.Battle, battlefield: bf.Battlefield):
@@ -399,9 +469,10 @@ def _forecast_check(poke: pk.Pokemon, battle: bt.Battle, battlefield: bf.Battlef
             poke.types = ("ice", None)
         else:
             poke.types = ("normal", None)
-        battle.add_text(
-            poke.nickname + " transformed into the " + poke.types[0].upper() + " type!"
-        )
+        if battle.log_text:
+            battle.add_text(
+                poke.nickname + " transformed into the " + poke.types[0].upper() + " type!"
+            )
 
 
 def _rand_max_power(poke: pk.Pokemon) -> Move:
@@ -416,4 +487,4 @@ def _rand_max_power(poke: pk.Pokemon) -> Move:
             p_moves = [move]
         elif move.power == p_max:
             p_moves.append(move)
-    return p_moves[randrange(len(p_moves))]
+    return p_moves[poke.cur_battle.rng.randrange(len(p_moves))]
@@ -1,5 +1,4 @@
 from __future__ import annotations
-from random import randrange
 
 from poke_battle_sim.poke_sim import PokeSim
 from poke_battle_sim.core.move import Move
@@ -15,17 +14,62 @@ import poke_battle_sim.conf.global_settings as gs
 import poke_battle_sim.conf.global_data as gd
 
 
+def _build_item_data() -> dict[str, tuple[int, tuple | None]]:
+    item_hooks = {}
+    for hook, items in (
+        (gs.ITEM_HOOK_DMG, gd.DMG_ITEM_CHECK),
+        (gs.ITEM_HOOK_DMG_MULT, gd.DMG_MULT_ITEM_CHECK),
+        (gs.ITEM_HOOK_PRE_HIT, gd.PRE_HIT_BERRIES),
+        (gs.ITEM_HOOK_ON_DAMAGE, gd.ON_DAMAGE_ITEM_CHECK),
+        (gs.ITEM_HOOK_PRE_MOVE, gd.PRE_MOVE_ITEM_CHECK),
+        (gs.ITEM_HOOK_STAT_CALC, gd.STAT_CALC_ITEM_CHECK),
+        (gs.ITEM_HOOK_STATUS, gd.STATUS_ITEM_CHECK),
+        (gs.ITEM_HOOK_ON_HIT, gd.ON_HIT_ITEM_CHECK),
+        (gs.ITEM_HOOK_HOMC, gd.HOMC_ITEM_CHECK),
+        (gs.ITEM_HOOK_END_TURN, gd.END_TURN_ITEM_CHECK),
+        (gs.ITEM_HOOK_POST_DAMAGE, gd.POST_DAMAGE_ITEM_CHECK),
+    ):
+        for item in items:
+            item_hooks[item] = item_hooks.get(item, 0) | hook
+
+    item_boosts = {}
+    for item, (boost_type, mult) in gd.TYPE_BOOST_ITEMS.items():
+        item_boosts[item] = (None, (boost_type,), mult)
+    for item, (species, boost_types, mult) in gd.SPECIES_BOOST_ITEMS.items():
+        item_boosts[item] = (species, boost_types, mult)
+
+    return {
+        item: (item_hooks.get(item, 0), item_boosts.get(item))
+        for item in item_hooks.keys() | item_boosts.keys()
+    }
+
+
+_ITEM_DATA = _build_item_data()
+_NO_ITEM_DATA = (0, None)
+
+
+def get_item_data(item: str | None) -> tuple[int, tuple | None]:
+    """
+    Returns the gs.ITEM_HOOK_* flags of every item pass that item takes part in, along
+    with its move power boost as (species, boosted types, multiplier) or None.
+
+    Each pass below returns immediately for Pokemon whose item_hooks lack its flag.
+    """
+    return _ITEM_DATA.get(item, _NO_ITEM_DATA)
+
+
 def use_item(
     trainer: tr.Trainer,
     battle: bt.Battle,
     item: str,
-    item_target_pos: str,
-    move_target_pos: str = None,
+    item_target_pos: int,
+    move_target_pos: int = None,
     text_skip: bool = False,
     can_skip: bool = False
 ):
     """
-    Item actions in turn must be formatted as: ['item', $item, $item_target_pos, $move_target_name?]
+    Item actions in turn must be formatted as: ['item', $item, $item_target_pos, $move_target_pos?]
+    or created with Action.use_item($item, $item_target_pos, $move_target_pos?)
 
     $item refers to the item name
     $item_target_pos refers to the target's position in the trainer's party (0-indexed)
@@ -37,19 +81,21 @@ def use_item(
             return
         raise Exception("Trainer attempted to use invalid item on Pokemon")
 
-    poke = trainer.current_poke
-    if move_target_pos:
+    poke = trainer.poke_list[item_target_pos]
+    move = None
+    if move_target_pos is not None:
         move = poke.moves[move_target_pos]
 
     if not text_skip:
-        battle.add_text(
-            trainer.name
-            + " used one "
-            + pm.cap_name(item)
-            + " on "
-            + poke.nickname
-            + "!"
-        )
+        if battle.log_text:
+            battle.add_text(
+                trainer.name
+                + " used one "
+                + pm.cap_name(item)
+                + " on "
+                + poke.nickname
+                + "!"
+            )
 
     if poke.embargo_count:
         pm._failed(battle)
@@ -95,22 +141,24 @@ def use_item(
             poke.is_alive = True
             poke.heal(poke.max_hp)
     elif item == "ether" or item == "leppa-berry":
-        poke.restore_pp(move, 10)
+        poke.restore_pp(move.name, 10)
     elif item == "max-ether":
-        poke.restore_pp(move, 999)
+        poke.restore_pp(move.name, 999)
     elif item == "elixir":
         poke.restore_all_pp(10)
     elif item == "max-elixir":
         poke.restore_all_pp(999)
     elif item == "guard-spec.":
         if not trainer.mist:
-            battle.add_text(trainer.name + "'s team became shrouded in mist!")
+            if battle.log_text:
+                battle.add_text(trainer.name + "'s team became shrouded in mist!")
             trainer.mist = 5
     elif item == "dire-hit":
         poke.crit_stage += 2
         if poke.crit_stage > 4:
             poke.crit_stage = 4
-        battle.add_text(poke.nickname + " is getting pumped!")
+        if battle.log_text:
+            battle.add_text(poke.nickname + " is getting pumped!")
     elif item == "x-attack":
         pm.give_stat_change(poke, battle, gs.ATK, 1, forced=True)
     elif item == "x-defense":
@@ -135,26 +183,28 @@ def can_use_item(
     trainer: tr.Trainer,
     battle: bt.Battle,
     item: str,
-    item_target_pos: str,
-    move_target_pos: str = None,
+    item_target_pos: int,
+    move_target_pos: int = None,
 ):
     if not isinstance(item, str) or not item in gd.USABLE_ITEM_CHECK:
         return False
     if (
-        not isinstance(item_target_pos, str)
-        or any([not num.is_digit() for num in item_target_pos])
+        not isinstance(item_target_pos, int)
+        or item_target_pos < 0
         or item_target_pos >= len(trainer.poke_list)
     ):
         return False
-    poke = trainer.poke_list[int(item_target_pos)]
+    poke = trainer.poke_list[item_target_pos]
     if poke.embargo_count:
         return False
-    if move_target_pos and (
-        any([not num.is_digit() for num in move_target_pos])
+    move = None
+    if move_target_pos is not None and (
+        not isinstance(move_target_pos, int)
+        or move_target_pos < 0
         or move_target_pos >= len(poke.moves)
     ):
         return False
-    if move_target_pos:
+    if move_target_pos is not None:
         move = poke.moves[move_target_pos]
 
     if item in gd.HEALING_ITEM_CHECK:
@@ -200,91 +250,21 @@ def damage_calc_items(
     attacker: pk.Pokemon, defender: pk.Pokemon, battle: bt.Battle, move_data: Move
 ):
     if (
-        not attacker.item in gd.DMG_ITEM_CHECK
+        not attacker.item_hooks & gs.ITEM_HOOK_DMG
         or attacker.has_ability("klutz")
         or attacker.embargo_count
     ):
         return
 
+    if attacker.item_boost:
+        species, boost_types, mult = attacker.item_boost
+        if move_data.type in boost_types and (not species or attacker.name in species):
+            move_data.power = int(move_data.power * mult)
+        return
+
     item = attacker.item
 
-    if item == "griseous-orb":
-        if attacker.name == "giratina" and (
-            move_data.type == "dragon" or move_data.type == "ghost"
-        ):
-            move_data.power = int(move_data.power * 1.2)
-    elif item == "adamant-orb":
-        if attacker.name == "dialga" and (
-            move_data.type == "dragon" or move_data.type == "steel"
-        ):
-            move_data.power = int(move_data.power * 1.2)
-    elif item == "lustrous-orb":
-        if attacker.name == "palkia" and (
-            move_data.type == "dragon" or move_data.type == "water"
-        ):
-            move_data.power = int(move_data.power * 1.2)
-    elif item == "silver-powder" or item == "insect-plate":
-        if move_data.type == "bug":
-            move_data.power = int(move_data.power * 1.2)
-    elif item == "soul-dew":
-        if (attacker.name == "latios" or attacker.name == "latias") and (
-            move_data.type == "dragon" or move_data.type == "psychic"
-        ):
-            move_data.power = int(move_data.power * 1.5)
-    elif item == "metal-coat" or item == "iron-plate":
-        if move_data.type == "steel":
-            move_data.power = int(move_data.power * 1.2)
-    elif item == "soft-sand" or item == "earth-plate":
-        if move_data.type == "ground":
-            move_data.power = int(move_data.power * 1.2)
-    elif item == "hard-stone" or item == "stone-plate" or item == "rock-incense":
-        if move_data.type == "rock":
-            move_data.power = int(move_data.power * 1.2)
-    elif item == "miracle-seed" or item == "meadow-plate" or item == "rose-incense":
-        if move_data.type == "grass":
-            move_data.power = int(move_data.power * 1.2)
-    elif item == "blackglasses" or item == "dread-plate":
-        if move_data.type == "dark":
-            move_data.power = int(move_data.power * 1.2)
-    elif item == "black-belt" or item == "fist-plate":
-        if move_data.type == "fighting":
-            move_data.power = int(move_data.power * 1.2)
-    elif item == "magnet" or item == "zap-plate":
-        if move_data.type == "electric":
-            move_data.power = int(move_data.power * 1.2)
-    elif (
-        item == "mystic-water"
-        or item == "sea-incense"
-        or item == "wave-incense"
-        or item == "splash-plate"
-    ):
-        if move_data.type == "water":
-            move_data.power = int(move_data.power * 1.2)
-    elif item == "sharp-beak" or item == "sky-plate":
-        if move_data.type == "flying":
-            move_data.power = int(move_data.power * 1.2)
-    elif item == "poison-barb" or item == "toxic-plate":
-        if move_data.type == "poison":
-            move_data.power = int(move_data.power * 1.2)
-    elif item == "nevermeltice" or item == "icicle-plate":
-        if move_data.type == "ice":
-            move_data.power = int(move_data.power * 1.2)
-    elif item == "spell-tag" or item == "spooky-plate":
-        if move_data.type == "ghost":
-            move_data.power = int(move_data.power * 1.2)
-    elif item == "twistedspoon" or item == "mind-plate" or item == "odd-incense":
-        if move_data.type == "psychic":
-            move_data.power = int(move_data.power * 1.2)
-    elif item == "charcoal" or item == "flame-plate":
-        if move_data.type == "fire":
-            move_data.power = int(move_data.power * 1.2)
-    elif item == "dragon-fang" or item == "draco-plate":
-        if move_data.type == "dragon":
-            move_data.power = int(move_data.power * 1.2)
-    elif item == "silk-scarf":
-        if move_data.type == "normal":
-            move_data.power = int(move_data.power * 1.2)
-    elif item == "muscle-band":
+    if item == "muscle-band":
         if move_data.category == gs.PHYSICAL:
             move_data.power = int(move_data.power * 1.1)
     elif item == "wise-glasses":
@@ -313,7 +293,7 @@ def damage_mult_items(
     i_mult = 1
 
     if (
-        attacker.item not in gd.DMG_MULT_ITEM_CHECK
+        not attacker.item_hooks & gs.ITEM_HOOK_DMG_MULT
         or attacker.has_ability("klutz")
         or attacker.embargo_count
     ):
@@ -341,7 +321,7 @@ def pre_hit_berries(
 
     if (
         not defender.is_alive
-        or not defender.item in gd.PRE_HIT_BERRIES
+        or not defender.item_hooks & gs.ITEM_HOOK_PRE_HIT
         or defender.has_ability("klutz")
         or defender.embargo_count
     ):
@@ -357,7 +337,7 @@ def pre_hit_berries(
 def on_damage_items(poke: pk.Pokemon, battle: bt.Battle, move_data: Move):
     if (
         not poke.is_alive
-        or not poke.item in gd.ON_DAMAGE_ITEM_CHECK
+        or not poke.item_hooks & gs.ITEM_HOOK_ON_DAMAGE
         or poke.has_ability("klutz")
         or poke.embargo_count
     ):
@@ -383,9 +363,10 @@ def on_damage_items(poke: pk.Pokemon, battle: bt.Battle, move_data: Move):
         pm.give_stat_change(poke, battle, gs.SP_DEF, 1)
     elif item == "lansat-berry":
         poke.crit_stage = min(4, poke.crit_stage + 1)
-        battle.add_text(poke.nickname + " is getting pumped!")
+        if battle.log_text:
+            battle.add_text(poke.nickname + " is getting pumped!")
     elif item == "starf-berry":
-        pm.give_stat_change(poke, battle, randrange(1, 6), 2)
+        pm.give_stat_change(poke, battle, battle.rng.randrange(1, 6), 2)
     elif item == "micle-berry":
         poke.next_will_hit = True
     elif item == "custap-berry":
@@ -399,7 +380,7 @@ def on_damage_items(poke: pk.Pokemon, battle: bt.Battle, move_data: Move):
 
 def pre_move_items(poke: pk.Pokemon):
     if (
-        not poke.item in gd.PRE_MOVE_ITEM_CHECK
+        not poke.item_hooks & gs.ITEM_HOOK_PRE_MOVE
         or poke.has_ability("klutz")
         or poke.embargo_count
     ):
@@ -408,14 +389,14 @@ def pre_move_items(poke: pk.Pokemon):
     item = poke.item
 
     if item == "quick-claw":
-        if randrange(5) < 1:
+        if poke.cur_battle.rng.randrange(5) < 1:
             poke.prio_boost = True
 
 
-def stat_calc_items(poke: pk.Pokemon):
+def stat_calc_items(poke: pk.Pokemon, stats: list[int]):
     if (
         not poke.is_alive
-        or not poke.item in gd.STAT_CALC_ITEM_CHECK
+        or not poke.item_hooks & gs.ITEM_HOOK_STAT_CALC
         or poke.has_ability("klutz")
         or poke.embargo_count
     ):
@@ -425,44 +406,55 @@ def stat_calc_items(poke: pk.Pokemon):
 
     if item == "metal-powder":
         if poke.name == "ditto" and not poke.transformed:
-            poke.stats_effective[gs.DEF] *= 2
+            stats[gs.DEF] *= 2
     elif item == "quick-powder":
         if poke.name == "ditto" and not poke.transformed:
-            poke.stats_effective[gs.SPD] *= 2
+            stats[gs.SPD] *= 2
     elif item == "thick-club":
         if poke.name == "cubone" or poke.name == "marowak":
-            poke.stats_effective[gs.ATK] *= 2
+            stats[gs.ATK] *= 2
     elif item == "choice-band":
-        poke.stats_effective[gs.ATK] = int(poke.stats_effective[gs.ATK] * 1.5)
-        if not poke.locked_move and poke.last_successful_move_next:
-            poke.locked_move = poke.last_successful_move_next.name
+        stats[gs.ATK] = int(stats[gs.ATK] * 1.5)
     elif item == "choice-specs":
-        poke.stats_effective[gs.SP_ATK] = int(poke.stats_effective[gs.SP_ATK] * 1.5)
-        if not poke.locked_move and poke.last_successful_move_next:
-            poke.locked_move = poke.last_successful_move_next.name
+        stats[gs.SP_ATK] = int(stats[gs.SP_ATK] * 1.5)
     elif item == "choice-scarf":
-        poke.stats_effective[gs.SPD] = int(poke.stats_effective[gs.SPD] * 1.5)
-        if not poke.locked_move and poke.last_successful_move_next:
-            poke.locked_move = poke.last_successful_move_next.name
+        stats[gs.SPD] = int(stats[gs.SPD] * 1.5)
     elif item == "deepseatooth":
         if poke.name == "clamperl":
-            poke.stats_effective[gs.SP_ATK] *= 2
+            stats[gs.SP_ATK] *= 2
     elif item == "deepseascale":
         if poke.name == "clamperl":
-            poke.stats_effective[gs.SP_DEF] *= 2
+            stats[gs.SP_DEF] *= 2
     elif item == "light-ball":
         if poke.name == "pikachu":
-            poke.stats_effective[gs.ATK] *= 2
-            poke.stats_effective[gs.SP_ATK] *= 2
+            stats[gs.ATK] *= 2
+            stats[gs.SP_ATK] *= 2
+    elif item == "iron-ball":
+        stats[gs.SPD] //= 2
+
+
+def stat_calc_item_effects(poke: pk.Pokemon):
+    if (
+        not poke.is_alive
+        or not poke.item_hooks & gs.ITEM_HOOK_STAT_CALC
+        or poke.has_ability("klutz")
+        or poke.embargo_count
+    ):
+        return
+
+    item = poke.item
+
+    if item == "choice-band" or item == "choice-specs" or item == "choice-scarf":
+        if not poke.locked_move and poke.last_successful_move_next:
+            poke.locked_move = poke.last_successful_move_next.name
     elif item == "iron-ball":
-        poke.stats_effective[gs.SPD] //= 2
         poke.grounded = True
 
 
 def status_items(poke: pk.Pokemon, battle: bt.Battle):
     if (
         not poke.is_alive
-        or not poke.item in gd.STATUS_ITEM_CHECK
+        or not poke.item_hooks & gs.ITEM_HOOK_STATUS
         or poke.has_ability("klutz")
         or poke.embargo_count
     ):
@@ -517,7 +509,7 @@ def on_hit_items(
 ):
     if (
         not move_data
-        or not defender.item in gd.ON_HIT_ITEM_CHECK
+        or not defender.item_hooks & gs.ITEM_HOOK_ON_HIT
         or defender.has_ability("klutz")
         or defender.embargo_count
     ):
@@ -536,13 +528,14 @@ def on_hit_items(
             attacker.take_damage(max(1, attacker.max_hp // 8))
     elif item == "sticky-barb":
         if (
-            move_data.name in gd.CONTACT_CHECK
+            move_data.flags & gs.MF_CONTACT
             and attacker.is_alive
             and not attacker.item
         ):
-            battle.add_text(
-                attacker.nickname + " received " + defender.nickname + "'s Sticky Barb!"
-            )
+            if battle.log_text:
+                battle.add_text(
+                    attacker.nickname + " received " + defender.nickname + "'s Sticky Barb!"
+                )
             attacker.give_item("sticky-barb")
 
 
@@ -557,11 +550,11 @@ def homc_items(
     i_mult = 1
 
     if (
-        not defender.item in gd.HOMC_ITEM_CHECK
+        not defender.item_hooks & gs.ITEM_HOOK_HOMC
         or defender.has_ability("klutz")
         or defender.embargo_count
     ) and (
-        not attacker.item in gd.HOMC_ITEM_CHECK
+        not attacker.item_hooks & gs.ITEM_HOOK_HOMC
         or attacker.has_ability("klutz")
         or attacker.embargo_count
     ):
@@ -581,7 +574,7 @@ def homc_items(
 def end_turn_items(poke: pk.Pokemon, battle: bt.Battle):
     if (
         not poke.is_alive
-        or not poke.item in gd.END_TURN_ITEM_CHECK
+        or not poke.item_hooks & gs.ITEM_HOOK_END_TURN
         or poke.has_ability("klutz")
         or poke.embargo_count
     ):
@@ -634,18 +627,21 @@ def end_turn_items(poke: pk.Pokemon, battle: bt.Battle):
                 pm.confuse(poke, battle)
     elif item == "leftovers":
         if not poke.cur_hp == poke.max_hp:
-            battle.add_text(
-                poke.nickname + " restored a little HP using its Leftovers!"
-            )
+            if battle.log_text:
+                battle.add_text(
+                    poke.nickname + " restored a little HP using its Leftovers!"
+                )
             poke.heal(max(1, poke.max_hp // 16), text_skip=True)
     elif item == "black-sludge":
         if "poison" in poke.types:
-            battle.add_text(
-                poke.nickname + " restored a little HP using its Black Sludge!"
-            )
+            if battle.log_text:
+                battle.add_text(
+                    poke.nickname + " restored a little HP using its Black Sludge!"
+                )
             poke.heal(max(1, poke.max_hp // 16), text_skip=True)
         elif not poke.has_ability("magic-guard"):
-            battle.add_text(poke.nickname + " was hurt by its Black Sludge!")
+            if battle.log_text:
+                battle.add_text(poke.nickname + " was hurt by its Black Sludge!")
             poke.take_damage(max(1, poke.max_hp // 8))
     elif item == "toxic-orb":
         if not poke.nv_status:
@@ -654,13 +650,14 @@ def end_turn_items(poke: pk.Pokemon, battle: bt.Battle):
         if not poke.nv_status:
             pm.give_nv_status(gs.BURNED, poke, battle)
     elif item == "sticky-barb":
-        battle.add_text(poke.nickname + " was hurt by its Sticky Barb!")
+        if battle.log_text:
+            battle.add_text(poke.nickname + " was hurt by its Sticky Barb!")
         poke.take_damage(max(1, poke.max_hp // 8))
 
 
 def post_damage_items(attacker: pk.Pokemon, battle: bt.Battle, dmg: int):
     if (
-        attacker.item not in gd.POST_DAMAGE_ITEM_CHECK
+        not attacker.item_hooks & gs.ITEM_HOOK_POST_DAMAGE
         or attacker.has_ability("klutz")
         or attacker.embargo_count
     ):
@@ -668,20 +665,24 @@ def post_damage_items(attacker: pk.Pokemon, battle: bt.Battle, dmg: int):
 
     if attacker.item == "shell-bell":
         if attacker.is_alive and dmg:
-            battle.add_text(
-                attacker.nickname + " restored a little HP using its Shell Bell!"
-            )
+            if battle.log_text:
+                battle.add_text(
+                    attacker.nickname + " restored a little HP using its Shell Bell!"
+                )
             attacker.heal(max(1, dmg // 8), text_skip=True)
     if attacker.item == "life-orb":
         if attacker.is_alive and dmg:
-            battle.add_text(attacker.nickname + " lost some of its HP!")
+            if battle.log_text:
+                battle.add_text(attacker.nickname + " lost some of its HP!")
             attacker.take_damage(max(1, attacker.max_hp // 10))
 
 
 def _consume_item(poke: pk.Pokemon, battle: bt.Battle):
-    battle.add_text(poke.nickname + " used its " + pm.cap_name(poke.item) + "!")
+    if battle.log_text:
+        battle.add_text(poke.nickname + " used its " + pm.cap_name(poke.item) + "!")
 
 
 def _eat_item(poke: pk.Pokemon, battle: bt.Battle):
-    battle.add_text(poke.nickname + " ate its " + pm.cap_name(poke.item) + "!")
+    if battle.log_text:
+        battle.add_text(poke.nickname + " ate its " + pm.cap_name(poke.item) + "!")
     poke.give_item(None)
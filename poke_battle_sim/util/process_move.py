@@ -1,5 +1,4 @@
 from __future__ import annotations
-from random import randrange
 
 from poke_battle_sim.poke_sim import PokeSim
 from poke_battle_sim.core.move import Move
@@ -25,7 +24,10 @@ def process_move(
 ):
     if _pre_process_status(attacker, defender, battlefield, battle, move_data):
         return
-    battle.add_text(attacker.nickname + " used " + cap_name(move_data.name) + "!")
+    if battle.log_text:
+        battle.add_text(attacker.nickname + " used " + cap_name(move_data.name) + "!")
+    if battle.log_events:
+        battle.add_event(gs.EVENT_MOVE, attacker, move_data.id)
     battle.last_move_next = attacker.last_move_next = move_data
     if not _calculate_hit_or_miss(
         attacker, defender, battlefield, battle, move_data, is_first
@@ -64,6 +66,8 @@ def _calculate_type_ef(defender: pk.Pokemon, move_data: Move) -> float:
     if defender.me_target and move_data.type == "psychic" and "dark" in defender.types:
         vulnerable_types.append("dark")
 
+    if not vulnerable_types:
+        return PokeSim.get_types_ef(move_data.type_id, defender.types_id)
     if defender.types[0] in vulnerable_types:
         t_mult = 1
     else:
@@ -99,7 +103,10 @@ def _calculate_damage(
         return
     t_mult = _calculate_type_ef(defender, move_data)
     if not skip_txt and not t_mult or (t_mult < 2 and defender.has_ability("wonder-guard")):
-        battle.add_text("It doesn't affect " + defender.nickname)
+        if battle.log_text:
+            battle.add_text("It doesn't affect " + defender.nickname)
+        if battle.log_events:
+            battle.add_event(gs.EVENT_EFFECTIVENESS, defender, 0)
         return
     if pa.type_protection_abilities(defender, move_data, battle):
         return
@@ -115,17 +122,26 @@ def _calculate_damage(
         not defender.trainer.lucky_chant
         and not defender.has_ability("battle-armor")
         and not defender.has_ability("shell-armor")
-        and _calculate_crit(cc)
+        and _calculate_crit(battle, cc)
     ):
         crit_mult = 2 if not attacker.has_ability("sniper") else 3
-        battle.add_text("A critical hit!")
+        if battle.log_text:
+            battle.add_text("A critical hit!")
+        if battle.log_events:
+            battle.add_event(gs.EVENT_CRIT, defender)
     else:
         crit_mult = 1
 
     if not skip_txt and t_mult < 1:
-        battle.add_text("It's not very effective...")
+        if battle.log_text:
+            battle.add_text("It's not very effective...")
     elif not skip_txt and t_mult > 1:
-        battle.add_text("It's super effective!")
+        if battle.log_text:
+            battle.add_text("It's super effective!")
+    if not skip_txt and t_mult != 1 and battle.log_events:
+        battle.add_event(
+            gs.EVENT_EFFECTIVENESS, defender, int(t_mult * gs.EFFECTIVENESS_SCALE)
+        )
 
     attacker.calculate_stats_effective(ignore_stats=defender.has_ability("unaware"))
     defender.calculate_stats_effective(ignore_stats=attacker.has_ability("unaware"))
@@ -178,7 +194,7 @@ def _calculate_damage(
         stab = 1.5 if not attacker.has_ability("adaptability") else 2
     else:
         stab = 1
-    random_mult = randrange(85, 101) / 100
+    random_mult = battle.rng.randrange(gs.DAMAGE_ROLL_MIN, gs.DAMAGE_ROLL_MAX + 1) / 100
 
     berry_mult = pi.pre_hit_berries(attacker, defender, battle, move_data, t_mult)
     item_mult = pi.damage_mult_items(attacker, defender, battle, move_data, t_mult)
@@ -199,7 +215,8 @@ def _calculate_damage(
         and defender.has_ability("anger-point")
         and defender.stat_stages[gs.ATK] < 6
     ):
-        battle.add_text(defender.nickname + " maxed it's Attack!")
+        if battle.log_text:
+            battle.add_text(defender.nickname + " maxed it's Attack!")
         defender.stat_stages[gs.ATK] = 6
     pi.post_damage_items(attacker, battle, damage_done)
     return damage_done
@@ -243,15 +260,16 @@ def _calculate_hit_or_miss(
         return True
 
     if ma == -1:
-        res = randrange(1, 101) <= attacker.level - defender.level + 30
+        res = battle.rng.randrange(1, 101) <= attacker.level - defender.level + 30
     else:
         hit_threshold = (
             ma * stage_mult * battlefield.acc_modifier * item_mult * ability_mult
         )
-        res = randrange(1, 101) <= hit_threshold
+        res = battle.rng.randrange(1, 101) <= hit_threshold
     if not res:
         if defender.evasion_stage > 0:
-            battle.add_text(defender.nickname + " avoided the attack!")
+            if battle.log_text:
+                battle.add_text(defender.nickname + " avoided the attack!")
         else:
             _missed(attacker, battle)
     return res
@@ -311,19 +329,19 @@ def _process_effect(
         )
 
 
-def _calculate_crit(crit_chance: int = None) -> bool:
+def _calculate_crit(battle: bt.Battle, crit_chance: int = None) -> bool:
     if not crit_chance:
-        return randrange(16) < 1
+        return battle.rng.randrange(16) < 1
     elif crit_chance == 1:
-        return randrange(9) < 1
+        return battle.rng.randrange(9) < 1
     elif crit_chance == 2:
-        return randrange(5) < 1
+        return battle.rng.randrange(5) < 1
     elif crit_chance == 3:
-        return randrange(4) < 1
+        return battle.rng.randrange(4) < 1
     elif crit_chance == 4:
-        return randrange(3) < 1
+        return battle.rng.randrange(3) < 1
     else:
-        return randrange(1000) < crit_chance
+        return battle.rng.randrange(1000) < crit_chance
 
 
 def _invulnerability_check(
@@ -360,10 +378,11 @@ def _pre_process_status(
     if attacker.prio_boost:
         attacker.prio_boost = False
     if attacker.nv_status == gs.FROZEN:
-        if move_data.name in gd.FREEZE_CHECK or randrange(5) < 1:
+        if move_data.flags & gs.MF_FREEZE or battle.rng.randrange(5) < 1:
             cure_nv_status(gs.FROZEN, attacker, battle)
         else:
-            battle.add_text(attacker.nickname + " is frozen solid!")
+            if battle.log_text:
+                battle.add_text(attacker.nickname + " is frozen solid!")
             return True
     if attacker.nv_status == gs.ASLEEP:
         if not attacker.nv_counter:
@@ -373,42 +392,51 @@ def _pre_process_status(
         if attacker.nv_counter and attacker.has_ability("early-bird"):
             attacker.nv_counter -= 1
         if attacker.nv_counter > 0:
-            battle.add_text(attacker.nickname + " is fast asleep!")
+            if battle.log_text:
+                battle.add_text(attacker.nickname + " is fast asleep!")
             if move_data.name != "snore" and move_data.name != "sleep-talk":
                 return True
-        battle.add_text(attacker.nickname + " woke up!")
+        if battle.log_text:
+            battle.add_text(attacker.nickname + " woke up!")
     if attacker.v_status[gs.FLINCHED]:
         attacker.v_status[gs.FLINCHED] = 0
-        battle.add_text(attacker.nickname + " flinched and couldn't move")
+        if battle.log_text:
+            battle.add_text(attacker.nickname + " flinched and couldn't move")
         if attacker.has_ability("steadfast"):
             give_stat_change(attacker, battle, gs.ATK, 1)
         return True
     if attacker.nv_status == gs.PARALYZED:
-        if randrange(4) < 1:
-            battle.add_text(attacker.nickname + " is paralyzed! It can't move!")
+        if battle.rng.randrange(4) < 1:
+            if battle.log_text:
+                battle.add_text(attacker.nickname + " is paralyzed! It can't move!")
             return True
     if attacker.infatuation:
         if not attacker.infatuation is defender:
             attacker.infatuation = None
-            battle.add_text(attacker.nickname + " got over its infatuation!")
-        elif randrange(2) < 1:
-            battle.add_text(attacker.nickname + " is immobilized by love!")
+            if battle.log_text:
+                battle.add_text(attacker.nickname + " got over its infatuation!")
+        elif battle.rng.randrange(2) < 1:
+            if battle.log_text:
+                battle.add_text(attacker.nickname + " is immobilized by love!")
             return True
     if attacker.v_status[gs.CONFUSED]:
         attacker.v_status[gs.CONFUSED] -= 1
         if attacker.v_status[gs.CONFUSED]:
-            battle.add_text(attacker.nickname + " is confused!")
-            if randrange(2) < 1:
-                battle.add_text("It hurt itself in its confusion!")
+            if battle.log_text:
+                battle.add_text(attacker.nickname + " is confused!")
+            if battle.rng.randrange(2) < 1:
+                if battle.log_text:
+                    battle.add_text("It hurt itself in its confusion!")
                 self_attack = Move(
-                    [0, "self-attack", 1, "typeless", 40, 1, 999, 0, 10, 2, 1, "", "", ""]
+                    [0, "self-attack", 1, "typeless", 40, 1, 999, 0, 10, 2, 1, "", "", "", 0]
                 )
                 _calculate_damage(
                     attacker, attacker, battlefield, battle, self_attack, crit_chance=0
                 )
                 return True
         else:
-            battle.add_text(attacker.nickname + " snapped out of its confusion!")
+            if battle.log_text:
+                battle.add_text(attacker.nickname + " snapped out of its confusion!")
     return False
 
 
@@ -422,8 +450,8 @@ def _post_process_status(
     _mold_breaker_check(attacker, defender)
 
 
-def _generate_2_to_5() -> int:
-    n = randrange(8)
+def _generate_2_to_5(battle: bt.Battle) -> int:
+    n = battle.rng.randrange(8)
     if n < 3:
         num_hits = 2
     elif n < 6:
@@ -451,10 +479,12 @@ def confuse(
     if not forced and not bypass and recipient.has_ability("shield-dust"):
         return
     if forced and recipient.v_status[gs.CONFUSED]:
-        battle.add_text(recipient.nickname + " is already confused!")
+        if battle.log_text:
+            battle.add_text(recipient.nickname + " is already confused!")
         return
-    recipient.v_status[gs.CONFUSED] = _generate_2_to_5()
-    battle.add_text(recipient.nickname + " became confused!")
+    recipient.v_status[gs.CONFUSED] = _generate_2_to_5(battle)
+    if battle.log_text:
+        battle.add_text(recipient.nickname + " became confused!")
     pi.status_items(recipient, battle)
 
 
@@ -471,9 +501,10 @@ def _flinch(
         if not recipient.has_ability("inner-focus"):
             recipient.v_status[gs.FLINCHED] = 1
         elif forced:
-            battle.add_text(
-                recipient.nickname + " won't flinch because of its Inner Focus!"
-            )
+            if battle.log_text:
+                battle.add_text(
+                    recipient.nickname + " won't flinch because of its Inner Focus!"
+                )
 
 
 def infatuate(
@@ -491,9 +522,10 @@ def infatuate(
         attacker.gender == "female" and defender.gender == "male"
     ):
         defender.infatuation = attacker
-        battle.add_text(
-            defender.nickname + " fell in love with " + attacker.nickname + "!"
-        )
+        if battle.log_text:
+            battle.add_text(
+                defender.nickname + " fell in love with " + attacker.nickname + "!"
+            )
         pi.status_items(defender, battle)
 
 
@@ -550,7 +582,8 @@ def give_stat_change(
             recipient.stat_stages[stat] + amount
         )
     if -6 < r_stat < 6 or forced:
-        battle.add_text(_stat_text(recipient, stat, amount))
+        if battle.log_text:
+            battle.add_text(_stat_text(recipient, stat, amount))
     return
 
 
@@ -633,11 +666,15 @@ def burn(recipient: pk.Pokemon, battle: bt.Battle, forced: bool = False):
     if not forced and recipient.has_ability("shield-dust"):
         return
     if forced and recipient.nv_status == gs.BURNED:
-        battle.add_text(recipient.nickname + " is already burned!")
+        if battle.log_text:
+            battle.add_text(recipient.nickname + " is already burned!")
     elif not recipient.nv_status:
         recipient.nv_status = gs.BURNED
         recipient.nv_counter = 0
-        battle.add_text(recipient.nickname + " was burned!")
+        if battle.log_text:
+            battle.add_text(recipient.nickname + " was burned!")
+        if battle.log_events:
+            battle.add_event(gs.EVENT_STATUS, recipient, gs.BURNED)
         if recipient.has_ability("synchronize"):
             burn(recipient.enemy.current_poke, battle)
         pi.status_items(recipient, battle)
@@ -665,11 +702,15 @@ def freeze(recipient: pk.Pokemon, battle: bt.Battle, forced: bool = False):
     if not forced and recipient.has_ability("shield-dust"):
         return
     if forced and recipient.nv_status == gs.FROZEN:
-        battle.add_text(recipient.nickname + " is already frozen!")
+        if battle.log_text:
+            battle.add_text(recipient.nickname + " is already frozen!")
     elif not recipient.nv_status:
         recipient.nv_status = gs.FROZEN
         recipient.nv_counter = 0
-        battle.add_text(recipient.nickname + " was frozen solid!")
+        if battle.log_text:
+            battle.add_text(recipient.nickname + " was frozen solid!")
+        if battle.log_events:
+            battle.add_event(gs.EVENT_STATUS, recipient, gs.FROZEN)
         if recipient.has_ability("synchronize"):
             freeze(recipient.enemy.current_poke, battle)
         pi.status_items(recipient, battle)
@@ -693,11 +734,15 @@ def paralyze(recipient: pk.Pokemon, battle: bt.Battle, forced: bool = False):
     if not forced and recipient.has_ability("shield-dust"):
         return
     if forced and recipient.nv_status == gs.PARALYZED:
-        battle.add_text(recipient.nickname + " is already paralyzed!")
+        if battle.log_text:
+            battle.add_text(recipient.nickname + " is already paralyzed!")
     elif not recipient.nv_status:
         recipient.nv_status = gs.PARALYZED
         recipient.nv_counter = 0
-        battle.add_text(recipient.nickname + " is paralyzed! It may be unable to move!")
+        if battle.log_text:
+            battle.add_text(recipient.nickname + " is paralyzed! It may be unable to move!")
+        if battle.log_events:
+            battle.add_event(gs.EVENT_STATUS, recipient, gs.PARALYZED)
         if recipient.has_ability("synchronize"):
             paralyze(recipient.enemy.current_poke, battle)
         pi.status_items(recipient, battle)
@@ -721,11 +766,15 @@ def poison(recipient: pk.Pokemon, battle: bt.Battle, forced: bool = False):
     if not forced and recipient.has_ability("shield-dust"):
         return
     if forced and recipient.nv_status == gs.POISONED:
-        battle.add_text(recipient.nickname + " is already poisoned!")
+        if battle.log_text:
+            battle.add_text(recipient.nickname + " is already poisoned!")
     elif not recipient.nv_status:
         recipient.nv_status = gs.POISONED
         recipient.nv_counter = 0
-        battle.add_text(recipient.nickname + " was poisoned!")
+        if battle.log_text:
+            battle.add_text(recipient.nickname + " was poisoned!")
+        if battle.log_events:
+            battle.add_event(gs.EVENT_STATUS, recipient, gs.POISONED)
         if recipient.has_ability("synchronize"):
             poison(recipient.enemy.current_poke, battle)
         pi.status_items(recipient, battle)
@@ -750,11 +799,15 @@ def sleep(recipient: pk.Pokemon, battle: bt.Battle, forced: bool = False):
     if not forced and recipient.has_ability("shield-dust"):
         return
     if forced and recipient.nv_status == gs.ASLEEP:
-        battle.add_text(recipient.nickname + " is already asleep!")
+        if battle.log_text:
+            battle.add_text(recipient.nickname + " is already asleep!")
     elif not recipient.nv_status:
         recipient.nv_status = gs.ASLEEP
-        recipient.nv_counter = randrange(2, 6)
-        battle.add_text(recipient.nickname + " fell asleep!")
+        recipient.nv_counter = battle.rng.randrange(2, 6)
+        if battle.log_text:
+            battle.add_text(recipient.nickname + " fell asleep!")
+        if battle.log_events:
+            battle.add_event(gs.EVENT_STATUS, recipient, gs.ASLEEP)
         if recipient.has_ability("synchronize"):
             sleep(recipient.enemy.current_poke, battle)
         pi.status_items(recipient, battle)
@@ -778,11 +831,15 @@ def badly_poison(recipient: pk.Pokemon, battle: bt.Battle, forced: bool = False)
     if not forced and recipient.has_ability("shield-dust"):
         return
     if forced and recipient.nv_status == gs.BADLY_POISONED:
-        battle.add_text(recipient.nickname + " is already badly poisoned!")
+        if battle.log_text:
+            battle.add_text(recipient.nickname + " is already badly poisoned!")
     elif not recipient.nv_status:
         recipient.nv_status = gs.BADLY_POISONED
         recipient.nv_counter = 1
-        battle.add_text(recipient.nickname + " was badly poisoned!")
+        if battle.log_text:
+            battle.add_text(recipient.nickname + " was badly poisoned!")
+        if battle.log_events:
+            battle.add_event(gs.EVENT_STATUS, recipient, gs.BADLY_POISONED)
         if recipient.has_ability("synchronize"):
             poison(recipient.enemy.current_poke, battle)
         pi.status_items(recipient, battle)
@@ -807,19 +864,24 @@ def cure_nv_status(status: int, recipient: pk.Pokemon, battle: bt.Battle):
         text = " was cured of poison!"
 
     recipient.nv_status = 0
-    battle.add_text(recipient.nickname + text)
+    if battle.log_text:
+        battle.add_text(recipient.nickname + text)
+    if battle.log_events:
+        battle.add_event(gs.EVENT_CURE, recipient, status)
 
 
 def cure_confusion(recipient: pk.Pokemon, battle: bt.Battle):
     if recipient.is_alive and recipient.v_status[gs.CONFUSED]:
         recipient.v_status[gs.CONFUSED] = 0
-        battle.add_text(recipient.nickname + " snapped out of its confusion!")
+        if battle.log_text:
+            battle.add_text(recipient.nickname + " snapped out of its confusion!")
 
 
 def cure_infatuation(recipient: pk.Pokemon, battle: bt.Battle):
     if recipient.is_alive and recipient.infatuation:
         recipient.infatuation = None
-        battle.add_text(recipient.nickname + " got over its infatuation!")
+        if battle.log_text:
+            battle.add_text(recipient.nickname + " got over its infatuation!")
 
 
 def _magic_coat_check(
@@ -833,14 +895,15 @@ def _magic_coat_check(
     if (
         defender.is_alive
         and defender.magic_coat
-        and move_data.name in gd.MAGIC_COAT_CHECK
+        and move_data.flags & gs.MF_MAGIC_COAT
     ):
-        battle.add_text(
-            attacker.nickname
-            + "'s "
-            + move_data.name
-            + " was bounced back by Magic Coat!"
-        )
+        if battle.log_text:
+            battle.add_text(
+                attacker.nickname
+                + "'s "
+                + move_data.name
+                + " was bounced back by Magic Coat!"
+            )
         _process_effect(defender, attacker, battlefield, battle, move_data, is_first)
         return True
     return False
@@ -854,10 +917,11 @@ def _snatch_check(
     move_data: Move,
     is_first: bool,
 ) -> bool:
-    if defender.is_alive and defender.snatch and move_data.name in gd.SNATCH_CHECK:
-        battle.add_text(
-            defender.nickname + " snatched " + attacker.nickname + "'s move!"
-        )
+    if defender.is_alive and defender.snatch and move_data.flags & gs.MF_SNATCH:
+        if battle.log_text:
+            battle.add_text(
+                defender.nickname + " snatched " + attacker.nickname + "'s move!"
+            )
         _process_effect(defender, attacker, battlefield, battle, move_data, is_first)
         return True
     return False
@@ -870,7 +934,8 @@ def _protect_check(defender: pk.Pokemon, battle: bt.Battle, move_data: Move) ->
         and not move_data.name in ["feint", "shadow-force"]
         and move_data.target in gd.PROTECT_TARGETS
     ):
-        battle.add_text(defender.nickname + " protected itself!")
+        if battle.log_text:
+            battle.add_text(defender.nickname + " protected itself!")
         return True
     return False
 
@@ -879,15 +944,16 @@ def _soundproof_check(defender: pk.Pokemon, battle: bt.Battle, move_data: Move)
     if (
         defender.is_alive
         and defender.has_ability("soundproof")
-        and move_data in gd.SOUNDPROOF_CHECK
+        and move_data.flags & gs.MF_SOUNDPROOF
     ):
-        battle.add_text("It doesn't affect " + defender.nickname)
+        if battle.log_text:
+            battle.add_text("It doesn't affect " + defender.nickname)
         return True
     return False
 
 
 def _grounded_check(attacker: pk.Pokemon, battle: bt.Battle, move_data: Move) -> bool:
-    if attacker.grounded and move_data.name in gd.GROUNDED_CHECK:
+    if attacker.grounded and move_data.flags & gs.MF_GROUNDED:
         _failed(battle)
         return True
     return False
@@ -899,7 +965,8 @@ def _truant_check(attacker: pk.Pokemon, battle: bt.Battle, move_data: Move) -> b
         and attacker.last_move
         and move_data.name == attacker.last_move.name
     ):
-        battle.add_text(attacker.nickname + " loafed around!")
+        if battle.log_text:
+            battle.add_text(attacker.nickname + " loafed around!")
         return True
     return False
 
@@ -914,10 +981,10 @@ def _extra_flinch_check(
 ):
     if attacker.item == "king's-rock" or attacker.item == "razor-fang":
         if (
-            move_data in gd.EXTRA_FLINCH_CHECK
+            move_data.flags & gs.MF_EXTRA_FLINCH
             and not defender.v_status[gs.FLINCHED]
             and is_first
-            and randrange(10) < 1
+            and battle.rng.randrange(10) < 1
         ):
             _flinch(defender, battle, is_first)
 
@@ -937,9 +1004,10 @@ def _mold_breaker_check(
 
 def _power_herb_check(attacker: pk.Pokemon, battle: bt.Battle) -> bool:
     if attacker.item == "power-herb":
-        battle.add_text(
-            attacker.nickname + " became fully charged due to its Power Herb!"
-        )
+        if battle.log_text:
+            battle.add_text(
+                attacker.nickname + " became fully charged due to its Power Herb!"
+            )
         attacker.give_item(None)
         return True
     return False
@@ -963,10 +1031,11 @@ def _special_move_acc(
 def _recoil(attacker: pk.Pokemon, battle: bt.Battle, damage: int, move_data: Move):
     if not attacker.is_alive or not damage:
         return
-    if attacker.has_ability("rock-head") and move_data.name in gd.RECOIL_CHECK:
+    if attacker.has_ability("rock-head") and move_data.flags & gs.MF_RECOIL:
         return
     attacker.take_damage(damage)
-    battle.add_text(attacker.nickname + " is hit with recoil!")
+    if battle.log_text:
+        battle.add_text(attacker.nickname + " is hit with recoil!")
 
 
 def cap_name(move_name: str) -> str:
@@ -977,16 +1046,23 @@ def cap_name(move_name: str) -> str:
 
 
 def _failed(battle: bt.Battle):
-    battle.add_text("But, it failed!")
+    if battle.log_text:
+        battle.add_text("But, it failed!")
+    if battle.log_events:
+        battle.add_event(gs.EVENT_FAIL)
 
 
 def _missed(attacker: pk.Pokemon, battle: bt.Battle):
-    battle.add_text(attacker.nickname + "'s attack missed!")
+    if battle.log_text:
+        battle.add_text(attacker.nickname + "'s attack missed!")
+    if battle.log_events:
+        battle.add_event(gs.EVENT_MISS, attacker)
 
 
 def _safeguard_check(poke: pk.Pokemon, battle: bt.Battle) -> bool:
     if poke.trainer.safeguard:
-        battle.add_text(poke.nickname + " is protected by Safeguard!")
+        if battle.log_text:
+            battle.add_text(poke.nickname + " is protected by Safeguard!")
         return True
     return False
 
@@ -1027,7 +1103,7 @@ def _ef_002(
     cc_ib: list,
 ) -> bool:
     dmg = _calculate_damage(attacker, defender, battlefield, battle, move_data)
-    if attacker.is_alive and dmg and randrange(1, 101) < move_data.ef_chance:
+    if attacker.is_alive and dmg and battle.rng.randrange(1, 101) < move_data.ef_chance:
         give_stat_change(
             attacker, battle, move_data.ef_stat, move_data.ef_amount, bypass=True
         )
@@ -1044,7 +1120,7 @@ def _ef_003(
     cc_ib: list,
 ) -> bool:
     dmg = _calculate_damage(attacker, defender, battlefield, battle, move_data)
-    if defender.is_alive and dmg and randrange(1, 101) < move_data.ef_chance:
+    if defender.is_alive and dmg and battle.rng.randrange(1, 101) < move_data.ef_chance:
         give_stat_change(defender, battle, move_data.ef_stat, move_data.ef_amount)
     return True
 
@@ -1059,7 +1135,7 @@ def _ef_004(
     cc_ib: list,
 ) -> bool:
     dmg = _calculate_damage(attacker, defender, battlefield, battle, move_data)
-    if attacker.is_alive and dmg and randrange(1, 101) < move_data.ef_chance:
+    if attacker.is_alive and dmg and battle.rng.randrange(1, 101) < move_data.ef_chance:
         give_nv_status(move_data.ef_stat, attacker, battle)
     return True
 
@@ -1074,7 +1150,7 @@ def _ef_005(
     cc_ib: list,
 ) -> bool:
     dmg = _calculate_damage(attacker, defender, battlefield, battle, move_data)
-    if defender.is_alive and dmg and randrange(1, 101) < move_data.ef_chance:
+    if defender.is_alive and dmg and battle.rng.randrange(1, 101) < move_data.ef_chance:
         give_nv_status(move_data.ef_stat, defender, battle)
     return True
 
@@ -1089,7 +1165,7 @@ def _ef_006(
     cc_ib: list,
 ) -> bool:
     dmg = _calculate_damage(attacker, defender, battlefield, battle, move_data)
-    if defender.is_alive and dmg and randrange(1, 101) < move_data.ef_chance:
+    if defender.is_alive and dmg and battle.rng.randrange(1, 101) < move_data.ef_chance:
         confuse(defender, battle)
     return True
 
@@ -1104,7 +1180,7 @@ def _ef_007(
     cc_ib: list,
 ) -> bool:
     dmg = _calculate_damage(attacker, defender, battlefield, battle, move_data)
-    if defender.is_alive and dmg and randrange(1, 101) < move_data.ef_chance:
+    if defender.is_alive and dmg and battle.rng.randrange(1, 101) < move_data.ef_chance:
         _flinch(defender, battle, is_first)
     return True
 
@@ -1151,7 +1227,7 @@ def _ef_010(
     if not defender.is_alive:
         _missed(attacker, battle)
     if not attacker.has_ability("skill-link"):
-        num_hits = _generate_2_to_5()
+        num_hits = _generate_2_to_5(battle)
     else:
         num_hits = 5
     nh = num_hits
@@ -1165,7 +1241,8 @@ def _ef_010(
             attacker, defender, battlefield, battle, move_data, skip_fc=True, skip_txt=True
         )
         nh -= 1
-    battle.add_text("Hit " + str(num_hits) + " time(s)!")
+    if battle.log_text:
+        battle.add_text("Hit " + str(num_hits) + " time(s)!")
     return True
 
 
@@ -1188,9 +1265,11 @@ def _ef_011(
             attacker, defender, battlefield, battle, move_data, skip_fc=True, skip_txt=True
         )
     else:
-        battle.add_text("Hit 1 time(s)!")
+        if battle.log_text:
+            battle.add_text("Hit 1 time(s)!")
         return True
-    battle.add_text("Hit 2 time(s)!")
+    if battle.log_text:
+        battle.add_text("Hit 2 time(s)!")
     return True
 
 
@@ -1242,7 +1321,8 @@ def _ef_017(
     cc_ib: list,
 ) -> bool:
     if defender.is_alive and defender.trainer.mist:
-        battle.add_text(defender.nickname + "'s protected by mist.")
+        if battle.log_text:
+            battle.add_text(defender.nickname + "'s protected by mist.")
         return True
     give_stat_change(defender, battle, move_data.ef_stat, move_data.ef_amount)
 
@@ -1273,7 +1353,7 @@ def _ef_019(
     if defender.minimized:
         move_data.power *= 2
     dmg = _calculate_damage(attacker, defender, battlefield, battle, move_data)
-    if dmg and randrange(10) < 3:
+    if dmg and battle.rng.randrange(10) < 3:
         _flinch(defender, battle, is_first)
 
 
@@ -1289,14 +1369,17 @@ def _ef_020(
     if not defender.is_alive:
         _missed(attacker, battle)
     if defender.has_ability("sturdy"):
-        battle.add_text(defender.nickname + " endured the hit!")
+        if battle.log_text:
+            battle.add_text(defender.nickname + " endured the hit!")
         return True
     if _calculate_type_ef(defender, move_data) != 0:
         defender.take_damage(65535, move_data)
         if not defender.is_alive:
-            battle.add_text("It's a one-hit KO!")
+            if battle.log_text:
+                battle.add_text("It's a one-hit KO!")
     else:
-        battle.add_text("It doesn't affect " + defender.nickname)
+        if battle.log_text:
+            battle.add_text("It doesn't affect " + defender.nickname)
     return True
 
 
@@ -1311,8 +1394,9 @@ def _ef_021(
 ) -> bool:
     if not move_data.ef_stat and not _power_herb_check(attacker, battle):
         move_data.ef_stat = 1
-        attacker.next_moves.put(move_data)
-        battle.add_text(attacker.nickname + " whipped up a whirlwind!")
+        attacker.next_moves.append(move_data)
+        if battle.log_text:
+            battle.add_text(attacker.nickname + " whipped up a whirlwind!")
         return True
     cc_ib[0] = 1
 
@@ -1342,12 +1426,13 @@ def _ef_023(
 ) -> bool:
     if not move_data.ef_stat and not _power_herb_check(attacker, battle):
         move_data.ef_stat = 1
-        attacker.next_moves.put(move_data)
+        attacker.next_moves.append(move_data)
         attacker.in_air = True
         attacker.invulnerable = True
         attacker.inv_count = 1
         battle._pop_text()
-        battle.add_text(attacker.nickname + " flew up high!")
+        if battle.log_text:
+            battle.add_text(attacker.nickname + " flew up high!")
         return True
 
 
@@ -1368,34 +1453,41 @@ def _ef_024(
         and not defender.v_status[gs.BINDING_COUNT]
     ):
         defender.v_status[gs.BINDING_COUNT] = (
-            _generate_2_to_5() if attacker.item != "grip-claw" else 5
+            _generate_2_to_5(battle) if attacker.item != "grip-claw" else 5
         )
         defender.binding_poke = attacker
         if move_data.ef_stat == gs.BIND:
             defender.binding_type = "Bind"
-            battle.add_text(
-                defender.nickname + " was squeezed by " + attacker.nickname + "!"
-            )
+            if battle.log_text:
+                battle.add_text(
+                    defender.nickname + " was squeezed by " + attacker.nickname + "!"
+                )
         elif move_data.ef_stat == gs.WRAP:
             defender.binding_type = "Wrap"
-            battle.add_text(
-                defender.nickname + " was wrapped by " + attacker.nickname + "!"
-            )
+            if battle.log_text:
+                battle.add_text(
+                    defender.nickname + " was wrapped by " + attacker.nickname + "!"
+                )
         elif move_data.ef_stat == gs.FIRE_SPIN:
             defender.binding_type = "Fire Spin"
-            battle.add_text(defender.nickname + " was trapped in the vortex!")
+            if battle.log_text:
+                battle.add_text(defender.nickname + " was trapped in the vortex!")
         elif move_data.ef_stat == gs.CLAMP:
             defender.binding_type = "Clamp"
-            battle.add_text(attacker.nickname + " clamped " + defender.nickname + "!")
+            if battle.log_text:
+                battle.add_text(attacker.nickname + " clamped " + defender.nickname + "!")
         elif move_data.ef_stat == gs.WHIRLPOOL:
             defender.binding_type = "Whirlpool"
-            battle.add_text(defender.nickname + " was trapped in the vortex!")
+            if battle.log_text:
+                battle.add_text(defender.nickname + " was trapped in the vortex!")
         elif move_data.ef_stat == gs.SAND_TOMB:
             defender.binding_type = "Sand Tomb"
-            battle.add_text(defender.nickname + " was trapped by Sand Tomb!")
+            if battle.log_text:
+                battle.add_text(defender.nickname + " was trapped by Sand Tomb!")
         elif move_data.ef_stat == gs.MAGMA_STORM:
             defender.binding_type = "Magma Storm"
-            battle.add_text(defender.nickname + " became trapped by swirling magma!")
+            if battle.log_text:
+                battle.add_text(defender.nickname + " became trapped by swirling magma!")
     return True
 
 
@@ -1417,7 +1509,8 @@ def _ef_025(
         dmg = defender.max_hp // 2
     if not dmg:
         return True
-    battle.add_text(attacker.nickname + " kept going and crashed!")
+    if battle.log_text:
+        battle.add_text(attacker.nickname + " kept going and crashed!")
     attacker.take_damage(dmg)
     return True
 
@@ -1461,9 +1554,9 @@ def _ef_028(
     cc_ib: list,
 ) -> bool:
     if not move_data.ef_stat:
-        num_turns = randrange(1, 3)
+        num_turns = battle.rng.randrange(1, 3)
         move_data.ef_stat = num_turns
-        attacker.next_moves.put(move_data)
+        attacker.next_moves.append(move_data)
     else:
         move_data.ef_stat -= 1
         if move_data.ef_stat == 0:
@@ -1472,7 +1565,7 @@ def _ef_028(
                 confuse(attacker, battle, bypass=True)
             return True
         else:
-            attacker.next_moves.put(move_data)
+            attacker.next_moves.append(move_data)
 
 
 def _ef_029(
@@ -1502,10 +1595,10 @@ def _ef_030(
     dmg = _calculate_damage(attacker, defender, battlefield, battle, move_data)
     if not defender.is_alive or not dmg:
         return True
-    if randrange(1, 6) < 2:
+    if battle.rng.randrange(1, 6) < 2:
         poison(defender, battle)
     dmg = _calculate_damage(attacker, defender, battlefield, battle, move_data)
-    if dmg and randrange(5) < 1:
+    if dmg and battle.rng.randrange(5) < 1:
         poison(defender, battle)
     return True
 
@@ -1540,15 +1633,16 @@ def _ef_032(
         _failed(battle)
     else:
         disabled_move = defender.last_move
-        disabled_move.disabled = randrange(4, 8)
-        battle.add_text(
-            defender.trainer.name
-            + "'s "
-            + defender.nickname
-            + "'s "
-            + disabled_move.name
-            + " was disabled!"
-        )
+        disabled_move.disabled = battle.rng.randrange(4, 8)
+        if battle.log_text:
+            battle.add_text(
+                defender.trainer.name
+                + "'s "
+                + defender.nickname
+                + "'s "
+                + disabled_move.name
+                + " was disabled!"
+            )
 
 
 def _ef_033(
@@ -1561,7 +1655,8 @@ def _ef_033(
     cc_ib: list,
 ) -> bool:
     if not attacker.trainer.mist:
-        battle.add_text(attacker.trainer.name + "'s team became shrouded in mist!")
+        if battle.log_text:
+            battle.add_text(attacker.trainer.name + "'s team became shrouded in mist!")
         attacker.trainer.mist = 5
     else:
         _failed(battle)
@@ -1658,10 +1753,12 @@ def _ef_038(
             heal_amt = int(heal_amt * 1.3)
         if not defender.has_ability("liquid-ooze"):
             attacker.heal(heal_amt, text_skip=True)
-            battle.add_text(defender.nickname + " had it's energy drained!")
+            if battle.log_text:
+                battle.add_text(defender.nickname + " had it's energy drained!")
         else:
             attacker.take_damage(heal_amt)
-            battle.add_text(attacker.nickname + " sucked up the liquid ooze!")
+            if battle.log_text:
+                battle.add_text(attacker.nickname + " sucked up the liquid ooze!")
     return True
 
 
@@ -1680,7 +1777,8 @@ def _ef_039(
         and not defender.v_status[gs.LEECH_SEED]
     ):
         defender.v_status[gs.LEECH_SEED] = 1
-        battle.add_text(defender.nickname + " was seeded!")
+        if battle.log_text:
+            battle.add_text(defender.nickname + " was seeded!")
 
 
 def _ef_040(
@@ -1698,9 +1796,10 @@ def _ef_040(
         and not _power_herb_check(attacker, battle)
     ):
         battle._pop_text()
-        battle.add_text(attacker.nickname + " absorbed light!")
+        if battle.log_text:
+            battle.add_text(attacker.nickname + " absorbed light!")
         move_data.ef_stat = 1
-        attacker.next_moves.put(move_data)
+        attacker.next_moves.append(move_data)
         return True
     if battlefield.weather != gs.HARSH_SUNLIGHT and battlefield.weather != gs.CLEAR:
         move_data.power //= 2
@@ -1715,7 +1814,7 @@ def _ef_041(
     is_first: bool,
     cc_ib: list,
 ) -> bool:
-    if randrange(10) < 3:
+    if battle.rng.randrange(10) < 3:
         paralyze(defender, battle)
 
 
@@ -1730,12 +1829,13 @@ def _ef_042(
 ) -> bool:
     if not move_data.ef_stat and not _power_herb_check(attacker, battle):
         move_data.ef_stat = 1
-        attacker.next_moves.put(move_data)
+        attacker.next_moves.append(move_data)
         attacker.in_ground = True
         attacker.invulnerable = True
         attacker.inv_count = 1
         battle._pop_text()
-        battle.add_text(attacker.nickname + " burrowed its way under the ground!")
+        if battle.log_text:
+            battle.add_text(attacker.nickname + " burrowed its way under the ground!")
         return True
 
 
@@ -1773,9 +1873,10 @@ def _ef_044(
         attacker.copied = Move(defender.last_move.md)
         attacker.copied.max_pp = min(5, attacker.copied.max_pp)
         attacker.copied.cur_pp = attacker.copied.max_pp
-        battle.add_text(
-            attacker.nickname + " learned " + cap_name(attacker.copied.name)
-        )
+        if battle.log_text:
+            battle.add_text(
+                attacker.nickname + " learned " + cap_name(attacker.copied.name)
+            )
     else:
         _failed(battle)
 
@@ -1833,13 +1934,15 @@ def _ef_049(
             _failed(battle)
             return True
         t.light_screen = num_turns
-        battle.add_text("Light Screen raised " + t.name + "'s team's Special Defense!")
+        if battle.log_text:
+            battle.add_text("Light Screen raised " + t.name + "'s team's Special Defense!")
     elif move_data.ef_stat == 2:
         if t.reflect:
             _failed(battle)
             return True
         t.reflect = num_turns
-        battle.add_text("Light Screen raised " + t.name + "'s team's Defense!")
+        if battle.log_text:
+            battle.add_text("Light Screen raised " + t.name + "'s team's Defense!")
 
 
 def _ef_050(
@@ -1853,7 +1956,8 @@ def _ef_050(
 ) -> bool:
     attacker.reset_stages()
     defender.reset_stages()
-    battle.add_text("All stat changes were eliminated!")
+    if battle.log_text:
+        battle.add_text("All stat changes were eliminated!")
 
 
 def _ef_051(
@@ -1868,7 +1972,8 @@ def _ef_051(
     attacker.crit_stage += 2
     if attacker.crit_stage > 4:
         attacker.crit_stage = 4
-    battle.add_text(attacker.nickname + " is getting pumped!")
+    if battle.log_text:
+        battle.add_text(attacker.nickname + " is getting pumped!")
 
 
 def _ef_052(
@@ -1884,12 +1989,14 @@ def _ef_052(
         attacker.trapped = True
         move_data.ef_stat = 1
         attacker.bide_count = 2 if is_first else 3
-        attacker.next_moves.put(move_data)
+        attacker.next_moves.append(move_data)
         attacker.bide_dmg = 0
-        battle.add_text(attacker.nickname + " is storing energy!")
+        if battle.log_text:
+            battle.add_text(attacker.nickname + " is storing energy!")
     else:
         battle._pop_text()
-        battle.add_text(attacker.nickname + " unleashed energy!")
+        if battle.log_text:
+            battle.add_text(attacker.nickname + " unleashed energy!")
         if defender.is_alive:
             defender.take_damage(2 * attacker.bide_dmg, move_data)
         else:
@@ -1908,17 +2015,18 @@ def _ef_053(
     cc_ib: list,
 ) -> bool:
     move_names = [move.name for move in attacker.moves]
-    rand_move = PokeSim.get_rand_move()
+    rand_move = PokeSim.get_rand_move(battle.rng)
     attempts = 0
     while (
         attempts < 50
         and (rand_move[gs.MOVE_NAME] in move_names
-        or rand_move[gs.MOVE_NAME] in gd.METRONOME_CHECK)
+        or rand_move[gs.MOVE_FLAGS] & gs.MF_METRONOME)
     ):
-        rand_move = PokeSim.get_rand_move()
+        rand_move = PokeSim.get_rand_move(battle.rng)
         attempts += 1
     rand_move = Move(rand_move)
-    battle.add_text(attacker.nickname + " used " + cap_name(rand_move.name) + "!")
+    if battle.log_text:
+        battle.add_text(attacker.nickname + " used " + cap_name(rand_move.name) + "!")
     _process_effect(attacker, defender, battlefield, battle, rand_move, is_first)
     return True
 
@@ -1933,9 +2041,10 @@ def _ef_054(
     cc_ib: list,
 ) -> bool:
     if defender.is_alive and defender.last_move:
-        battle.add_text(
-            attacker.nickname + " used " + cap_name(defender.last_move.name) + "!"
-        )
+        if battle.log_text:
+            battle.add_text(
+                attacker.nickname + " used " + cap_name(defender.last_move.name) + "!"
+            )
         _process_effect(
             attacker, defender, battlefield, battle, defender.last_move, is_first
         )
@@ -1957,7 +2066,8 @@ def _ef_055(
         _failed(battle)
         return True
     if attacker.has_ability("damp") or defender.has_ability("damp"):
-        battle.add_text(attacker.nickname + " cannot use Self Destruct!")
+        if battle.log_text:
+            battle.add_text(attacker.nickname + " cannot use Self Destruct!")
         return True
     attacker.faint()
     _calculate_damage(attacker, defender, battlefield, battle, move_data)
@@ -1975,10 +2085,11 @@ def _ef_056(
 ) -> bool:
     if not move_data.ef_stat and not _power_herb_check(attacker, battle):
         battle._pop_text()
-        battle.add_text(attacker.nickname + " tucked in its head!")
+        if battle.log_text:
+            battle.add_text(attacker.nickname + " tucked in its head!")
         give_stat_change(attacker, battle, gs.DEF, 1)
         move_data.ef_stat = 1
-        attacker.next_moves.put(move_data)
+        attacker.next_moves.append(move_data)
         return True
 
 
@@ -2000,7 +2111,8 @@ def _ef_057(
             if attacker.item == "big-root":
                 heal_amt = int(heal_amt * 1.3)
             attacker.heal(heal_amt)
-        battle.add_text(defender.nickname + "'s dream was eaten!")
+        if battle.log_text:
+            battle.add_text(defender.nickname + "'s dream was eaten!")
     else:
         _failed(battle)
     return True
@@ -2017,14 +2129,15 @@ def _ef_058(
 ) -> bool:
     if not move_data.ef_stat and not _power_herb_check(attacker, battle):
         move_data.ef_stat = 1
-        defender.next_moves.put(move_data)
+        defender.next_moves.append(move_data)
         battle._pop_text()
-        battle.add_text(attacker.nickname + " became clocked in a harsh light!")
+        if battle.log_text:
+            battle.add_text(attacker.nickname + " became clocked in a harsh light!")
     else:
         dmg = _calculate_damage(
             attacker, defender, battlefield, battle, move_data, crit_chance=1
         )
-        if dmg and randrange(10) < 3:
+        if dmg and battle.rng.randrange(10) < 3:
             _flinch(defender, battle, is_first)
     return True
 
@@ -2040,7 +2153,8 @@ def _ef_059(
 ) -> bool:
     if defender.is_alive and not defender.transformed and not attacker.transformed:
         attacker.transform(defender)
-        battle.add_text(attacker.nickname + " transformed into " + defender.name + "!")
+        if battle.log_text:
+            battle.add_text(attacker.nickname + " transformed into " + defender.name + "!")
     else:
         _failed(battle)
     return True
@@ -2055,7 +2169,7 @@ def _ef_060(
     is_first: bool,
     cc_ib: list,
 ) -> bool:
-    dmg = attacker.level * (randrange(0, 11) * 10 + 50) // 100
+    dmg = attacker.level * (battle.rng.randrange(0, 11) * 10 + 50) // 100
     if defender.is_alive:
         defender.take_damage(dmg if dmg != 0 else 1, move_data)
     else:
@@ -2072,7 +2186,8 @@ def _ef_061(
     is_first: bool,
     cc_ib: list,
 ) -> bool:
-    battle.add_text("But nothing happened!")
+    if battle.log_text:
+        battle.add_text("But nothing happened!")
     return True
 
 
@@ -2089,7 +2204,8 @@ def _ef_062(
         _failed(battle)
         return True
     if attacker.has_ability("damp") or defender.has_ability("damp"):
-        battle.add_text(attacker.nickname + " cannot use Explosion!")
+        if battle.log_text:
+            battle.add_text(attacker.nickname + " cannot use Explosion!")
         return True
     attacker.faint()
     old_def = defender.stats_actual[gs.DEF]
@@ -2113,7 +2229,10 @@ def _ef_063(
     ):
         attacker.nv_status = gs.ASLEEP
         attacker.nv_counter = 3
-        battle.add_text(attacker.nickname + " went to sleep!")
+        if battle.log_text:
+            battle.add_text(attacker.nickname + " went to sleep!")
+        if battle.log_events:
+            battle.add_event(gs.EVENT_STATUS, attacker, gs.ASLEEP)
         attacker.heal(attacker.max_hp)
     else:
         _failed(battle)
@@ -2135,7 +2254,7 @@ def _ef_064(
     if not len(move_types):
         _failed(battle)
         return True
-    attacker.types = (move_types[randrange(len(move_types))], None)
+    attacker.types = (move_types[battle.rng.randrange(len(move_types))], None)
 
 
 def _ef_065(
@@ -2148,8 +2267,8 @@ def _ef_065(
     cc_ib: list,
 ) -> bool:
     dmg = _calculate_damage(attacker, defender, battlefield, battle, move_data)
-    if dmg and defender.is_alive and randrange(1, 101) < move_data.ef_chance:
-        give_nv_status(randrange(1, 4), defender, battle)
+    if dmg and defender.is_alive and battle.rng.randrange(1, 101) < move_data.ef_chance:
+        give_nv_status(battle.rng.randrange(1, 4), defender, battle)
     return True
 
 
@@ -2184,10 +2303,12 @@ def _ef_067(
         _failed(battle)
         return True
     if attacker.cur_hp - attacker.max_hp // 4 < 0:
-        battle.add_text("But it does not have enough HP left to make a substitute!")
+        if battle.log_text:
+            battle.add_text("But it does not have enough HP left to make a substitute!")
         return True
     attacker.substitute = attacker.take_damage(attacker.max_hp // 4) + 1
-    battle.add_text(attacker.nickname + " made a substitute!")
+    if battle.log_text:
+        battle.add_text(attacker.nickname + " made a substitute!")
 
 
 def _ef_068(
@@ -2200,8 +2321,9 @@ def _ef_068(
     cc_ib: list,
 ) -> bool:
     battle._pop_text()
-    battle.add_text(attacker.nickname + " has no moves left!")
-    battle.add_text(attacker.nickname + " used Struggle!")
+    if battle.log_text:
+        battle.add_text(attacker.nickname + " has no moves left!")
+        battle.add_text(attacker.nickname + " used Struggle!")
     _calculate_damage(attacker, defender, battlefield, battle, move_data)
     struggle_dmg = max(1, attacker.max_hp // 4)
     _recoil(attacker, battle, struggle_dmg, move_data)
@@ -2246,7 +2368,8 @@ def _ef_070(
         )
         move_data.power += 10
         num_hits += 1
-    battle.add_text("Hit" + str(num_hits) + "time(s)!")
+    if battle.log_text:
+        battle.add_text("Hit" + str(num_hits) + "time(s)!")
     return True
 
 
@@ -2268,14 +2391,15 @@ def _ef_071(
         and not defender.has_ability("sticky-hold")
         and not defender.has_ability("multitype")
     ):
-        battle.add_text(
-            attacker.nickname
-            + " stole "
-            + defender.nickname
-            + "'s "
-            + cap_name(defender.item)
-            + "!"
-        )
+        if battle.log_text:
+            battle.add_text(
+                attacker.nickname
+                + " stole "
+                + defender.nickname
+                + "'s "
+                + cap_name(defender.item)
+                + "!"
+            )
         attacker.give_item(defender.item)
         defender.give_item(None)
     return True
@@ -2292,7 +2416,8 @@ def _ef_072(
 ) -> bool:
     if defender.is_alive and not defender.invulnerable:
         defender.perma_trapped = True
-        battle.add_text(defender.nickname + " can no longer escape!")
+        if battle.log_text:
+            battle.add_text(defender.nickname + " can no longer escape!")
     else:
         _failed(battle)
 
@@ -2309,7 +2434,8 @@ def _ef_073(
     if defender.is_alive:
         attacker.mr_count = 2
         attacker.mr_target = defender
-        battle.add_text(attacker.nickname + " took aim at " + defender.nickname + "!")
+        if battle.log_text:
+            battle.add_text(attacker.nickname + " took aim at " + defender.nickname + "!")
     else:
         _failed(battle)
 
@@ -2329,7 +2455,8 @@ def _ef_074(
         and not defender.substitute
     ):
         defender.v_status[gs.NIGHTMARE] = 1
-        battle.add_text(defender.nickname + " began having a nightmare!")
+        if battle.log_text:
+            battle.add_text(defender.nickname + " began having a nightmare!")
     else:
         _failed(battle)
 
@@ -2344,7 +2471,7 @@ def _ef_075(
     cc_ib: list,
 ) -> bool:
     dmg = _calculate_damage(attacker, defender, battlefield, battle, move_data)
-    if dmg and randrange(100) < move_data.ef_amount:
+    if dmg and battle.rng.randrange(100) < move_data.ef_amount:
         burn(defender, battle)
     return True
 
@@ -2360,7 +2487,7 @@ def _ef_076(
 ) -> bool:
     if defender.is_alive and attacker.nv_status == gs.ASLEEP:
         dmg = _calculate_damage(attacker, defender, battlefield, battle, move_data)
-        if dmg and randrange(10) < 3:
+        if dmg and battle.rng.randrange(10) < 3:
             _flinch(defender, battle, is_first)
     else:
         _failed(battle)
@@ -2396,12 +2523,13 @@ def _ef_077(
             return True
         attacker.take_damage(attacker.max_hp // 2)
         defender.v_status[gs.CURSE] = 1
-        battle.add_text(
-            attacker.nickname
-            + " cut its own HP and laid a curse on "
-            + defender.nickname
-            + "!"
-        )
+        if battle.log_text:
+            battle.add_text(
+                attacker.nickname
+                + " cut its own HP and laid a curse on "
+                + defender.nickname
+                + "!"
+            )
 
 
 def _ef_078(
@@ -2451,11 +2579,12 @@ def _ef_079(
     poss_types = [type for type in poss_types if type not in attacker.types]
     poss_types = PokeSim.filter_valid_types(poss_types)
     if len(poss_types):
-        new_type = poss_types[randrange(len(poss_types))]
+        new_type = poss_types[battle.rng.randrange(len(poss_types))]
         attacker.types = (new_type, None)
-        battle.add_text(
-            attacker.nickname + " transformed into the " + new_type.upper() + " type!"
-        )
+        if battle.log_text:
+            battle.add_text(
+                attacker.nickname + " transformed into the " + new_type.upper() + " type!"
+            )
     else:
         _failed(battle)
 
@@ -2475,15 +2604,16 @@ def _ef_080(
         else:
             amt_reduced = 4
         defender.last_move.cur_pp -= amt_reduced
-        battle.add_text(
-            "It reduced the pp of "
-            + defender.nickname
-            + "'s "
-            + cap_name(defender.last_move.name)
-            + " by "
-            + str(amt_reduced)
-            + "!"
-        )
+        if battle.log_text:
+            battle.add_text(
+                "It reduced the pp of "
+                + defender.nickname
+                + "'s "
+                + cap_name(defender.last_move.name)
+                + " by "
+                + str(amt_reduced)
+                + "!"
+            )
     else:
         _failed(battle)
 
@@ -2500,7 +2630,7 @@ def _ef_081(
     if attacker.substitute:
         _failed(battle)
     p_chance = min(8, 2**attacker.protect_count)
-    if randrange(p_chance) < 1:
+    if battle.rng.randrange(p_chance) < 1:
         attacker.invulnerable = True
         attacker.protect = True
         attacker.protect_count += 1
@@ -2520,7 +2650,8 @@ def _ef_082(
     if attacker.max_hp // 2 > attacker.cur_hp or attacker.stat_stages[gs.ATK] == 6:
         _failed(battle)
         return True
-    battle.add_text(attacker.nickname + " cut its own HP and maximized its Attack!")
+    if battle.log_text:
+        battle.add_text(attacker.nickname + " cut its own HP and maximized its Attack!")
     attacker.stat_stages[gs.ATK] = 6
 
 
@@ -2536,9 +2667,10 @@ def _ef_083(
     enemy = defender.trainer
     if enemy.spikes < 3:
         enemy.spikes += 1
-        battle.add_text(
-            "Spikes were scattered all around the feet of " + enemy.name + "'s team!"
-        )
+        if battle.log_text:
+            battle.add_text(
+                "Spikes were scattered all around the feet of " + enemy.name + "'s team!"
+            )
     else:
         _failed(battle)
 
@@ -2554,7 +2686,8 @@ def _ef_084(
 ) -> bool:
     if defender.is_alive and not defender.foresight_target:
         defender.foresight_target = True
-        battle.add_text(attacker.nickname + " identified " + defender.nickname + "!")
+        if battle.log_text:
+            battle.add_text(attacker.nickname + " identified " + defender.nickname + "!")
     else:
         _failed(battle)
 
@@ -2568,7 +2701,8 @@ def _ef_085(
     is_first: bool,
     cc_ib: list,
 ) -> bool:
-    battle.add_text(attacker.nickname + " is trying to take its foe with it!")
+    if battle.log_text:
+        battle.add_text(attacker.nickname + " is trying to take its foe with it!")
     attacker.db_count = 1 if is_first else 2
 
 
@@ -2585,7 +2719,8 @@ def _ef_086(
         attacker.perish_count = 4
     if defender.is_alive and not defender.perish_count:
         defender.perish_count = 4
-    battle.add_text("All pokemon hearing the song will faint in three turns!")
+    if battle.log_text:
+        battle.add_text("All pokemon hearing the song will faint in three turns!")
 
 
 def _ef_087(
@@ -2600,7 +2735,8 @@ def _ef_087(
     if battlefield.weather != gs.SANDSTORM:
         battlefield.change_weather(gs.SANDSTORM)
         battlefield.weather_count = 5 if attacker.item != "smooth-rock" else 8
-        battle.add_text("A sandstorm brewed")
+        if battle.log_text:
+            battle.add_text("A sandstorm brewed")
     else:
         _failed(battle)
 
@@ -2617,7 +2753,7 @@ def _ef_088(
     if attacker.substitute:
         _failed(battle)
     p_chance = min(8, 2**attacker.protect_count)
-    if randrange(p_chance) < 1:
+    if battle.rng.randrange(p_chance) < 1:
         attacker.endure = True
         attacker.protect_count += 1
     else:
@@ -2644,7 +2780,7 @@ def _ef_089(
     )
     move_data.power *= 2
     if move_data.ef_stat < 5:
-        attacker.next_moves.put(move_data)
+        attacker.next_moves.append(move_data)
     return True
 
 
@@ -2729,8 +2865,9 @@ def _ef_094(
         _failed(battle)
         return True
     pos_moves = [move for move in attacker.moves if move.name != "sleep-talk"]
-    sel_move = Move(pos_moves[randrange(len(pos_moves))].md)
-    battle.add_text(attacker.nickname + " used " + cap_name(sel_move.name) + "!")
+    sel_move = Move(pos_moves[battle.rng.randrange(len(pos_moves))].md)
+    if battle.log_text:
+        battle.add_text(attacker.nickname + " used " + cap_name(sel_move.name) + "!")
     _process_effect(attacker, defender, battlefield, battle, sel_move, is_first)
     return True
 
@@ -2745,9 +2882,11 @@ def _ef_095(
     cc_ib: list,
 ) -> bool:
     if move_data.ef_stat == 1:
-        battle.add_text("A bell chimed!")
+        if battle.log_text:
+            battle.add_text("A bell chimed!")
     elif move_data.ef_stat == 2:
-        battle.add_text("A soothing aroma wafted through the area!")
+        if battle.log_text:
+            battle.add_text("A soothing aroma wafted through the area!")
     t = attacker.trainer
     for poke in t.poke_list:
         poke.nv_status = 0
@@ -2774,13 +2913,14 @@ def _ef_097(
     is_first: bool,
     cc_ib: list,
 ) -> bool:
-    res = randrange(10)
+    res = battle.rng.randrange(10)
     if res < 2:
         if not defender.is_alive:
             _missed(attacker, battle)
             return True
         if defender.cur_hp == defender.max_hp:
-            battle.add_text(defender.nickname + " can't receive the gift!")
+            if battle.log_text:
+                battle.add_text(defender.nickname + " can't receive the gift!")
             return True
         defender.heal(defender.max_hp // 4)
         return True
@@ -2816,7 +2956,8 @@ def _ef_099(
     t = attacker.trainer
     if not t.safeguard:
         t.safeguard = 5
-        battle.add_text(t.name + "'s team became cloaked in a mystical veil!")
+        if battle.log_text:
+            battle.add_text(t.name + "'s team became cloaked in a mystical veil!")
     else:
         _failed(battle)
 
@@ -2832,7 +2973,8 @@ def _ef_100(
 ) -> bool:
     if defender.is_alive:
         new_hp = (attacker.cur_hp + defender.cur_hp) // 2
-        battle.add_text("The battlers shared their pain!")
+        if battle.log_text:
+            battle.add_text("The battlers shared their pain!")
         attacker.cur_hp = min(new_hp, attacker.max_hp)
         defender.cur_hp = min(new_hp, defender.max_hp)
     else:
@@ -2849,7 +2991,7 @@ def _ef_101(
     is_first: bool,
     cc_ib: list,
 ) -> bool:
-    res = randrange(20)
+    res = battle.rng.randrange(20)
     if res < 1:
         mag = 4
         move_data.power = 10
@@ -2874,7 +3016,8 @@ def _ef_101(
     if defender.in_ground:
         cc_ib[1] = True
         move_data.power *= 2
-    battle.add_text("Magnitude " + str(mag) + "!")
+    if battle.log_text:
+        battle.add_text("Magnitude " + str(mag) + "!")
 
 
 def _ef_102(
@@ -2918,17 +3061,18 @@ def _ef_103(
         and not defender.encore_count
         and defender.last_move
         and defender.last_move.cur_pp
-        and defender.last_move not in gd.ENCORE_CHECK
+        and not defender.last_move.flags & gs.MF_ENCORE
         and any([move.name == defender.last_move.name for move in defender.moves])
     ):
         defender.next_moves.clear()
-        defender.encore_count = min(randrange(2, 7), defender.last_move.pp)
+        defender.encore_count = min(battle.rng.randrange(2, 7), defender.last_move.pp)
         for move in defender.moves:
             if move.name != defender.last_move.name:
                 move.encore_blocked = True
             else:
                 defender.encore_move = move
-        battle.add_text(defender.nickname + " received an encore!")
+        if battle.log_text:
+            battle.add_text(defender.nickname + " received an encore!")
     else:
         _failed(battle)
 
@@ -2986,7 +3130,7 @@ def _ef_106(
     if hp_stats:
         move_data.type, move_data.power = hp_stats
     else:
-        move_data.power = randrange(30, 71)
+        move_data.power = battle.rng.randrange(30, 71)
         move_data.type = attacker.types[0]
 
 
@@ -3005,7 +3149,7 @@ def _ef_107(
     dmg = _calculate_damage(
         attacker, defender, battlefield, battle, move_data, cc_ib[0], cc_ib[1]
     )
-    if dmg and randrange(5) < 1:
+    if dmg and battle.rng.randrange(5) < 1:
         _flinch(defender, battle, is_first)
     return True
 
@@ -3022,7 +3166,8 @@ def _ef_108(
     if battlefield.weather != gs.RAIN:
         battlefield.change_weather(gs.RAIN)
         battlefield.weather_count = 5 if attacker.item != "damp-rock" else 8
-        battle.add_text("It started to rain!")
+        if battle.log_text:
+            battle.add_text("It started to rain!")
     else:
         _failed(battle)
 
@@ -3039,7 +3184,8 @@ def _ef_109(
     if battlefield.weather != gs.HARSH_SUNLIGHT:
         battlefield.change_weather(gs.HARSH_SUNLIGHT)
         battlefield.weather_count = 5 if attacker.item != "heat-rock" else 8
-        battle.add_text("The sunlight turned harsh!")
+        if battle.log_text:
+            battle.add_text("The sunlight turned harsh!")
     else:
         _failed(battle)
 
@@ -3081,9 +3227,10 @@ def _ef_111(
         attacker.accuracy_stage = defender.accuracy_stage
         attacker.evasion_stage = defender.evasion_stage
         attacker.crit_stage = defender.crit_stage
-        battle.add_text(
-            attacker.nickname + " copied " + defender.nickname + "'s stat changes!"
-        )
+        if battle.log_text:
+            battle.add_text(
+                attacker.nickname + " copied " + defender.nickname + "'s stat changes!"
+            )
     else:
         _failed(battle)
 
@@ -3098,7 +3245,7 @@ def _ef_112(
     cc_ib: list,
 ) -> bool:
     dmg = _calculate_damage(attacker, defender, battlefield, battle, move_data)
-    if dmg and randrange(1, 101) < move_data.ef_chance:
+    if dmg and battle.rng.randrange(1, 101) < move_data.ef_chance:
         give_stat_change(attacker, battle, gs.ATK, 1)
         give_stat_change(attacker, battle, gs.DEF, 1)
         give_stat_change(attacker, battle, gs.SP_ATK, 1)
@@ -3129,7 +3276,8 @@ def _ef_113(
             skip_dmg=True,
         )
         t.fs_count = 3
-        battle.add_text(attacker.nickname + " foresaw an attack!")
+        if battle.log_text:
+            battle.add_text(attacker.nickname + " foresaw an attack!")
     else:
         _failed(battle)
     return True
@@ -3152,7 +3300,8 @@ def _ef_114(
     move_data.power = 10
     while defender.is_alive and num_hits < len(poke_hits):
         _calculate_damage(attacker, defender, battlefield, battle, move_data)
-        battle.add_text(poke_hits[num_hits].nickname + "'s attack!")
+        if battle.log_text:
+            battle.add_text(poke_hits[num_hits].nickname + "'s attack!")
         num_hits += 1
     return True
 
@@ -3168,8 +3317,9 @@ def _ef_115(
 ) -> bool:
     dmg = _calculate_damage(attacker, defender, battlefield, battle, move_data)
     if dmg and not attacker.uproar:
-        attacker.uproar = randrange(1, 5)
-        battle.add_text(attacker.nickname + " caused an uproar!")
+        attacker.uproar = battle.rng.randrange(1, 5)
+        if battle.log_text:
+            battle.add_text(attacker.nickname + " caused an uproar!")
     return True
 
 
@@ -3184,9 +3334,10 @@ def _ef_116(
 ) -> bool:
     if attacker.stockpile < 3:
         attacker.stockpile += 1
-        battle.add_text(
-            attacker.nickname + " stockpiled " + str(attacker.stockpile) + "!"
-        )
+        if battle.log_text:
+            battle.add_text(
+                attacker.nickname + " stockpiled " + str(attacker.stockpile) + "!"
+            )
         give_stat_change(attacker, battle, gs.DEF, 1)
         give_stat_change(attacker, battle, gs.SP_DEF, 1)
     else:
@@ -3208,7 +3359,8 @@ def _ef_117(
         attacker.stockpile = 0
         attacker.stat_stages[gs.DEF] -= attacker.stockpile
         attacker.stat_stages[gs.SP_DEF] -= attacker.stockpile
-        battle.add_text(attacker.nickname + "'s stockpile effect wore off!")
+        if battle.log_text:
+            battle.add_text(attacker.nickname + "'s stockpile effect wore off!")
     else:
         _failed(battle)
 
@@ -3227,7 +3379,8 @@ def _ef_118(
         attacker.stockpile = 0
         attacker.stat_stages[gs.DEF] -= attacker.stockpile
         attacker.stat_stages[gs.SP_DEF] -= attacker.stockpile
-        battle.add_text(attacker.nickname + "'s stockpile effect wore off!")
+        if battle.log_text:
+            battle.add_text(attacker.nickname + "'s stockpile effect wore off!")
     else:
         _failed(battle)
 
@@ -3244,7 +3397,8 @@ def _ef_119(
     if battlefield.weather != gs.HAIL:
         battlefield.change_weather(gs.HAIL)
         battlefield.weather_count = 5 if attacker.item != "icy-rock" else 8
-        battle.add_text("It started to hail!")
+        if battle.log_text:
+            battle.add_text("It started to hail!")
     else:
         _failed(battle)
 
@@ -3260,7 +3414,8 @@ def _ef_120(
 ) -> bool:
     if defender.is_alive and not defender.tormented:
         defender.tormented = True
-        battle.add_text(defender.nickname + " was subjected to Torment!")
+        if battle.log_text:
+            battle.add_text(defender.nickname + " was subjected to Torment!")
     else:
         _failed(battle)
 
@@ -3332,7 +3487,8 @@ def _ef_124(
         return True
     if attacker.turn_damage:
         battle._pop_text()
-        battle.add_text(attacker.nickname + " lost its focus and couldn't move!")
+        if battle.log_text:
+            battle.add_text(attacker.nickname + " lost its focus and couldn't move!")
         return True
 
 
@@ -3378,7 +3534,8 @@ def _ef_127(
     cc_ib: list,
 ) -> bool:
     attacker.charged = 2
-    battle.add_text(attacker.nickname + " began charging power!")
+    if battle.log_text:
+        battle.add_text(attacker.nickname + " began charging power!")
     give_stat_change(attacker, battle, gs.SP_DEF, 1)
 
 
@@ -3396,8 +3553,9 @@ def _ef_128(
         and not defender.taunt
         and not defender.has_ability("oblivious")
     ):
-        defender.taunt = randrange(3, 6)
-        battle.add_text(defender.nickname + " fell for the taunt!")
+        defender.taunt = battle.rng.randrange(3, 6)
+        if battle.log_text:
+            battle.add_text(defender.nickname + " fell for the taunt!")
     else:
         _failed(battle)
 
@@ -3436,15 +3594,18 @@ def _ef_130(
         a_item = attacker.item
         attacker.give_item(defender.item)
         defender.give_item(a_item)
-        battle.add_text(attacker.nickname + " switched items with its target!")
+        if battle.log_text:
+            battle.add_text(attacker.nickname + " switched items with its target!")
         if attacker.item:
-            battle.add_text(
-                attacker.nickname + " obtained one " + cap_name(attacker.item) + "."
-            )
+            if battle.log_text:
+                battle.add_text(
+                    attacker.nickname + " obtained one " + cap_name(attacker.item) + "."
+                )
         if defender.item:
-            battle.add_text(
-                defender.nickname + " obtained one " + cap_name(defender.item) + "."
-            )
+            if battle.log_text:
+                battle.add_text(
+                    defender.nickname + " obtained one " + cap_name(defender.item) + "."
+                )
     else:
         _failed(battle)
 
@@ -3465,14 +3626,15 @@ def _ef_131(
         and not defender.has_ability("multitype")
     ):
         attacker.give_ability(defender.ability)
-        battle.add_text(
-            attacker.nickname
-            + " copied "
-            + defender.nickname
-            + "'s "
-            + defender.ability
-            + "!"
-        )
+        if battle.log_text:
+            battle.add_text(
+                attacker.nickname
+                + " copied "
+                + defender.nickname
+                + "'s "
+                + defender.ability
+                + "!"
+            )
     else:
         _failed(battle)
 
@@ -3507,7 +3669,7 @@ def _ef_133(
         move
         for poke in attacker.trainer.poke_list
         for move in poke.moves
-        if move.name not in gd.ASSIST_CHECK
+        if not move.flags & gs.MF_ASSIST
     ]
     if len(possible_moves):
         _process_effect(
@@ -3515,7 +3677,7 @@ def _ef_133(
             defender,
             battlefield,
             battle,
-            Move(possible_moves[randrange(len(possible_moves))].md),
+            Move(possible_moves[battle.rng.randrange(len(possible_moves))].md),
             is_first,
         )
     else:
@@ -3533,7 +3695,8 @@ def _ef_134(
     cc_ib: list,
 ) -> bool:
     if not attacker.v_status[gs.INGRAIN]:
-        battle.add_text(attacker.nickname + " planted its roots!")
+        if battle.log_text:
+            battle.add_text(attacker.nickname + " planted its roots!")
         attacker.v_status[gs.INGRAIN] = 1
         attacker.trapped = True
         attacker.grounded = True
@@ -3568,7 +3731,8 @@ def _ef_136(
 ) -> bool:
     if is_first:
         attacker.magic_coat = True
-        battle.add_text(attacker.nickname + " shrouded itself with Magic Coat!")
+        if battle.log_text:
+            battle.add_text(attacker.nickname + " shrouded itself with Magic Coat!")
     else:
         _failed(battle)
 
@@ -3585,9 +3749,10 @@ def _ef_137(
     if not attacker.item and not attacker.h_item and attacker.last_consumed_item:
         attacker.give_item(attacker.last_consumed_item)
         attacker.last_consumed_item = None
-        battle.add_text(
-            attacker.nickname + " found one " + cap_name(attacker.item) + "!"
-        )
+        if battle.log_text:
+            battle.add_text(
+                attacker.nickname + " found one " + cap_name(attacker.item) + "!"
+            )
     else:
         _failed(battle)
 
@@ -3619,7 +3784,8 @@ def _ef_139(
         if t.light_screen or t.reflect:
             t.light_screen = 0
             t.reflect = 0
-            battle.add_text("It shattered the barrier!")
+            if battle.log_text:
+                battle.add_text("It shattered the barrier!")
         _calculate_damage(attacker, defender, battlefield, battle, move_data)
     else:
         _failed(battle)
@@ -3651,7 +3817,8 @@ def _ef_140(
         and not (defender.uproar and not defender.has_ability("soundproof"))
     ):
         defender.v_status[gs.DROWSY] = 2
-        battle.add_text(attacker.nickname + " made " + defender.nickname + " drowsy!")
+        if battle.log_text:
+            battle.add_text(attacker.nickname + " made " + defender.nickname + " drowsy!")
     else:
         _failed(battle)
 
@@ -3667,14 +3834,15 @@ def _ef_141(
 ) -> bool:
     dmg = _calculate_damage(attacker, defender, battlefield, battle, move_data)
     if defender.is_alive and dmg and defender.item and defender.h_item:
-        battle.add_text(
-            attacker.nickname
-            + " knocked off "
-            + defender.nickname
-            + "'s "
-            + cap_name(defender.item)
-            + "!"
-        )
+        if battle.log_text:
+            battle.add_text(
+                attacker.nickname
+                + " knocked off "
+                + defender.nickname
+                + "'s "
+                + cap_name(defender.item)
+                + "!"
+            )
         defender.item = None
     return True
 
@@ -3730,7 +3898,8 @@ def _ef_144(
         a_ability = attacker.ability
         attacker.give_ability(defender.ability)
         defender.give_ability(a_ability)
-        battle.add_text(attacker.nickname + " swapped abilities with its target!")
+        if battle.log_text:
+            battle.add_text(attacker.nickname + " swapped abilities with its target!")
     else:
         _failed(battle)
 
@@ -3749,7 +3918,8 @@ def _ef_145(
     if not t.imprisoned_poke and any(
         [move.name in a_moves for poke in t.poke_list for move in poke.moves]
     ):
-        battle.add_text(attacker.nickname + " sealed the opponent's move(s)!")
+        if battle.log_text:
+            battle.add_text(attacker.nickname + " sealed the opponent's move(s)!")
         t.imprisoned_poke = attacker
     else:
         _failed(battle)
@@ -3770,7 +3940,8 @@ def _ef_146(
         or attacker.nv_status == gs.POISONED
     ):
         attacker.nv_status = 0
-        battle.add_text(attacker.nickname + "'s status return Trueed to normal!")
+        if battle.log_text:
+            battle.add_text(attacker.nickname + "'s status return Trueed to normal!")
     else:
         _failed(battle)
 
@@ -3784,9 +3955,10 @@ def _ef_147(
     is_first: bool,
     cc_ib: list,
 ) -> bool:
-    battle.add_text(
-        attacker.nickname + " wants " + attacker.enemy.name + " to bear a grudge!"
-    )
+    if battle.log_text:
+        battle.add_text(
+            attacker.nickname + " wants " + attacker.enemy.name + " to bear a grudge!"
+        )
 
 
 def _ef_148(
@@ -3800,7 +3972,8 @@ def _ef_148(
 ) -> bool:
     if is_first:
         attacker.snatch = True
-        battle.add_text(attacker.nickname + " waits for a target to make a move!")
+        if battle.log_text:
+            battle.add_text(attacker.nickname + " waits for a target to make a move!")
     else:
         _failed(battle)
 
@@ -3815,7 +3988,7 @@ def _ef_149(
     cc_ib: list,
 ) -> bool:
     dmg = _calculate_damage(attacker, defender, battlefield, battle, move_data)
-    if dmg and randrange(1, 101) < move_data.ef_chance:
+    if dmg and battle.rng.randrange(1, 101) < move_data.ef_chance:
         paralyze(defender, battle)
     return True
 
@@ -3831,12 +4004,13 @@ def _ef_150(
 ) -> bool:
     if not move_data.ef_stat and not _power_herb_check(attacker, battle):
         move_data.ef_stat = 1
-        attacker.next_moves.put(move_data)
+        attacker.next_moves.append(move_data)
         attacker.in_water = True
         attacker.invulnerable = True
         attacker.inv_count = 1
         battle._pop_text()
-        battle.add_text(attacker.nickname + " hid underwater!")
+        if battle.log_text:
+            battle.add_text(attacker.nickname + " hid underwater!")
         return True
 
 
@@ -3850,12 +4024,13 @@ def _ef_151(
     cc_ib: list,
 ) -> bool:
     attacker.type = ("normal", None)
-    battle.add_text(
-        attacker.nickname
-        + " transformed into the "
-        + attacker.types[0].upper()
-        + " type!"
-    )
+    if battle.log_text:
+        battle.add_text(
+            attacker.nickname
+            + " transformed into the "
+            + attacker.types[0].upper()
+            + " type!"
+        )
 
 
 def _ef_152(
@@ -3870,7 +4045,7 @@ def _ef_152(
     dmg = _calculate_damage(
         attacker, defender, battlefield, battle, move_data, crit_chance=1
     )
-    if dmg and randrange(10) < 1:
+    if dmg and battle.rng.randrange(10) < 1:
         burn(defender, battle)
     return True
 
@@ -3886,7 +4061,8 @@ def _ef_153(
 ) -> bool:
     if not attacker.mud_sport and not (defender.is_alive and defender.mud_sport):
         attacker.mud_sport = True
-        battle.add_text("Electricity's power was weakened")
+        if battle.log_text:
+            battle.add_text("Electricity's power was weakened")
     else:
         _failed(battle)
 
@@ -4000,15 +4176,16 @@ def _ef_161(
 ) -> bool:
     if not move_data.ef_stat and not _power_herb_check(attacker, battle):
         move_data.ef_stat = 1
-        attacker.next_moves.put(move_data)
+        attacker.next_moves.append(move_data)
         attacker.in_air = True
         attacker.invulnerable = True
         attacker.inv_count = 1
         battle._pop_text()
-        battle.add_text(attacker.nickname + " sprang up!")
+        if battle.log_text:
+            battle.add_text(attacker.nickname + " sprang up!")
         return True
     dmg = _calculate_damage(attacker, defender, battlefield, battle, move_data)
-    if dmg and randrange(10) < 3:
+    if dmg and battle.rng.randrange(10) < 3:
         paralyze(defender, battle)
     return True
 
@@ -4025,7 +4202,7 @@ def _ef_162(
     dmg = _calculate_damage(
         attacker, defender, battlefield, battle, move_data, crit_chance=1
     )
-    if dmg and randrange(10) < 1:
+    if dmg and battle.rng.randrange(10) < 1:
         poison(defender, battle)
     return True
 
@@ -4040,7 +4217,7 @@ def _ef_163(
     cc_ib: list,
 ) -> bool:
     dmg = _calculate_damage(attacker, defender, battlefield, battle, move_data)
-    if dmg and randrange(10) < 1:
+    if dmg and battle.rng.randrange(10) < 1:
         paralyze(defender, battle)
     if dmg:
         _recoil(attacker, battle, max(1, dmg // 3), move_data)
@@ -4058,7 +4235,8 @@ def _ef_164(
 ) -> bool:
     if not attacker.water_sport and not (defender.is_alive and defender.water_sport):
         attacker.water_sport = True
-        battle.add_text("Fire's power was weakened")
+        if battle.log_text:
+            battle.add_text("Fire's power was weakened")
     else:
         _failed(battle)
 
@@ -4117,7 +4295,8 @@ def _ef_167(
             skip_dmg=True,
         )
         t.dd_count = 3
-        battle.add_text(attacker.nickname + " chose Doom Desire as its destiny!")
+        if battle.log_text:
+            battle.add_text(attacker.nickname + " chose Doom Desire as its destiny!")
     else:
         _failed(battle)
     return True
@@ -4157,7 +4336,8 @@ def _ef_169(
         battlefield.acc_modifier = 5 / 3
         attacker.grounded = True
         defender.grounded = True
-        battle.add_text("Gravity intensified!")
+        if battle.log_text:
+            battle.add_text("Gravity intensified!")
     else:
         _failed(battle)
 
@@ -4173,7 +4353,8 @@ def _ef_170(
 ) -> bool:
     if defender.is_alive and not defender.me_target:
         defender.me_target = True
-        battle.add_text(attacker.nickname + " identified " + defender.nickname + "!")
+        if battle.log_text:
+            battle.add_text(attacker.nickname + " identified " + defender.nickname + "!")
     else:
         _failed(battle)
 
@@ -4225,7 +4406,8 @@ def _ef_173(
     t = attacker.trainer
     if t.num_fainted >= len(t.poke_list) - 1 or battle._process_selection(t):
         _failed(battle)
-    battle.add_text("The healing wish came true!")
+    if battle.log_text:
+        battle.add_text("The healing wish came true!")
     t.current_poke.heal(t.current_poke.max_hp)
     t.current_poke.nv_status = 0
 
@@ -4276,7 +4458,8 @@ def _ef_176(
     cc_ib: list,
 ) -> bool:
     if not is_first and defender.is_alive and defender.protect:
-        battle.add_text(defender.nickname + " fell for the feint!")
+        if battle.log_text:
+            battle.add_text(defender.nickname + " fell for the feint!")
         _calculate_damage(attacker, defender, battlefield, battle, move_data)
     else:
         _failed(battle)
@@ -4301,21 +4484,22 @@ def _ef_177(
         and not defender.has_ability("sticky-hold")
         and not defender.substitute
     ):
-        battle.add_text(
-            attacker.nickname
-            + " stole and ate "
-            + defender.nickname
-            + "'s "
-            + defender.item
-            + "!"
-        )
+        if battle.log_text:
+            battle.add_text(
+                attacker.nickname
+                + " stole and ate "
+                + defender.nickname
+                + "'s "
+                + defender.item
+                + "!"
+            )
         if not attacker.has_ability("klutz") and not attacker.embargo_count:
             pi.use_item(
                 attacker.trainer,
                 battle,
                 defender.item,
                 attacker,
-                randrange(len(attacker.moves)),
+                battle.rng.randrange(len(attacker.moves)),
                 text_skip=True,
                 can_skip=True
             )
@@ -4333,9 +4517,10 @@ def _ef_178(
     cc_ib: list,
 ) -> bool:
     if not attacker.trainer.tailwind_count:
-        battle.add_text(
-            "The tailwind blew from being " + attacker.trainer.name + "'s team!"
-        )
+        if battle.log_text:
+            battle.add_text(
+                "The tailwind blew from being " + attacker.trainer.name + "'s team!"
+            )
         attacker.trainer.tailwind_count = 3
         for poke in attacker.trainer.poke_list:
             poke.stats_actual[gs.SPD] *= 2
@@ -4355,7 +4540,7 @@ def _ef_179(
     ef_stats = attacker.stat_stages + [attacker.accuracy_stage, attacker.evasion_stage]
     ef_stats = [stat_i for stat_i in range(len(ef_stats)) if ef_stats[stat_i] < 6]
     if len(ef_stats):
-        give_stat_change(attacker, battle, randrange(len(ef_stats)), 2)
+        give_stat_change(attacker, battle, battle.rng.randrange(len(ef_stats)), 2)
     else:
         _failed(battle)
 
@@ -4445,7 +4630,8 @@ def _ef_185(
 ) -> bool:
     if defender.is_alive and not defender.embargo_count:
         defender.embargo_count = 5
-        battle.add_text(defender.nickname + " can't use items anymore!")
+        if battle.log_text:
+            battle.add_text(defender.nickname + " can't use items anymore!")
     else:
         _failed(battle)
 
@@ -4460,7 +4646,8 @@ def _ef_186(
     cc_ib: list,
 ) -> bool:
     if attacker.item:
-        battle.add_text(attacker.nickname + " flung its " + attacker.item + "!")
+        if battle.log_text:
+            battle.add_text(attacker.nickname + " flung its " + attacker.item + "!")
         move_data.power = 20
         _calculate_damage(attacker, defender, battlefield, battle, move_data)
         if attacker.is_alive:
@@ -4517,7 +4704,8 @@ def _ef_189(
 ) -> bool:
     if defender.is_alive and not defender.hb_count:
         defender.hb_count = 5
-        battle.add_text(defender.nickname + " was prevented from healing!")
+        if battle.log_text:
+            battle.add_text(defender.nickname + " was prevented from healing!")
     else:
         _failed(battle)
 
@@ -4547,7 +4735,8 @@ def _ef_191(
         attacker.stats_actual[gs.DEF],
         attacker.stats_actual[gs.ATK],
     )
-    battle.add_text(attacker.nickname + " switched its Attack and Defense!")
+    if battle.log_text:
+        battle.add_text(attacker.nickname + " switched its Attack and Defense!")
     attacker.power_trick = True
 
 
@@ -4566,7 +4755,8 @@ def _ef_192(
         and not defender.ability_suppressed
     ):
         defender.ability_suppressed = True
-        battle.add_text(defender.nickname + "'s ability was suppressed!")
+        if battle.log_text:
+            battle.add_text(defender.nickname + "'s ability was suppressed!")
     else:
         _failed(battle)
 
@@ -4582,11 +4772,12 @@ def _ef_193(
 ) -> bool:
     if not attacker.trainer.lucky_chant:
         attacker.trainer.lucky_chant = 5
-        battle.add_text(
-            "The Lucky Chant shielded"
-            + attacker.trainer.name
-            + "'s team from critical hits!"
-        )
+        if battle.log_text:
+            battle.add_text(
+                "The Lucky Chant shielded"
+                + attacker.trainer.name
+                + "'s team from critical hits!"
+            )
     else:
         _failed(battle)
 
@@ -4603,9 +4794,10 @@ def _ef_194(
     if attacker.mf_move:
         if attacker.mf_move.power:
             attacker.mf_move.power = int(1.5 * attacker.mf_move.power)
-        battle.add_text(
-            attacker.nickname + " used " + cap_name(attacker.mf_move.name) + "!"
-        )
+        if battle.log_text:
+            battle.add_text(
+                attacker.nickname + " used " + cap_name(attacker.mf_move.name) + "!"
+            )
         _process_effect(
             attacker, defender, battlefield, battle, attacker.mf_move, is_first
         )
@@ -4651,12 +4843,13 @@ def _ef_196(
             defender.stat_stages[gs.SP_ATK],
             attacker.stat_stages[gs.SP_ATK],
         )
-        battle.add_text(
-            attacker.nickname
-            + " switched all changes to its Attack and Sp. Atk with "
-            + defender.nickname
-            + "!"
-        )
+        if battle.log_text:
+            battle.add_text(
+                attacker.nickname
+                + " switched all changes to its Attack and Sp. Atk with "
+                + defender.nickname
+                + "!"
+            )
     else:
         _failed(battle)
 
@@ -4679,12 +4872,13 @@ def _ef_197(
             defender.stat_stages[gs.SP_DEF],
             attacker.stat_stages[gs.SP_DEF],
         )
-        battle.add_text(
-            attacker.nickname
-            + " switched all changes to its Defense and Sp. Def with "
-            + defender.nickname
-            + "!"
-        )
+        if battle.log_text:
+            battle.add_text(
+                attacker.nickname
+                + " switched all changes to its Defense and Sp. Def with "
+                + defender.nickname
+                + "!"
+            )
     else:
         _failed(battle)
 
@@ -4737,7 +4931,8 @@ def _ef_200(
         and not defender.has_ability("multitype")
         and not defender.has_ability("truant")
     ):
-        battle.add_text(defender.nickname + " acquired insomnia!")
+        if battle.log_text:
+            battle.add_text(defender.nickname + " acquired insomnia!")
         defender.give_ability("insomnia")
     else:
         _failed(battle)
@@ -4767,11 +4962,12 @@ def _ef_202(
     cc_ib: list,
 ) -> bool:
     defender.trainer.toxic_spikes += 1
-    battle.add_text(
-        "Poison spikes were scattered all around the feet of "
-        + defender.trainer.name
-        + "'s team!"
-    )
+    if battle.log_text:
+        battle.add_text(
+            "Poison spikes were scattered all around the feet of "
+            + defender.trainer.name
+            + "'s team!"
+        )
 
 
 def _ef_203(
@@ -4788,9 +4984,10 @@ def _ef_203(
             defender.stat_stages,
             attacker.stat_stages,
         )
-        battle.add_text(
-            attacker.nickname + " switched stat changes with " + defender.nickname + "!"
-        )
+        if battle.log_text:
+            battle.add_text(
+                attacker.nickname + " switched stat changes with " + defender.nickname + "!"
+            )
     else:
         _failed(battle)
 
@@ -4805,7 +5002,8 @@ def _ef_204(
     cc_ib: list,
 ) -> bool:
     if not attacker.v_status[gs.AQUA_RING]:
-        battle.add_text(attacker.nickname + " surrounded itself with a veil of water!")
+        if battle.log_text:
+            battle.add_text(attacker.nickname + " surrounded itself with a veil of water!")
         attacker.v_status[gs.AQUA_RING] = 1
     else:
         _failed(battle)
@@ -4822,7 +5020,8 @@ def _ef_205(
 ) -> bool:
     if not attacker.magnet_rise:
         attacker.magnet_rise = True
-        battle.add_text(attacker.nickname + " levitated on electromagnetism!")
+        if battle.log_text:
+            battle.add_text(attacker.nickname + " levitated on electromagnetism!")
     else:
         _failed(battle)
 
@@ -4839,7 +5038,7 @@ def _ef_206(
     dmg = _calculate_damage(attacker, defender, battlefield, battle, move_data)
     if dmg:
         _recoil(attacker, battle, max(1, dmg // 3), move_data)
-    if defender.is_alive and dmg and randrange(10) < 1:
+    if defender.is_alive and dmg and battle.rng.randrange(10) < 1:
         burn(defender, battle)
     return True
 
@@ -4869,9 +5068,9 @@ def _ef_208(
 ) -> bool:
     dmg = _calculate_damage(attacker, defender, battlefield, battle, move_data)
     if defender.is_alive and dmg:
-        if randrange(1, 101) < move_data.ef_chance:
+        if battle.rng.randrange(1, 101) < move_data.ef_chance:
             paralyze(defender, battle)
-        if randrange(1, 101) < move_data.ef_chance:
+        if battle.rng.randrange(1, 101) < move_data.ef_chance:
             _flinch(defender, battle, is_first)
     return True
 
@@ -4887,9 +5086,9 @@ def _ef_209(
 ) -> bool:
     dmg = _calculate_damage(attacker, defender, battlefield, battle, move_data)
     if defender.is_alive and dmg:
-        if randrange(1, 101) < move_data.ef_chance:
+        if battle.rng.randrange(1, 101) < move_data.ef_chance:
             freeze(defender, battle)
-        if randrange(1, 101) < move_data.ef_chance:
+        if battle.rng.randrange(1, 101) < move_data.ef_chance:
             _flinch(defender, battle, is_first)
     return True
 
@@ -4905,9 +5104,9 @@ def _ef_210(
 ) -> bool:
     dmg = _calculate_damage(attacker, defender, battlefield, battle, move_data)
     if defender.is_alive and dmg:
-        if randrange(1, 101) < move_data.ef_chance:
+        if battle.rng.randrange(1, 101) < move_data.ef_chance:
             burn(defender, battle)
-        if randrange(1, 101) < move_data.ef_chance:
+        if battle.rng.randrange(1, 101) < move_data.ef_chance:
             _flinch(defender, battle, is_first)
     return True
 
@@ -4922,7 +5121,8 @@ def _ef_211(
     cc_ib: list,
 ) -> bool:
     if defender.is_alive:
-        battle.add_text(_stat_text(defender, gs.EVA, -1))
+        if battle.log_text:
+            battle.add_text(_stat_text(defender, gs.EVA, -1))
         if defender.evasion_stage > -6:
             defender.evasion_stage -= 1
     defender.trainer.spikes = 0
@@ -4945,10 +5145,12 @@ def _ef_212(
 ) -> bool:
     if not battlefield.trick_room_count:
         battlefield.trick_room_count = 5
-        battle.add_text(attacker.nickname + " twisted the dimensions!")
+        if battle.log_text:
+            battle.add_text(attacker.nickname + " twisted the dimensions!")
     else:
         battlefield.trick_room_count = 0
-        battle.add_text("The twisted dimensions return Trueed to normal!")
+        if battle.log_text:
+            battle.add_text("The twisted dimensions return Trueed to normal!")
 
 
 def _ef_213(
@@ -4981,11 +5183,12 @@ def _ef_214(
 ) -> bool:
     if not defender.trainer.stealth_rock:
         defender.trainer.steal_rock = 1
-        battle.add_text(
-            "Pointed stones float in the air around "
-            + defender.trainer.name
-            + "'s team!"
-        )
+        if battle.log_text:
+            battle.add_text(
+                "Pointed stones float in the air around "
+                + defender.trainer.name
+                + "'s team!"
+            )
     else:
         _failed(battle)
 
@@ -5000,7 +5203,7 @@ def _ef_215(
     cc_ib: list,
 ) -> bool:
     dmg = _calculate_damage(attacker, defender, battlefield, battle, move_data)
-    if defender.is_alive and dmg and randrange(100) < 1:
+    if defender.is_alive and dmg and battle.rng.randrange(100) < 1:
         confuse(defender, battle)
     return True
 
@@ -5046,7 +5249,8 @@ def _ef_218(
         _failed(battle)
     attacker.faint()
     battle._process_selection(t)
-    battle.add_text(t.current_poke.nickname + "became cloaked in mystical moonlight!")
+    if battle.log_text:
+        battle.add_text(t.current_poke.nickname + "became cloaked in mystical moonlight!")
     t.current_poke.heal(t.current_poke.max_hp)
     t.current_poke.nv_status = 0
     for move in t.current_poke.moves:
@@ -5064,10 +5268,11 @@ def _ef_219(
 ) -> bool:
     if not move_data.ef_stat and not _power_herb_check(attacker, battle):
         move_data.ef_stat = 1
-        attacker.next_moves.put(move_data)
+        attacker.next_moves.append(move_data)
         attacker.invulnerable = True
         attacker.inv_count = 1
-        battle.add_text(attacker.nickname + " vanished instantly!")
+        if battle.log_text:
+            battle.add_text(attacker.nickname + " vanished instantly!")
     attacker.invulnerable = False
 
 
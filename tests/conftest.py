@@ -0,0 +1,69 @@
+import random
+
+import pytest
+
+_POKEMON = (
+    ("pikachu", ["thunderbolt", "quick-attack", "iron-tail", "thunder-wave"]),
+    ("bulbasaur", ["razor-leaf", "tackle", "sleep-powder", "vine-whip"]),
+    ("charmander", ["ember", "scratch", "flamethrower", "growl"]),
+    ("squirtle", ["surf", "tackle", "ice-beam", "withdraw"]),
+    ("eevee", ["tackle", "bite", "quick-attack", "swift"]),
+    ("snorlax", ["body-slam", "rest", "earthquake", "crunch"]),
+    ("gengar", ["shadow-ball", "hypnosis", "psychic", "thunderbolt"]),
+    ("machamp", ["cross-chop", "earthquake", "rock-slide", "bulk-up"]),
+    ("gyarados", ["waterfall", "earthquake", "dragon-dance", "crunch"]),
+    ("alakazam", ["psychic", "recover", "shadow-ball", "calm-mind"]),
+    ("lapras", ["surf", "ice-beam", "thunderbolt", "body-slam"]),
+    ("dragonite", ["dragon-claw", "earthquake", "extreme-speed", "fire-punch"]),
+)
+
+
+def make_team(size: int = 6, start: int = 0, **kwargs) -> list[dict]:
+    """
+    Returns a team of size Pokemon formatted as in run_battles, each with 4 moves. kwargs are
+    added to the first Pokemon's dict, i.e. status='asleep'.
+    """
+    team = []
+    for i in range(size):
+        name, moves = _POKEMON[(start + i) % len(_POKEMON)]
+        team.append(
+            {
+                "name_or_id": name,
+                "level": 50,
+                "moves": list(moves),
+                "gender": "male",
+                "stats_actual": [200, 150, 150, 150, 150, 100 + 10 * i],
+            }
+        )
+    team[0].update(kwargs)
+    return team
+
+
+@pytest.fixture
+def team():
+    return make_team
+
+
+def play(battle, turns: int, seed: int = 0) -> list[str]:
+    """
+    Plays up to turns turns of battle with moves drawn from a Random seeded with seed, and
+    returns the battle text of those turns.
+    """
+    rng = random.Random(seed)
+    start = len(battle.get_all_text())
+    for _ in range(turns):
+        if battle.is_finished():
+            break
+        actions = []
+        for trainer in (battle.t1, battle.t2):
+            moves = [
+                move for move in trainer.current_poke.moves if move.cur_pp and not move.disabled
+            ]
+            actions.append(["move", rng.choice(moves).name] if moves else ["move", "struggle"])
+        battle.turn(*actions)
+    return battle.get_all_text()[start:]
+
+
+@pytest.fixture
+def play_turns():
+    return play
@@ -0,0 +1,141 @@
+import random
+
+import pytest
+
+from poke_battle_sim import Battle, Pokemon, Trainer
+from poke_battle_sim.core.action import Action
+from poke_battle_sim.tools.batch import build_trainer
+
+import poke_battle_sim.conf.global_settings as gs
+
+
+def _poke(name: str, ability: str = None) -> Pokemon:
+    return Pokemon(name, 50, ["tackle"], "male", stats_actual=[200] * 6, ability=ability)
+
+
+def _trap_battle() -> Battle:
+    battle = Battle(
+        Trainer("Ash", [_poke("pikachu"), _poke("wobbuffet", "shadow-tag")]),
+        Trainer("Misty", [_poke("bulbasaur"), _poke("charmander")]),
+        seed=1,
+    )
+    battle.start()
+    return battle
+
+
+def test_switch_into_trap_skips_other_switch():
+    battle = _trap_battle()
+    battle.turn(Action.switch(1), Action.switch(1))
+    assert battle.t1.current_poke.name == "wobbuffet"
+    assert battle.t2.current_poke.name == "bulbasaur"
+    assert "BULBASAUR can't escape!" in battle.get_cur_text()
+
+
+def test_trapped_switch_rejected_before_turn():
+    battle = _trap_battle()
+    battle.turn(Action.switch(1), Action.move(0))
+    hp = [poke.cur_hp for poke in battle.t1.poke_list + battle.t2.poke_list]
+    battle.get_cur_text()
+    with pytest.raises(Exception):
+        battle.turn(Action.move(0), Action.switch(1))
+    assert not battle.get_cur_text()
+    assert [poke.cur_hp for poke in battle.t1.poke_list + battle.t2.poke_list] == hp
+
+
+def _trap_team(start: int, team) -> list[dict]:
+    party = team(4, start)
+    party[1].update(name_or_id="wobbuffet", ability="shadow-tag")
+    party[2].update(name_or_id="dugtrio", ability="arena-trap")
+    return party
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_legal_actions_never_raise(team, seed):
+    np = pytest.importorskip("numpy")
+    rng = random.Random(seed)
+    battle = Battle(
+        build_trainer("Ash", _trap_team(0, team)),
+        build_trainer("Misty", _trap_team(6, team)),
+        seed=seed,
+    )
+    battle.start()
+    while not battle.is_finished() and battle.turn_count < 100:
+        actions = []
+        for trainer in (battle.t1, battle.t2):
+            mask = trainer.legal_action_mask()
+            assert mask.shape == (gs.ACTION_SPACE_SIZE,)
+            actions.append(trainer.get_action(rng.choice(np.flatnonzero(mask))))
+        battle.turn(*actions)
+
+
+def test_action_list_round_trip(team):
+    trainer = build_trainer("Ash", team(2))
+    trainer.current_poke = trainer.poke_list[0]
+    for slot, move in enumerate(trainer.current_poke.moves):
+        action = Action.from_list(trainer, ["move", move.name])
+        assert action == Action.move(slot)
+        assert Action.from_list(trainer, action.to_list(trainer)) == action
+    item = Action.use_item("potion", 1)
+    assert Action.from_list(trainer, item.to_list(trainer)) == item
+    assert Action.from_list(trainer, ["other", "switch"]) == Action.switch()
+    assert Action.from_list(trainer, ["move"]) is None
+    assert Action.from_list(trainer, ["item", "potion", "x"]) is None
+    assert len({Action.move(0), Action.move(0), Action.switch(1)}) == 2
+
+
+def test_typed_actions_play_like_lists(team):
+    def run(typed: bool) -> list[str]:
+        battle = Battle(
+            build_trainer("Ash", team(3)), build_trainer("Misty", team(3, 6)), seed=3
+        )
+        battle.start()
+        rng = random.Random(3)
+        while not battle.is_finished() and battle.turn_count < 100:
+            actions = []
+            for trainer in (battle.t1, battle.t2):
+                slot = rng.randrange(len(trainer.current_poke.moves))
+                action = Action.move(slot)
+                if not trainer.is_valid_action(action):
+                    action = Action.struggle()
+                actions.append(action if typed else action.to_list(trainer))
+            battle.turn(*actions)
+        return battle.get_all_text()
+
+    assert run(True) == run(False)
+
+
+def test_legal_action_mask(team):
+    np = pytest.importorskip("numpy")
+    battle = Battle(build_trainer("Ash", team(4)), build_trainer("Misty", team(2, 6)), seed=0)
+    battle.start()
+    trainer = battle.t1
+    poke = trainer.current_poke
+    poke.moves[1].cur_pp = 0
+    trainer.poke_list[2].cur_hp = 0
+    trainer.poke_list[2].is_alive = False
+
+    out = np.ones(gs.ACTION_SPACE_SIZE, dtype=bool)
+    assert trainer.legal_action_mask(out) is out
+    legal = np.flatnonzero(out).tolist()
+    moves = gs.ACTION_SPACE_MOVES
+    switches = gs.ACTION_SPACE_SWITCHES
+    assert legal == [moves, moves + 2, moves + 3, switches, switches + 2]
+    assert [trainer.get_action(i) for i in legal] == [
+        Action.move(0),
+        Action.move(2),
+        Action.move(3),
+        Action.switch(1),
+        Action.switch(3),
+    ]
+    assert all(trainer.is_valid_action(trainer.get_action(i)) for i in legal)
+
+    for move in poke.moves:
+        move.cur_pp = 0
+    assert np.flatnonzero(trainer.legal_action_mask()).tolist() == [
+        switches,
+        switches + 2,
+        gs.ACTION_SPACE_STRUGGLE,
+    ]
+    assert trainer.get_action(gs.ACTION_SPACE_STRUGGLE) == Action.struggle()
+    with pytest.raises(Exception):
+        trainer.get_action(gs.ACTION_SPACE_SIZE)
@@ -0,0 +1,98 @@
+import os
+
+import pytest
+
+from poke_battle_sim.tools.archive import ReplayArchive, team_hash
+from poke_battle_sim.tools.batch import first_move_policy
+from poke_battle_sim.tools.replay import Replay
+
+import poke_battle_sim.conf.global_settings as gs
+
+
+def _record(team, seed: int, size: int = 2) -> Replay:
+    rec = Replay.record((team(size, seed), team(size, 6), seed))
+    battle = rec.battle
+    while not battle.is_finished() and battle.turn_count < 200:
+        battle.turn(first_move_policy(battle, battle.t1), first_move_policy(battle, battle.t2))
+    return rec
+
+
+def _winner(battle) -> int:
+    return 1 if battle.winner is battle.t1 else 2 if battle.winner is battle.t2 else 0
+
+
+def test_archive_round_trip(team, tmp_path):
+    path = str(tmp_path / "replays.pbsa")
+    replays = [_record(team, seed) for seed in range(5)]
+    with ReplayArchive(path, writable=True) as archive:
+        for i, rec in enumerate(replays):
+            assert archive.append(rec, gs.REPLAY_LZMA if i % 2 else gs.REPLAY_ZLIB) == i
+        # a replay that was not recorded is played out again for its result
+        assert archive.append(Replay.from_bytes(replays[0].to_bytes())) == 5
+
+    with ReplayArchive(path) as archive:
+        assert len(archive) == 6
+        for i, rec in enumerate(replays + replays[:1]):
+            assert archive.get_bytes(i) == rec.to_bytes(
+                gs.REPLAY_LZMA if i % 2 and i < 5 else gs.REPLAY_ZLIB
+            )
+            assert archive.get(i).replay().get_all_text() == rec.battle.get_all_text()
+            assert archive.get_info(i) == (
+                team_hash(rec.spec[0]),
+                team_hash(rec.spec[1]),
+                _winner(rec.battle),
+                rec.battle.turn_count,
+            )
+        with pytest.raises(Exception):
+            archive.get(6)
+        with pytest.raises(Exception):
+            archive.get("0")
+        with pytest.raises(Exception):
+            archive.append(replays[0])
+
+
+def test_archive_find_and_index(team, tmp_path):
+    np = pytest.importorskip("numpy")
+    path = str(tmp_path / "replays.pbsa")
+    archive = ReplayArchive(path, writable=True)
+    for seed in range(4):
+        archive.append(_record(team, seed))
+    index = archive.get_index()
+    assert len(index) == 4
+    assert index["turn_count"].tolist() == [archive.get_info(i)[3] for i in range(4)]
+
+    # ids from find are numpy integers, and index views stay valid through appends and close
+    ids = archive.find(team(2, 2))
+    assert ids.tolist() == [2]
+    assert archive.get(ids[0]).spec[2] == 2
+    assert archive.find(team(2, 6)).tolist() == [0, 1, 2, 3]
+    archive.append(_record(team, 2))
+    assert archive.find(team_hash(team(2, 2))).tolist() == [2, 4]
+    archive.close()
+    assert len(index) == 4 and index["turn_count"].sum() > 0
+    assert isinstance(ids[0], np.integer)
+
+
+def test_archive_drops_partial_record(team, tmp_path):
+    path = str(tmp_path / "replays.pbsa")
+    with ReplayArchive(path, writable=True) as archive:
+        archive.append(_record(team, 0))
+        archive.append(_record(team, 1))
+    index_path = path + gs.ARCHIVE_INDEX_SUFFIX
+    with open(index_path, "r+b") as f:
+        f.truncate(os.path.getsize(index_path) - 5)
+
+    with ReplayArchive(path, writable=True) as archive:
+        assert len(archive) == 1
+        assert archive.append(_record(team, 2)) == 1
+        assert archive.get(1).spec[2] == 2
+    with ReplayArchive(path) as archive:
+        assert len(archive) == 2
+
+
+def test_archive_rejects_other_files(tmp_path):
+    path = tmp_path / "other.bin"
+    path.write_bytes(b"not an archive at all")
+    (tmp_path / ("other.bin" + gs.ARCHIVE_INDEX_SUFFIX)).write_bytes(b"x" * 64)
+    with pytest.raises(Exception):
+        ReplayArchive(str(path))
@@ -0,0 +1,68 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from poke_battle_sim.tools.env import VectorBattleEnv
+
+import poke_battle_sim.conf.global_settings as gs
+
+
+def _play(env: VectorBattleEnv, steps: int, seed: int = 0) -> list:
+    # random legal actions, so every step has to be valid for the masks the env returns
+    rng = np.random.default_rng(seed)
+    obs, info = env.reset()
+    history = [obs.copy()]
+    for _ in range(steps):
+        masks = info["action_mask"]
+        actions = [rng.choice(np.flatnonzero(mask)) for mask in masks]
+        obs, rewards, terminated, truncated, info = env.step(actions)
+        history.append((obs.copy(), rewards.copy(), terminated.copy(), truncated.copy()))
+    return history
+
+
+def test_env_full_parties(team):
+    env = VectorBattleEnv(2, [(team(6), team(6, 6), 0)], seed=1)
+    obs, info = env.reset()
+    assert obs.shape == (2, gs.OBS_SIZE)
+    assert info["action_mask"].shape == (2, gs.ACTION_SPACE_SIZE)
+    assert info["action_mask"].any(axis=1).all()
+    _play(env, 100)
+    assert env.obs.shape == (2, gs.OBS_SIZE)
+
+
+@pytest.mark.parametrize("agent_selections", [False, True])
+def test_env_seeded_runs_repeat(team, agent_selections):
+    specs = [(team(3, status="asleep"), team(3, 6), 0), (team(6, 3), team(2, 9), 0)]
+    runs = []
+    for _ in range(2):
+        env = VectorBattleEnv(4, specs, seed=123, agent_selections=agent_selections)
+        history = _play(env, 150)
+        counters = [battle.t1.poke_list[0].nv_counter for battle in env.battles]
+        runs.append((history, counters, env.episodes.copy()))
+    (history_1, counters_1, episodes_1), (history_2, counters_2, episodes_2) = runs
+    assert counters_1 == counters_2
+    assert (episodes_1 == episodes_2).all()
+    assert np.array_equal(history_1[0], history_2[0])
+    for step_1, step_2 in zip(history_1[1:], history_2[1:]):
+        assert all(np.array_equal(a, b) for a, b in zip(step_1, step_2))
+
+
+def test_env_starting_sleep_counter_is_seeded(team):
+    def counters(seed: int) -> list:
+        env = VectorBattleEnv(4, [(team(1, status="asleep"), team(1, 6), 0)], seed=seed)
+        env.reset()
+        return [battle.t1.poke_list[0].nv_counter for battle in env.battles]
+
+    assert counters(123) == counters(123)
+    assert all(2 <= counter <= 5 for counter in counters(7))
+
+
+def test_env_reset_restarts_battles(team):
+    env = VectorBattleEnv(1, [(team(2), team(2, 6), 0)], seed=5)
+    first, _ = env.reset()
+    first = first.copy()
+    env.step([0])
+    again, _ = env.reset(seed=5)
+    assert env.battles[0].turn_count == 0
+    assert again[0, 0] == 0
+    assert np.array_equal(first[0, gs.OBS_FIELD_SIZE :], again[0, gs.OBS_FIELD_SIZE :])
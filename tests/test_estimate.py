@@ -0,0 +1,90 @@
+import math
+
+import pytest
+
+from poke_battle_sim.tools.estimate import estimate_win_rate, get_interval
+
+import poke_battle_sim.conf.global_settings as gs
+
+
+def test_wilson_interval():
+    low, high = get_interval(50, 100, 0.95, gs.ESTIMATE_WILSON)
+    assert low == pytest.approx(0.4038, abs=1e-4)
+    assert high == pytest.approx(0.5962, abs=1e-4)
+    assert get_interval(0, 10)[0] == pytest.approx(0, abs=1e-12)
+    assert get_interval(10, 10)[1] == pytest.approx(1, abs=1e-12)
+
+
+@pytest.mark.parametrize("wins, num_battles", [(0, 10), (3, 10), (50, 100), (97.5, 120)])
+def test_beta_interval(wins, num_battles):
+    confidence = 0.9
+    low, high = get_interval(wins, num_battles, confidence, gs.ESTIMATE_BETA)
+    assert 0 <= low < high <= 1
+    # the posterior mass below low and above high is (1 - confidence) / 2 each, found here
+    # by integrating the Beta(wins + 1/2, num_battles - wins + 1/2) density numerically
+    a, b = wins + 0.5, num_battles - wins + 0.5
+    log_norm = math.lgamma(a + b) - math.lgamma(a) - math.lgamma(b)
+
+    def mass(start: float, end: float, steps: int = 20000) -> float:
+        # midpoint rule on x = t^2 keeps the integrable singularity at 0 finite
+        total = 0.0
+        lo, hi = math.sqrt(start), math.sqrt(end)
+        width = (hi - lo) / steps
+        for k in range(steps):
+            t = lo + (k + 0.5) * width
+            x = t * t
+            if 0 < x < 1:
+                log_density = log_norm + (a - 1) * math.log(x) + (b - 1) * math.log(1 - x)
+                total += math.exp(log_density) * 2 * t
+        return total * width
+
+    assert mass(0, low) == pytest.approx((1 - confidence) / 2, abs=2e-3)
+    assert mass(0, high) == pytest.approx(1 - (1 - confidence) / 2, abs=2e-3)
+
+
+def test_beta_interval_is_symmetric():
+    low, high = get_interval(30, 100, 0.95, gs.ESTIMATE_BETA)
+    mirror_low, mirror_high = get_interval(70, 100, 0.95, gs.ESTIMATE_BETA)
+    assert low == pytest.approx(1 - mirror_high, abs=1e-9)
+    assert high == pytest.approx(1 - mirror_low, abs=1e-9)
+
+
+def test_estimate_is_seeded(team):
+    kwargs = dict(precision=None, batch_size=8, max_battles=24, seed=9)
+    first = estimate_win_rate(team(2), team(2, 6), **kwargs)
+    assert first == estimate_win_rate(team(2), team(2, 6), **kwargs)
+    win_rate, low, high, num_battles = first
+    assert num_battles == 24
+    assert low <= win_rate <= high
+
+
+def test_estimate_stops_early(team):
+    # the stronger team wins every battle, so the interval leaves 0.5 after the first batch
+    strong = team(1, 11)
+    strong[0]["level"] = 100
+    weak = team(1, 1)
+    weak[0]["level"] = 5
+    win_rate, low, high, num_battles = estimate_win_rate(
+        strong, weak, precision=None, threshold=0.5, batch_size=10, max_battles=1000, seed=1
+    )
+    assert num_battles == 10
+    assert win_rate == 1 and low > 0.5
+
+    _, low, high, num_battles = estimate_win_rate(
+        strong, weak, precision=0.1, batch_size=6, max_battles=1000, seed=1
+    )
+    assert num_battles % 6 == 0 and num_battles < 1000
+    assert high - low <= 0.2
+
+
+def test_estimate_checks_arguments(team):
+    for kwargs in (
+        dict(precision=0),
+        dict(threshold=1),
+        dict(confidence=1),
+        dict(interval=5),
+        dict(batch_size=0),
+        dict(max_battles=0),
+    ):
+        with pytest.raises(Exception):
+            estimate_win_rate(team(1), team(1, 6), **kwargs)
@@ -0,0 +1,108 @@
+import pytest
+
+from poke_battle_sim import Battle
+from poke_battle_sim.core.event_log import EventLog
+from poke_battle_sim.tools.batch import build_trainer, first_move_policy
+
+import poke_battle_sim.conf.global_settings as gs
+
+
+def _battle(team, seed: int = 1) -> Battle:
+    battle = Battle(
+        build_trainer("Ash", team(3)),
+        build_trainer("Misty", team(3, 6)),
+        seed=seed,
+        log_level=gs.LOG_ALL,
+    )
+    battle.start()
+    return battle
+
+
+def _turn_events(battle: Battle) -> list:
+    return [event for event in battle.get_all_events() if event[0] == gs.EVENT_TURN]
+
+
+def _turn_lines(battle: Battle) -> list:
+    return [line for line in battle.get_all_text() if line.startswith("Turn ")]
+
+
+def test_invalid_turn_leaves_no_turn_event(team):
+    battle = _battle(team)
+    with pytest.raises(Exception):
+        battle.turn(["move", "not-a-move"], ["move", "surf"])
+    assert not _turn_events(battle)
+    assert not _turn_lines(battle)
+
+
+def test_turn_events_match_turn_text(team):
+    battle = _battle(team)
+    while not battle.is_finished() and battle.turn_count < 50:
+        battle.turn(first_move_policy(battle, battle.t1), first_move_policy(battle, battle.t2))
+    lines = _turn_lines(battle)
+    assert lines
+    assert [
+        "Turn " + str(event[3]) + ":" for event in _turn_events(battle)
+    ] == lines
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_rendered_events_follow_battle_text(team, seed):
+    battle = _battle(team, seed)
+    while not battle.is_finished() and battle.turn_count < 50:
+        battle.turn(first_move_policy(battle, battle.t1), first_move_policy(battle, battle.t2))
+    text = iter(battle.get_all_text())
+    # every rendered line appears in the battle text, in the same order
+    for line in battle.get_event_text():
+        assert any(line == txt for txt in text)
+
+
+def test_event_log_grows_and_reads():
+    log = EventLog(1)
+    for i in range(10):
+        log.add(gs.EVENT_DAMAGE, 1, i % 6, i)
+    assert len(log) == 10
+    assert log[0] == (gs.EVENT_DAMAGE, 1, 0, 0)
+    assert log[-1] == (gs.EVENT_DAMAGE, 1, 3, 9)
+    assert len(log.read()) == 10
+    assert not log.read()
+    log.add(gs.EVENT_FAINT, 2, 0, 0)
+    assert log.read() == [(gs.EVENT_FAINT, 2, 0, 0)]
+    assert log.pop() == (gs.EVENT_FAINT, 2, 0, 0)
+    assert len(log) == 10 and list(log.iter_from(9)) == [(gs.EVENT_DAMAGE, 1, 3, 9)]
+    with pytest.raises(IndexError):
+        log[10]
+
+
+def test_event_log_copy_is_independent():
+    log = EventLog()
+    log.add(gs.EVENT_TURN, 0, 0, 1)
+    copy = log.copy()
+    log.add(gs.EVENT_TURN, 0, 0, 2)
+    assert list(copy) == [(gs.EVENT_TURN, 0, 0, 1)]
+    assert len(log) == 2
+
+
+def test_event_log_view():
+    np = pytest.importorskip("numpy")
+    log = EventLog()
+    log.add(gs.EVENT_TURN, 0, 0, 1)
+    log.add(gs.EVENT_SWITCH, 1, 2, 0)
+    events = np.frombuffer(log.view(), dtype=np.int32).reshape(-1, gs.EVENT_SIZE)
+    assert events.tolist() == [list(event) for event in log]
+
+
+def test_events_do_not_depend_on_text(team, play_turns):
+    battles = []
+    for log_level in (gs.LOG_EVENTS, gs.LOG_ALL):
+        battle = Battle(
+            build_trainer("Ash", team(3)),
+            build_trainer("Misty", team(3, 6)),
+            seed=4,
+            log_level=log_level,
+        )
+        battle.start()
+        play_turns(battle, 50, 4)
+        battles.append(battle)
+    assert not battles[0].get_all_text()
+    assert battles[0].get_all_events() == battles[1].get_all_events()
+    assert battles[0].get_event_text() == battles[1].get_event_text()
@@ -0,0 +1,110 @@
+import asyncio
+import random
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from poke_battle_sim import Battle
+from poke_battle_sim.tools.batch import build_trainer
+from poke_battle_sim.tools.host import BattleHost
+
+
+async def _last_alive(battle: Battle, trainer) -> int:
+    await asyncio.sleep(0)
+    slots = [
+        i
+        for i, poke in enumerate(trainer.poke_list)
+        if poke.is_alive and poke is not trainer.current_poke
+    ]
+    return slots[-1]
+
+
+def _battle(team, seed: int) -> Battle:
+    return Battle(
+        build_trainer("Ash", team(3, seed)), build_trainer("Misty", team(3, 6)), seed=seed
+    )
+
+
+def _action(trainer, rng: random.Random) -> list[str]:
+    moves = [
+        move for move in trainer.current_poke.moves if move.cur_pp and not move.disabled
+    ]
+    return ["move", rng.choice(moves).name] if moves else ["move", "struggle"]
+
+
+async def _player(host: BattleHost, battle_id, side: int, log: list):
+    battle = host.get_battle(battle_id)
+    trainer = battle.t1 if side == 1 else battle.t2
+    rng = random.Random(side)
+    while not battle.is_finished() and battle.turn_count < 200:
+        await asyncio.sleep(rng.random() * 0.001)
+        action = _action(trainer, rng)
+        log.append((battle.turn_count, side, action))
+        await host.submit(battle_id, side, action)
+
+
+def test_hosted_battles_match_direct_battles(team):
+    async def main():
+        host = BattleHost(ThreadPoolExecutor(4))
+        logs = {}
+        for seed in range(8):
+            battle_id = host.add_battle(_battle(team, seed), (_last_alive, _last_alive))
+            logs[battle_id] = []
+        await asyncio.gather(
+            *[_player(host, i, side, logs[i]) for i in logs for side in (1, 2)]
+        )
+        return host, logs
+
+    host, logs = asyncio.run(main())
+    assert len(host) == 8
+    for battle_id, log in logs.items():
+        hosted = host.get_battle(battle_id)
+        assert hosted.is_finished() or hosted.turn_count >= 200
+        # replay the submitted actions in order with the same selections
+        direct = _battle(team, battle_id)
+        direct.start()
+        actions = {(turn, side): action for turn, side, action in log}
+        while not direct.is_finished() and direct.turn_count < hosted.turn_count:
+            turn = direct.turn_count
+            request = direct.begin_turn(actions[turn, 1], actions[turn, 2])
+            while request:
+                request = direct.resume_turn(asyncio.run(_last_alive(direct, request.trainer)))
+        assert direct.get_all_text() == hosted.get_all_text()
+
+
+def test_submit_checks(team):
+    async def main():
+        host = BattleHost()
+        battle_id = host.add_battle(_battle(team, 0))
+        battle = host.get_battle(battle_id)
+        with pytest.raises(Exception):
+            await host.submit(battle_id, 1, ["move", "not-a-move"])
+        with pytest.raises(Exception):
+            await host.submit(battle_id, 3, _action(battle.t1, random.Random(0)))
+        with pytest.raises(Exception):
+            await host.submit("missing", 1, _action(battle.t1, random.Random(0)))
+
+        action = _action(battle.t1, random.Random(0))
+        first = asyncio.ensure_future(host.submit(battle_id, 1, action))
+        await asyncio.sleep(0)
+        with pytest.raises(Exception):
+            await host.submit(battle_id, 1, _action(battle.t1, random.Random(0)))
+
+        # a cancelled submission is withdrawn, so the turn waits for a new one
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        assert host.battles[battle_id].waiters == [None, None]
+        turn_count = battle.turn_count
+        await asyncio.gather(
+            host.submit(battle_id, 1, _action(battle.t1, random.Random(0))),
+            host.submit(battle_id, 2, _action(battle.t2, random.Random(0))),
+        )
+        assert battle.turn_count == turn_count + 1
+
+        with pytest.raises(Exception):
+            host.add_battle(_battle(team, 1), battle_id=battle_id)
+        assert host.remove_battle(battle_id) is battle
+        assert not len(host)
+
+    asyncio.run(main())
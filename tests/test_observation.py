@@ -0,0 +1,54 @@
+import pytest
+
+from poke_battle_sim import Battle
+from poke_battle_sim.tools.batch import build_trainer, first_move_policy
+from poke_battle_sim.tools.observation import encode_observation
+
+import poke_battle_sim.conf.global_settings as gs
+
+def _battle(team, size_1: int, size_2: int) -> Battle:
+    battle = Battle(
+        build_trainer("Ash", team(size_1)), build_trainer("Misty", team(size_2, 6)), seed=1
+    )
+    battle.start()
+    return battle
+
+
+@pytest.mark.parametrize("size", range(gs.POKE_NUM_MIN, gs.POKE_NUM_MAX + 1))
+def test_observation_length(team, size):
+    battle = _battle(team, size, size)
+    for side in (1, 2):
+        out = encode_observation(battle, side, [])
+        assert len(out) == gs.OBS_SIZE
+
+
+def test_observation_length_after_full_parties(team):
+    # encoding full parties must not change the size of later observations
+    encode_observation(_battle(team, 6, 6), 1, [])
+    assert len(encode_observation(_battle(team, 1, 2), 1, [])) == gs.OBS_SIZE
+
+
+def test_observation_into_numpy(team):
+    np = pytest.importorskip("numpy")
+    battle = _battle(team, 6, 6)
+    out = np.zeros(gs.OBS_SIZE + 3, dtype=np.float32)
+    encode_observation(battle, 1, out, offset=3)
+    assert (out[:3] == 0).all()
+    assert out[3] == battle.turn_count
+    as_list = encode_observation(battle, 1, [])
+    assert np.allclose(out[3:], np.array(as_list, dtype=np.float32))
+
+
+def test_observation_sides(team):
+    battle = _battle(team, 6, 4)
+    while not battle.is_finished() and battle.turn_count < 5:
+        battle.turn(first_move_policy(battle, battle.t1), first_move_policy(battle, battle.t2))
+    side_1 = encode_observation(battle, 1, [])
+    side_2 = encode_observation(battle, 2, [])
+    field = gs.OBS_FIELD_SIZE
+    player = gs.OBS_PLAYER_SIZE
+    assert side_1[:field] == side_2[:field]
+    assert side_1[field : field + player] == side_2[field + player :]
+    assert side_1[field + player :] == side_2[field : field + player]
+    with pytest.raises(Exception):
+        encode_observation(battle, 3, [])
@@ -0,0 +1,109 @@
+import asyncio
+import threading
+
+import pytest
+
+from poke_battle_sim import Battle
+from poke_battle_sim.core.action import Action, SelectionRequest
+from poke_battle_sim.core.policy import Policy, play_turn, first_move_policy
+from poke_battle_sim.tools.batch import build_trainer
+
+
+def _battle(team) -> Battle:
+    battle = Battle(build_trainer("Ash", team(3)), build_trainer("Misty", team(3, 6)), seed=0)
+    battle.start()
+    return battle
+
+
+def test_policy_uses_valid_decisions(team):
+    battle = _battle(team)
+    policy = Policy(lambda battle, trainer: Action.move(2), lambda battle, request: 2)
+    assert policy.get_action(battle, battle.t1) == Action.move(2)
+    assert policy.get_selection(battle, SelectionRequest(battle.t1, 1, (1, 2))) == 2
+    assert policy.num_fallbacks == 0
+
+
+def test_policy_falls_back(team):
+    def broken(battle, arg):
+        raise ValueError
+
+    battle = _battle(team)
+    request = SelectionRequest(battle.t1, 1, (1, 2))
+    fallback = first_move_policy(battle, battle.t1)
+    policy = Policy(broken, broken)
+    assert policy.get_action(battle, battle.t1) == fallback
+    assert policy.get_selection(battle, request) == 1
+    invalid = Policy(lambda battle, trainer: ["move", "not-a-move"], lambda battle, request: 0)
+    assert invalid.get_action(battle, battle.t1) == fallback
+    assert invalid.get_selection(battle, request) == 1
+    assert Policy(selection=lambda battle, request: True).get_selection(battle, request) == 1
+    assert policy.num_fallbacks == invalid.num_fallbacks == 2
+
+
+def test_policy_timeout_does_not_block_later_decisions(team):
+    release = threading.Event()
+    calls = []
+
+    def stuck_once(battle, trainer):
+        calls.append(trainer)
+        if len(calls) == 1:
+            release.wait(5)
+        return Action.move(1)
+
+    battle = _battle(team)
+    policy = Policy(stuck_once, timeout=0.2)
+    try:
+        assert policy.get_action(battle, battle.t1) == first_move_policy(battle, battle.t1)
+        assert policy.num_fallbacks == 1
+        # the stuck decision keeps its own worker, so the next ones run right away
+        for _ in range(3):
+            assert policy.get_action(battle, battle.t1) == Action.move(1)
+        assert policy.num_fallbacks == 1
+    finally:
+        release.set()
+
+
+def test_policy_with_timeout_gets_a_copy(team):
+    seen = []
+
+    def record(battle, trainer):
+        seen.append((battle, trainer))
+        return Action.move(0)
+
+    battle = _battle(team)
+    Policy(record, timeout=1).get_action(battle, battle.t2)
+    copy, trainer = seen[0]
+    assert copy is not battle and trainer is copy.t2
+    assert trainer.current_poke.cur_hp == battle.t2.current_poke.cur_hp
+
+
+def test_async_policies_in_event_loop(team):
+    async def act(battle, trainer):
+        await asyncio.sleep(0)
+        return Action.move(1)
+
+    async def select(battle, request):
+        await asyncio.sleep(0)
+        return request.slots[-1]
+
+    policy = Policy(act, select, timeout=1)
+    battle = _battle(team)
+
+    async def main():
+        # a Trainer's own selection runs from inside the running loop during the turn
+        battle.t1.selection = battle.t2.selection = policy
+        while not battle.is_finished() and battle.turn_count < 100:
+            battle.turn(await policy.decide_action(battle, battle.t1), Action.move(0))
+
+    asyncio.run(main())
+    assert battle.turn_count
+    assert policy.num_fallbacks == 0
+
+
+def test_play_turn(team):
+    battle = _battle(team)
+    policy = Policy(lambda battle, trainer: first_move_policy(battle, trainer))
+    while not battle.is_finished() and battle.turn_count < 200:
+        asyncio.run(play_turn(battle, policy, policy))
+    assert battle.is_finished()
+    assert policy.num_fallbacks == 0
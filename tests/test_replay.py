@@ -0,0 +1,58 @@
+import random
+
+import pytest
+
+from poke_battle_sim.tools.replay import Replay, encode_team, replay
+
+import poke_battle_sim.conf.global_settings as gs
+
+
+def _record(team, seed: int) -> Replay:
+    t1 = team(3, seed, ability="static", item="leftovers", nickname="Sparky")
+    rec = Replay.record((t1, team(3, 6), seed), names=("Ash", "Misty"))
+    battle = rec.battle
+    rng = random.Random(seed)
+    while not battle.is_finished() and battle.turn_count < 200:
+        actions = []
+        for trainer in (battle.t1, battle.t2):
+            moves = [
+                move for move in trainer.current_poke.moves if move.cur_pp and not move.disabled
+            ]
+            actions.append(["move", rng.choice(moves).name] if moves else ["move", "struggle"])
+        request = battle.begin_turn(*actions)
+        while request:
+            request = battle.resume_turn(rng.choice(request.slots))
+    return rec
+
+
+@pytest.mark.parametrize("compression", [gs.REPLAY_NONE, gs.REPLAY_ZLIB, gs.REPLAY_LZMA])
+@pytest.mark.parametrize("seed", [0, 1, 2, -5, 2**64 - 1])
+def test_replay_round_trip(team, seed, compression):
+    rec = _record(team, seed)
+    decoded = Replay.from_bytes(rec.to_bytes(compression))
+    # names are stored as Pokedex ids, so the teams are compared in their encoded form
+    assert decoded.spec[2] == rec.spec[2] == seed
+    assert encode_team(decoded.spec[0]) == encode_team(rec.spec[0])
+    assert encode_team(decoded.spec[1]) == encode_team(rec.spec[1])
+    assert decoded.names == ("Ash", "Misty")
+    assert decoded.log == rec.log
+    battle = decoded.replay()
+    assert battle.get_all_text() == rec.battle.get_all_text()
+    assert battle.turn_count == rec.battle.turn_count
+    assert replay(rec.to_bytes(compression)).get_all_text() == rec.battle.get_all_text()
+
+
+def test_replay_records_selections(team):
+    assert any(
+        isinstance(entry, int) for seed in range(3) for entry in _record(team, seed).log
+    )
+
+
+def test_replay_rejects_invalid_data(team):
+    data = _record(team, 0).to_bytes()
+    with pytest.raises(Exception):
+        Replay.from_bytes(b"XXXX" + data[4:])
+    with pytest.raises(Exception):
+        Replay.from_bytes(data[:4] + bytes((gs.REPLAY_VERSION + 1,)) + data[5:])
+    with pytest.raises(Exception):
+        Replay((team(1), team(1)))
@@ -0,0 +1,83 @@
+import random
+
+import pytest
+
+from poke_battle_sim import Battle
+from poke_battle_sim.core.policy import Policy
+from poke_battle_sim.tools.batch import build_trainer
+
+
+def _last_slot(battle: Battle, request) -> int:
+    return request.slots[-1]
+
+
+def _battle(team, seed: int, selection=None) -> Battle:
+    t1 = build_trainer("Ash", team(4, seed))
+    t2 = build_trainer("Misty", team(4, 6))
+    t1.selection = t2.selection = selection
+    battle = Battle(t1, t2, seed=seed)
+    battle.start()
+    return battle
+
+
+def _actions(battle: Battle, rng: random.Random) -> list:
+    actions = []
+    for trainer in (battle.t1, battle.t2):
+        moves = [
+            move for move in trainer.current_poke.moves if move.cur_pp and not move.disabled
+        ]
+        actions.append(["move", rng.choice(moves).name] if moves else ["move", "struggle"])
+    return actions
+
+
+@pytest.mark.parametrize("seed", range(6))
+def test_resumable_turns_match_turn(team, seed):
+    direct = _battle(team, seed, Policy(selection=_last_slot))
+    resumed = _battle(team, seed)
+    rng_1, rng_2 = random.Random(seed), random.Random(seed)
+    num_requests = 0
+    while not direct.is_finished() and direct.turn_count < 200:
+        direct.turn(*_actions(direct, rng_1))
+        request = resumed.begin_turn(*_actions(resumed, rng_2))
+        while request:
+            num_requests += 1
+            assert resumed.get_pending_selection() is request
+            assert len(request.slots) > 1
+            request = resumed.resume_turn(request.slots[-1])
+        assert resumed.get_pending_selection() is None
+    assert num_requests
+    assert resumed.get_all_text() == direct.get_all_text()
+    assert resumed.is_finished() == direct.is_finished()
+    assert [poke.cur_hp for poke in resumed.t1.poke_list + resumed.t2.poke_list] == [
+        poke.cur_hp for poke in direct.t1.poke_list + direct.t2.poke_list
+    ]
+
+
+def test_invalid_selection_sends_out_first_available(team):
+    direct = _battle(team, 0)
+    resumed = _battle(team, 0)
+    rng_1, rng_2 = random.Random(0), random.Random(0)
+    while not direct.is_finished() and direct.turn_count < 200:
+        direct.turn(*_actions(direct, rng_1))
+        request = resumed.begin_turn(*_actions(resumed, rng_2))
+        while request:
+            request = resumed.resume_turn(None)
+    assert resumed.get_all_text() == direct.get_all_text()
+
+
+def test_pending_turn_blocks_other_turns(team):
+    battle = _battle(team, 1)
+    rng = random.Random(1)
+    with pytest.raises(Exception):
+        battle.resume_turn(0)
+    request = None
+    while not request and not battle.is_finished():
+        request = battle.begin_turn(*_actions(battle, rng))
+    assert request
+    with pytest.raises(Exception):
+        battle.turn(*_actions(battle, rng))
+    with pytest.raises(Exception):
+        battle.begin_turn(*_actions(battle, rng))
+    while request:
+        request = battle.resume_turn(request.slots[0])
+    battle.turn(*_actions(battle, rng))
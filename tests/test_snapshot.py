@@ -0,0 +1,60 @@
+import pytest
+
+from poke_battle_sim import Battle
+from poke_battle_sim.tools.batch import build_trainer
+
+
+def _battle(team, seed: int) -> Battle:
+    battle = Battle(
+        build_trainer("Ash", team(3, seed)), build_trainer("Misty", team(3, 6)), seed=seed
+    )
+    battle.start()
+    return battle
+
+
+def _state(battle: Battle) -> list:
+    return [
+        (poke.cur_hp, poke.nv_status, list(poke.stat_stages), [move.cur_pp for move in poke.moves])
+        for poke in battle.t1.poke_list + battle.t2.poke_list
+    ]
+
+
+@pytest.mark.parametrize("seed", range(6))
+def test_clone_plays_out_like_original(team, play_turns, seed):
+    battle = _battle(team, seed)
+    play_turns(battle, 3, seed)
+    copy = battle.clone()
+    assert copy.t1 is not battle.t1 and copy.t1.poke_list[0] is not battle.t1.poke_list[0]
+    assert copy.t1.current_poke.cur_battle is copy
+    assert copy.battlefield.cur_battle is copy
+    before = _state(battle)
+
+    copy_text = play_turns(copy, 200, seed + 1)
+    assert _state(battle) == before
+    assert play_turns(battle, 200, seed + 1) == copy_text
+    assert _state(battle) == _state(copy)
+
+
+@pytest.mark.parametrize("seed", range(6))
+def test_restore_rewinds_in_place(team, play_turns, seed):
+    battle = _battle(team, seed)
+    play_turns(battle, 3, seed)
+    t1, poke = battle.t1, battle.t1.poke_list[0]
+    snapshot = battle.snapshot()
+    before = _state(battle)
+
+    first = play_turns(battle, 200, seed + 1)
+    for _ in range(2):
+        battle.restore(snapshot)
+        assert battle.t1 is t1 and t1.poke_list[0] is poke and poke.trainer is t1
+        assert _state(battle) == before
+        assert play_turns(battle, 200, seed + 1) == first
+
+
+def test_restore_rejects_other_battles_snapshot(team):
+    battle = _battle(team, 0)
+    other = _battle(team, 1)
+    with pytest.raises(Exception):
+        battle.restore(other.snapshot())
+    with pytest.raises(Exception):
+        battle.restore(None)
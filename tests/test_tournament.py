@@ -0,0 +1,96 @@
+import os
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from poke_battle_sim.tools.tournament import Tournament
+
+
+def _teams(team) -> list:
+    return [team(2, start) for start in range(0, 10, 2)]
+
+
+def _results(tournament: Tournament) -> tuple:
+    return (
+        tournament.get_wins().tolist(),
+        tournament.get_draws().tolist(),
+        tournament.get_turns().tolist(),
+    )
+
+
+def test_seeded_tournaments_repeat(team):
+    first = Tournament(_teams(team), battles_per_pair=3, seed=11).run()
+    second = Tournament(_teams(team), battles_per_pair=3, seed=11).run(checkpoint_every=4)
+    assert first.is_finished() and first.completed == first.num_battles == 30
+    assert _results(first) == _results(second)
+    pooled = Tournament(_teams(team), battles_per_pair=3, seed=11).run(workers=2, chunksize=4)
+    assert _results(first) == _results(pooled)
+
+    games = first.get_games()
+    assert (games + np.eye(5, dtype=games.dtype) * 3 == 3).all()
+    wins, draws = first.get_wins(), first.get_draws()
+    assert ((wins + wins.T + draws)[~np.eye(5, dtype=bool)] == 3).all()
+    rates = first.get_win_rates()
+    assert np.isnan(np.diag(rates)).all()
+    assert first.get_pair(3, 1) == (
+        wins[3, 1],
+        wins[1, 3],
+        draws[1, 3],
+        first.get_turns()[1, 3],
+    )
+
+
+def test_tournament_matches_battles_run_directly(team):
+    from poke_battle_sim.tools.batch import run_battles
+
+    teams = _teams(team)
+    tournament = Tournament(teams, battles_per_pair=2, seed=3).run()
+    specs = list(tournament._get_specs(0))
+    results = list(run_battles(specs))
+    wins = np.zeros((5, 5), dtype=int)
+    for (team_1, team_2, _), (winner, _, _) in zip(specs, results):
+        i, j = teams.index(team_1), teams.index(team_2)
+        if winner == 1:
+            wins[i, j] += 1
+        elif winner == 2:
+            wins[j, i] += 1
+    assert (tournament.get_wins() == wins).all()
+
+
+def test_tournament_resumes_from_checkpoint(team, tmp_path):
+    path = str(tmp_path / "tournament.ckpt")
+    full = Tournament(_teams(team), battles_per_pair=3, seed=5).run()
+
+    Tournament(_teams(team), battles_per_pair=3, seed=5).run(checkpoint=path)
+    # cut the checkpoint off after 7 results and part of the 8th, as an interruption would
+    size = os.path.getsize(path)
+    record_size = (size - 40) // 30
+    with open(path, "r+b") as f:
+        f.truncate(40 + 7 * record_size + 2)
+
+    resumed = Tournament(_teams(team), battles_per_pair=3, seed=5)
+    resumed.load(path)
+    assert resumed.completed == 7
+    resumed.run(checkpoint=path, checkpoint_every=5)
+    assert resumed.is_finished()
+    assert _results(resumed) == _results(full)
+    assert os.path.getsize(path) == size
+
+    # a tournament without a seed takes the checkpoint's seed
+    unseeded = Tournament(_teams(team), battles_per_pair=3)
+    unseeded.load(path)
+    assert unseeded.seed == 5 and _results(unseeded) == _results(full)
+
+
+def test_tournament_rejects_other_checkpoints(team, tmp_path):
+    path = str(tmp_path / "tournament.ckpt")
+    Tournament(_teams(team), seed=5).run(checkpoint=path)
+    with pytest.raises(Exception):
+        Tournament(_teams(team), seed=6).load(path)
+    with pytest.raises(Exception):
+        Tournament(_teams(team), battles_per_pair=2, seed=5).load(path)
+    with pytest.raises(Exception):
+        Tournament(_teams(team)[:4], seed=5).load(path)
+    with pytest.raises(Exception):
+        Tournament(_teams(team)[:1])
@@ -0,0 +1,39 @@
+import pytest
+
+from poke_battle_sim import Pokemon
+from poke_battle_sim.poke_sim import PokeSim
+
+
+def test_types_ef_table_matches_type_chart():
+    types = PokeSim.get_all_types()
+    for move_type in types:
+        move_id = PokeSim.get_type_id(move_type)
+        for type1 in types:
+            for type2 in types + [None]:
+                expected = PokeSim.get_type_ef(move_type, type1)
+                if type2 is not None:
+                    expected *= PokeSim.get_type_ef(move_type, type2)
+                types_id = PokeSim.get_types_id((type1, type2))
+                assert PokeSim.get_types_ef(move_id, types_id) == expected
+
+
+def test_typeless_moves_are_neutral():
+    typeless = PokeSim.get_type_id("typeless")
+    for type1 in PokeSim.get_all_types():
+        assert PokeSim.get_types_ef(typeless, PokeSim.get_types_id((type1, None))) == 1
+
+
+def test_invalid_type_id():
+    with pytest.raises(Exception):
+        PokeSim.get_type_id("not-a-type")
+
+
+def test_type_ids_follow_assignments():
+    poke = Pokemon("pikachu", 50, ["thunderbolt"], "male", stats_actual=[200] * 6)
+    assert poke.types_id == PokeSim.get_types_id(poke.types)
+    poke.types = ("water", "flying")
+    assert poke.types_id == PokeSim.get_types_id(("water", "flying"))
+    move = poke.moves[0]
+    assert move.type_id == PokeSim.get_type_id("electric")
+    move.type = "ice"
+    assert move.type_id == PokeSim.get_type_id("ice")